@@ -407,20 +407,38 @@ More information about index migrations can be found in the
 <https://github.com/inveniosoftware/invenio-index-migrator>`_.
 """
 
-from .api import (
-    RecordsSearch,
-    RecordsSearchV2,
-    UnPrefixedRecordsSearch,
-    UnPrefixedRecordsSearchV2,
-)
 from .ext import InvenioSearch
 from .proxies import current_search, current_search_client
 
 __version__ = "3.1.2"
 
+_api_names = (
+    "AsyncRecordsSearch",
+    "AsyncRecordsSearchV2",
+    "RecordsSearch",
+    "RecordsSearchV2",
+    "UnPrefixedRecordsSearch",
+    "UnPrefixedRecordsSearchV2",
+)
+
+
+def __getattr__(name):
+    """Import the search classes on first use.
+
+    The search classes are built on top of the search DSL, which is only
+    imported when one of them is actually used.
+    """
+    if name in _api_names:
+        from . import api
+
+        return getattr(api, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
 
 __all__ = (
     "__version__",
+    "AsyncRecordsSearch",
+    "AsyncRecordsSearchV2",
     "InvenioSearch",
     "RecordsSearch",
     "RecordsSearchV2",
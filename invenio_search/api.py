@@ -9,31 +9,103 @@
 
 """Search engine API."""
 
+import copy
 import hashlib
+import inspect
+import json
+from itertools import islice
 
-from flask import current_app, request
+from flask import current_app, g, has_app_context, request
 
+from .batching import current_batch
+from .compiled import CompiledSearch, Param
 from .engine import dsl
-from .proxies import current_search_client
-from .utils import build_alias_name
+from .pit import (
+    close_point_in_time,
+    open_point_in_time,
+    pit_body,
+    pit_search_params,
+    with_tiebreaker,
+)
+from .preference import apply_policy
+from .proxies import current_search, current_search_client
+from .utils import LRUCache, build_alias_name, prefixed_names
+
+
+def _identity_cache_key():
+    """Return the identity of the current context, if any."""
+    return getattr(g, "identity", None)
 
 
 class DefaultFilter(object):
-    """Shortcut for defining default filters with query parser."""
+    """Shortcut for defining default filters with query parser.
+
+    Building a default filter can be expensive, e.g. when it contains the
+    permissions of the current user. With ``cache=True``, the parsed filter
+    is built once per application context (i.e. per HTTP request) and per
+    cache key, which is by default the current identity (``g.identity``):
+
+    .. code-block:: python
+
+        class Meta:
+            default_filter = DefaultFilter(
+                permission_filter, cache=True, serialize=True
+            )
+
+    With ``serialize=True``, the filter is cached in its serialized form and
+    every search gets a new query parsed from a copy of it, so that the
+    searches cannot modify the cached filter.
+    """
 
-    def __init__(self, query=None, query_parser=None):
-        """Build filter property with query parser."""
+    def __init__(
+        self,
+        query=None,
+        query_parser=None,
+        cache=False,
+        cache_key=None,
+        serialize=False,
+    ):
+        """Build filter property with query parser.
+
+        :param query: The query, or a function returning it.
+        :param query_parser: Function applied to the query.
+        :param cache: If ``True``, the filter is built once per application
+            context and cache key.
+        :param cache_key: Function returning the cache key (default: the
+            current identity). Implies ``cache=True``.
+        :param serialize: If ``True``, the filter is cached serialized, and
+            copied for every search. Implies ``cache=True``.
+        """
         self._query = query
         self.query_parser = query_parser or (lambda x: x)
+        self.cache = cache or cache_key is not None or serialize
+        self.cache_key = cache_key or _identity_cache_key
+        self.serialize = serialize
 
     @property
     def query(self):
         """Build lazy query if needed."""
         return self._query() if callable(self._query) else self._query
 
+    def build(self):
+        """Return the parsed query, serialized if requested."""
+        query = self.query_parser(self.query)
+        if self.serialize and query is not None:
+            query = dsl.Q(query).to_dict()
+        return query
+
     def __get__(self, obj, objtype):
         """Return parsed query."""
-        return self.query_parser(self.query)
+        if not self.cache or not has_app_context():
+            return self.query_parser(self.query)
+
+        cached = g.setdefault("_invenio_search_default_filters", {})
+        key = (id(self), self.cache_key())
+        if key not in cached:
+            cached[key] = self.build()
+        if self.serialize and cached[key] is not None:
+            return dsl.Q(copy.deepcopy(cached[key]))
+        return cached[key]
 
 
 class MinShouldMatch(str):
@@ -62,7 +134,388 @@ class MinShouldMatch(str):
         return False
 
 
-class BaseRecordsSearch(dsl.Search):
+class ResponseCacheMixin:
+    """Mixin to cache the search responses.
+
+    Responses are cached only if the search has a response cache TTL and a
+    response cache backend is configured. See :mod:`invenio_search.cache`.
+    """
+
+    _response_cache_ttl = None
+
+    def with_response_cache(self, ttl):
+        """Return a new search with its responses cached for ``ttl`` seconds.
+
+        :param ttl: Number of seconds, ``None`` or ``0`` to disable the cache.
+        """
+        s = self._clone()
+        s._response_cache_ttl = ttl
+        return s
+
+    def _fetch(self, body, params=None):
+        """Return the raw response of a request body, using the response cache.
+
+        :param body: The request body.
+        :param params: The request parameters (default: the search ones).
+        """
+        params = self._params if params is None else params
+        cache = current_search.response_cache
+        if cache is not None and self._response_cache_ttl:
+            return cache.fetch(
+                self._index,
+                body,
+                params,
+                self._response_cache_ttl,
+                lambda: self._execute_raw(body, params),
+            )
+        return self._execute_raw(body, params)
+
+    def _batch_cache(self):
+        """Return the response cache and TTL used by the batches, if any."""
+        cache = current_search.response_cache
+        if cache is not None and self._response_cache_ttl:
+            return cache, self._response_cache_ttl
+        return None
+
+    def _clone(self):
+        """Clone the response cache TTL."""
+        s = super()._clone()
+        s._response_cache_ttl = self._response_cache_ttl
+        return s
+
+
+class ExecutionMixin:
+    """Mixin to execute the searches.
+
+    The request bodies are checked against the query cost rules (see
+    :mod:`invenio_search.guard`), identical concurrent requests are coalesced
+    (see :mod:`invenio_search.singleflight`), the shard copies serving the
+    hits are recorded per preference policy (see
+    :mod:`invenio_search.preference`) and the searches executed inside a
+    ``current_search.batch()`` context are batched (see
+    :mod:`invenio_search.batching`).
+    """
+
+    _preference_policy = None
+
+    def _request_body(self):
+        """Return the request body, checked against the query cost rules."""
+        return self._check_body(self.to_dict())
+
+    def _check_body(self, body):
+        """Return a request body checked against the query cost rules.
+
+        See :mod:`invenio_search.guard`.
+        """
+        guard = current_search.query_guard
+        return body if guard is None else guard.check(self, body)
+
+    def _execute_raw(self, body, params=None):
+        """Send the search request and return the raw response."""
+        es = dsl.connections.get_connection(self._using)
+        params = self._params if params is None else params
+
+        def send():
+            raw = es.search(index=self._index, body=body, **params)
+            self._record_replicas(raw)
+            return raw
+
+        if current_app.config.get("SEARCH_SINGLE_FLIGHT"):
+            single_flight = current_search.single_flight
+            key = single_flight.key(es, self._index, body, params)
+            return single_flight.do(key, send)
+        return send()
+
+    def _record_replicas(self, raw):
+        """Record the shard copies which served the hits, if requested."""
+        if self._preference_policy is not None:
+            current_search.preference_stats.record(self._preference_policy, raw)
+
+    def execute(self, ignore_cache=False):
+        """Execute the search and return an instance of ``Response``.
+
+        :param ignore_cache: If set to ``True``, the response of a previous
+            call on this instance is ignored. The response cache is used in
+            any case.
+
+        Inside a ``current_search.batch()`` context, the search is sent later
+        together with the other searches of the batch, and a lazy response is
+        returned. See :mod:`invenio_search.batching`.
+        """
+        if ignore_cache or not hasattr(self, "_response"):
+            batch = current_batch()
+            if batch is not None and batch.accepts(self):
+                self._response = batch.add(
+                    self, self._request_body(), cache=self._batch_cache()
+                )
+            else:
+                self._response = self._response_class(
+                    self, self._fetch(self._request_body())
+                )
+        return self._response
+
+    def execute_raw(self):
+        """Execute the search and return the deserialized response body.
+
+        The request is built exactly as with :meth:`execute`, but the
+        response and its hits are not wrapped in ``Response`` and ``Hit``
+        objects, which saves time and memory when the hits are only
+        serialized again. The response is not kept on the search.
+
+        Inside a ``current_search.batch()`` context, the search is sent right
+        away, together with the pending searches of the batch.
+        """
+        body = self._request_body()
+        batch = current_batch()
+        if batch is not None and batch.accepts(self):
+            return batch.add(self, body, cache=self._batch_cache(), raw=True)
+        return self._fetch(body)
+
+    def iter_sources(self):
+        """Execute the search and iterate over the ``_source`` of the hits.
+
+        See :meth:`execute_raw`.
+        """
+        return (hit.get("_source", {}) for hit in self.execute_raw()["hits"]["hits"])
+
+    def _clone(self):
+        """Clone the preference policy."""
+        s = super()._clone()
+        s._preference_policy = self._preference_policy
+        return s
+
+
+_faceted_search_classes = LRUCache(maxsize=256)
+"""Faceted search classes of :meth:`BaseRecordsSearch.faceted_search`.
+
+The least recently used classes are evicted, e.g. when the facets are built
+per call. The cached classes hold the facets, so that the identities of the
+facets in their keys are not reused while they are cached.
+"""
+
+
+_DEFAULT_FILTER_PARAM = "_default_filter"
+"""Name of the parameter of the default filter in compiled searches."""
+
+_WALK_KEYS = ("query", "post_filter", "sort", "min_score")
+"""Keys of the request body deciding the hits skipped by deep page walks."""
+
+
+def _kwargs_key(kwargs):
+    """Return a hashable key of the keyword arguments of a search."""
+
+    def serialize(value):
+        if isinstance(value, dsl.utils.DslBase):
+            return value.to_dict()
+        return repr(value)
+
+    return json.dumps(kwargs, sort_keys=True, default=serialize)
+
+
+def _replace_clause(node, clause, replacement):
+    """Return a copy of a request body with a clause replaced."""
+    if node == clause:
+        return replacement
+    if isinstance(node, dict):
+        return {k: _replace_clause(v, clause, replacement) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_replace_clause(item, clause, replacement) for item in node]
+    return node
+
+
+class CompiledSearchMixin:
+    """Mixin to compile the query shapes of a search class."""
+
+    @classmethod
+    def compiled(cls, shape, build=None, **kwargs):
+        """Return the compiled search of a query shape.
+
+        The search is built and compiled on the first call for a given shape
+        and keyword arguments, and reused afterwards. See
+        :mod:`invenio_search.compiled`.
+
+        :param shape: Key identifying the query shape for this class.
+        :param build: Function receiving a new search and returning the search
+            to compile, with :class:`~invenio_search.compiled.Param`
+            placeholders for the varying values.
+        :param kwargs: Keyword arguments for the new search.
+        :returns: A :class:`~invenio_search.compiled.CompiledSearch`.
+        """
+        prefix = current_app.config.get("SEARCH_INDEX_PREFIX")
+        key = (cls, shape, prefix, _kwargs_key(kwargs))
+        return current_search.compiled_searches.get(
+            key, lambda: cls._compile_shape(build or (lambda s: s), kwargs)
+        )
+
+    @classmethod
+    def _compile_shape(cls, build, kwargs):
+        """Build and compile a query shape."""
+        return CompiledSearch(build(cls(**kwargs)))
+
+
+class FieldProfileMixin:
+    """Select the returned fields with named profiles.
+
+    A profile is a dictionary with the ``includes`` and ``excludes`` of the
+    ``_source``, and/or the ``docvalue_fields`` and ``stored_fields`` to
+    return:
+
+    .. code-block:: python
+
+        field_profiles = {
+            "list": {"includes": ["metadata.title", "metadata.creators"]},
+            "detail": {"excludes": ["metadata.fulltext"]},
+            "export": {"stored_fields": ["_none_"], "docvalue_fields": ["id"]},
+        }
+    """
+
+    _field_profile_keys = ("includes", "excludes", "docvalue_fields", "stored_fields")
+    _field_profiles = None
+
+    def _get_field_profiles(self):
+        """Return the field profiles of the search, or else of its ``Meta``."""
+        if self._field_profiles is not None:
+            return self._field_profiles
+        return getattr(getattr(self, "Meta", None), "field_profiles", {})
+
+    def with_fields(self, profile):
+        """Return a new search returning the fields of a profile.
+
+        :param profile: The name of the profile.
+        """
+        profiles = self._get_field_profiles()
+        if profile not in profiles:
+            raise ValueError("Unknown field profile: {}".format(profile))
+        fields = profiles[profile]
+        unknown = set(fields).difference(self._field_profile_keys)
+        if unknown:
+            raise ValueError(
+                "Invalid keys of field profile {}: {}".format(
+                    profile, ", ".join(sorted(unknown))
+                )
+            )
+
+        s = self
+        if "includes" in fields or "excludes" in fields:
+            s = s.source(
+                includes=fields.get("includes", []),
+                excludes=fields.get("excludes", []),
+            )
+        extra = {
+            key: list(fields[key])
+            for key in ("docvalue_fields", "stored_fields")
+            if key in fields
+        }
+        return s.extra(**extra) if extra else s
+
+
+class MultiGetMixin:
+    """Fetch records by identifiers in bounded requests."""
+
+    #: Request parameters which are passed on to ``_mget`` requests.
+    _mget_params = ("preference", "routing")
+
+    def iter_records(self, ids, chunk_size=None, includes=None, excludes=None):
+        """Iterate over records by their identifiers, in the order of ``ids``.
+
+        Unlike :meth:`~BaseRecordsSearch.get_records`, the identifiers are fetched in chunks of
+        at most ``chunk_size``, so that long lists of identifiers neither hit
+        ``index.max_terms_count`` nor ``index.max_result_window``, and the
+        records are yielded chunk by chunk.
+
+        Searches without query are sent as ``_mget`` requests to the concrete
+        indices of the search aliases. Searches with a query, e.g. with a
+        default filter, are sent as ``ids`` queries so that the query still
+        applies. Identifiers which are not found are skipped.
+
+        :param ids: Iterable of record identifiers.
+        :param chunk_size: Maximum number of identifiers per request
+            (default: ``SEARCH_MGET_CHUNK_SIZE``).
+        :param includes: Source fields to return (default: the fields set with
+            ``source()``).
+        :param excludes: Source fields not to return.
+        :returns: A generator of records.
+        """
+        chunk_size = chunk_size or current_app.config.get(
+            "SEARCH_MGET_CHUNK_SIZE", 1000
+        )
+        if includes is None and excludes is None:
+            includes, excludes = self._source_filter()
+
+        body = self.to_dict()
+        if "query" in body or "post_filter" in body:
+            fetch_chunk = self._ids_query_fetcher(includes, excludes)
+        else:
+            fetch_chunk = self._mget_fetcher(includes, excludes)
+            # each identifier is looked up in every index of the aliases
+            chunk_size = max(1, chunk_size // fetch_chunk.indices)
+
+        ids = iter(ids)
+        while True:
+            chunk = [str(id_) for id_ in islice(ids, chunk_size)]
+            if not chunk:
+                return
+            found = fetch_chunk(chunk)
+            for id_ in chunk:
+                if id_ in found:
+                    yield found[id_]
+
+    def _source_filter(self):
+        """Return the source includes and excludes set on the search."""
+        source = self._source
+        if source is None or source is True:
+            return None, None
+        if source is False:
+            return [], ["*"]
+        if isinstance(source, dict):
+            return source.get("includes"), source.get("excludes")
+        return ([source] if isinstance(source, str) else list(source)), None
+
+    def _ids_query_fetcher(self, includes, excludes):
+        """Return a function fetching a chunk with an ``ids`` query."""
+        search = self
+        if includes is not None or excludes is not None:
+            search = search.source(includes=includes or [], excludes=excludes or [])
+
+        def fetch_chunk(chunk):
+            chunk_search = search.filter(dsl.query.Ids(values=chunk))
+            chunk_search = chunk_search.extra(from_=0, size=len(chunk))
+            return {hit.meta.id: hit for hit in chunk_search.execute()}
+
+        return fetch_chunk
+
+    def _mget_fetcher(self, includes, excludes):
+        """Return a function fetching a chunk with a ``_mget`` request."""
+        es = dsl.connections.get_connection(self._using)
+        index = ",".join(self._index) if self._index else "_all"
+        indices = sorted(es.indices.get_alias(index=index))
+
+        params = {k: v for k, v in self._params.items() if k in self._mget_params}
+        if includes is not None:
+            params["_source_includes"] = ",".join(includes)
+        if excludes is not None:
+            params["_source_excludes"] = ",".join(excludes)
+
+        def fetch_chunk(chunk):
+            docs = [{"_index": name, "_id": id_} for id_ in chunk for name in indices]
+            found = {}
+            for doc in es.mget(body={"docs": docs}, **params)["docs"]:
+                if doc.get("found") and doc["_id"] not in found:
+                    found[doc["_id"]] = self._get_result(doc)
+            return found
+
+        fetch_chunk.indices = max(1, len(indices))
+        return fetch_chunk
+
+
+class BaseRecordsSearch(
+    CompiledSearchMixin,
+    FieldProfileMixin,
+    MultiGetMixin,
+    ExecutionMixin,
+    ResponseCacheMixin,
+    dsl.Search,
+):
     """Example subclass for searching records using Elastic DSL."""
 
     class Meta:
@@ -78,6 +531,12 @@ class BaseRecordsSearch(dsl.Search):
         Example: ``default_filter = DefaultFilter('_access.owner:"1"')``.
         """
 
+        response_cache_ttl = None
+        """Number of seconds during which the responses are cached."""
+
+        field_profiles = {}
+        """Named sets of returned fields, see :meth:`~FieldProfileMixin.with_fields`."""
+
     def __init__(self, **kwargs):
         """Use Meta to set kwargs defaults."""
         kwargs.setdefault("index", getattr(self.Meta, "index", None))
@@ -89,6 +548,7 @@ class BaseRecordsSearch(dsl.Search):
             kwargs["extra"].update(min_score=min_score)
 
         super(BaseRecordsSearch, self).__init__(**kwargs)
+        self._response_cache_ttl = getattr(self.Meta, "response_cache_ttl", None)
 
         default_filter = getattr(self.Meta, "default_filter", None)
         if default_filter:
@@ -97,6 +557,40 @@ class BaseRecordsSearch(dsl.Search):
                 minimum_should_match=MinShouldMatch("0<1"), filter=default_filter
             )
 
+    @classmethod
+    def _compile_shape(cls, build, kwargs):
+        """Build and compile a query shape.
+
+        The default filter of ``Meta`` is compiled as a parameter which is
+        evaluated again on every execution, as it usually depends on the
+        current user.
+        """
+        if inspect.getattr_static(cls.Meta, "default_filter", None) is None:
+            return super()._compile_shape(build, kwargs)
+
+        # the default filter is compiled from a placeholder clause
+        placeholder = dsl.query.MatchAll(_name=_DEFAULT_FILTER_PARAM)
+        search = cls(**kwargs)
+        search.query = dsl.query.Bool(
+            minimum_should_match=MinShouldMatch("0<1"), filter=[placeholder]
+        )
+        search = build(search)
+        body = _replace_clause(
+            search.to_dict(), placeholder.to_dict(), Param(_DEFAULT_FILTER_PARAM)
+        )
+        return CompiledSearch(
+            search, body=body, dynamic={_DEFAULT_FILTER_PARAM: cls._default_filter_body}
+        )
+
+    @classmethod
+    def _default_filter_body(cls):
+        """Return the serialized default filter of ``Meta``."""
+        default_filter = getattr(cls.Meta, "default_filter", None)
+        if not default_filter:
+            return {"match_all": {}}
+        filters = dsl.query.Bool(filter=default_filter).to_dict()["bool"]["filter"]
+        return filters[0] if len(filters) == 1 else {"bool": {"filter": filters}}
+
     def get_record(self, id_):
         """Return a record by its identifier.
 
@@ -122,19 +616,37 @@ class BaseRecordsSearch(dsl.Search):
         :param search: An instance of ``Search`` class. (default: ``cls()``).
         """
         search_ = search or cls()
+        index = build_alias_name(search_._index[0])
+        fields = getattr(search_.Meta, "fields", ("*",))
+        facets = getattr(search_.Meta, "facets", {})
+
+        # the faceted search classes are reused, only the search changes
+        key = (
+            type(search_),
+            index,
+            tuple(fields),
+            tuple((name, id(facet)) for name, facet in facets.items()),
+        )
+
+        def build():
+            class RecordsFacetedSearch(dsl.FacetedSearch):
+                """Pass defaults from ``cls.Meta`` object."""
 
-        class RecordsFacetedSearch(dsl.FacetedSearch):
-            """Pass defaults from ``cls.Meta`` object."""
+                def __init__(self, search_, **kwargs):
+                    self._search = search_
+                    super().__init__(**kwargs)
 
-            index = build_alias_name(search_._index[0])
-            fields = getattr(search_.Meta, "fields", ("*",))
-            facets = getattr(search_.Meta, "facets", {})
+                def search(self):
+                    """Use ``search`` or ``cls()`` instead of default Search."""
+                    return self._search.response_class(dsl.FacetedResponse)
 
-            def search(self):
-                """Use ``search`` or ``cls()`` instead of default Search."""
-                return search_.response_class(dsl.FacetedResponse)
+            RecordsFacetedSearch.index = index
+            RecordsFacetedSearch.fields = fields
+            RecordsFacetedSearch.facets = facets
+            return RecordsFacetedSearch
 
-        return RecordsFacetedSearch(query=query, filters=filters or {})
+        faceted_cls = _faceted_search_classes.get(key, build)
+        return faceted_cls(search_, query=query, filters=filters or {})
 
     def with_preference_param(self):
         """Add the preference param to the ES request and return a new Search.
@@ -143,7 +655,13 @@ class BaseRecordsSearch(dsl.Search):
         replicas, documented on ES documentation.
         See: https://www.elastic.co/guide/en/elasticsearch/guide/current
         /_search_options.html#_preference for more information.
+
+        The preference is computed with the ``SEARCH_PREFERENCE_POLICY``, by
+        default from the IP address and User-Agent of the request. See
+        :mod:`invenio_search.preference`.
         """
+        if current_app.config.get("SEARCH_PREFERENCE_POLICY"):
+            return apply_policy(self)
         user_hash = self._get_user_hash()
         if user_hash:
             return self.params(preference=user_hash)
@@ -188,18 +706,22 @@ class PrefixedSearchMixin:
         # kwargs['index'] = ['index-name1', 'index-name2']
         _index_param = index
         if not isinstance(index, PrefixedIndexList):
+            # fast path for the registered indices and aliases
+            names = prefixed_names()
+
+            def _prefix(_index):
+                return names.get(_index) or build_alias_name(_index)
+
             if isinstance(index, (tuple, list)):
-                _prefixed_index_list = [build_alias_name(_index) for _index in index]
+                _prefixed_index_list = [_prefix(_index) for _index in index]
                 index = _prefixed_index_list
             elif isinstance(index, str):
                 _splitted_index = index.strip().split(",")
                 if len(_splitted_index) > 1:
-                    _prefix_index_list = [
-                        build_alias_name(_index) for _index in _splitted_index
-                    ]
+                    _prefix_index_list = [_prefix(_index) for _index in _splitted_index]
                     index = ",".join(_prefix_index_list)
                 else:
-                    index = build_alias_name(index)
+                    index = _prefix(index)
                 _index_param = [_index_param]
             self._original_index = _index_param
 
@@ -217,14 +739,46 @@ class PrefixedSearchMixin:
         return s
 
 
-class BaseRecordsSearchV2(dsl.Search):
+class BaseRecordsSearchV2(
+    CompiledSearchMixin,
+    FieldProfileMixin,
+    MultiGetMixin,
+    ExecutionMixin,
+    ResponseCacheMixin,
+    dsl.Search,
+):
     """Base records search V2.
 
     Apply configuration via kwargs instead of Meta class as in BaseRecordsSearch.
+
+    From the ``deep_pagination_from`` offset, pages are fetched with
+    ``search_after`` instead of ``from``, so that paging sequentially through
+    the results costs the same for every page and the pages beyond the
+    ``index.max_result_window`` can be reached:
+
+    .. code-block:: python
+
+        search = RecordsSearchV2(index="records", deep_pagination_from=1000)
+        search.sort("-created")[5000:5020].execute()
     """
 
-    def __init__(self, fields=("*",), default_filter=None, **kwargs):
-        """Sets the needed args in kwargs for the search."""
+    def __init__(
+        self,
+        fields=("*",),
+        default_filter=None,
+        response_cache_ttl=None,
+        deep_pagination_from=None,
+        field_profiles=None,
+        **kwargs,
+    ):
+        """Sets the needed args in kwargs for the search.
+
+        :param field_profiles: Named sets of returned fields, see
+            :meth:`~FieldProfileMixin.with_fields`.
+
+        :param deep_pagination_from: Offset from which the pages are fetched
+            with ``search_after`` (default: ``SEARCH_DEEP_PAGINATION_FROM``).
+        """
         kwargs.setdefault("index", "*")
         kwargs.setdefault("using", current_search_client)
         kwargs.setdefault("extra", {})
@@ -234,6 +788,11 @@ class BaseRecordsSearchV2(dsl.Search):
             kwargs["extra"].update(min_score=min_score)
 
         super(BaseRecordsSearchV2, self).__init__(**kwargs)
+        self._response_cache_ttl = response_cache_ttl
+        if deep_pagination_from is None:
+            deep_pagination_from = current_app.config.get("SEARCH_DEEP_PAGINATION_FROM")
+        self._deep_pagination_from = deep_pagination_from
+        self._field_profiles = field_profiles or {}
 
         if default_filter:
             # NOTE: https://github.com/elastic/elasticsearch/issues/21844
@@ -257,6 +816,141 @@ class BaseRecordsSearchV2(dsl.Search):
         """
         return self.query(dsl.query.Ids(values=[str(id_) for id_ in ids]))
 
+    def stream(self, page_size=None, keep_alive=None):
+        """Iterate over all the hits with a point in time and ``search_after``.
+
+        A point in time is opened on the indices of the search, and the hits
+        are fetched page by page in the order of the search sort, followed by
+        the ``SEARCH_SORT_TIEBREAKER``. Only one page is kept in memory. The
+        point in time is closed when the iteration is exhausted, fails or the
+        generator is closed. The pagination of the search is ignored.
+
+        :param page_size: Number of hits per request (default:
+            ``SEARCH_STREAM_PAGE_SIZE``).
+        :param keep_alive: How long the point in time is kept between two
+            requests (default: ``SEARCH_PIT_KEEP_ALIVE``).
+        """
+        page_size = page_size or current_app.config.get("SEARCH_STREAM_PAGE_SIZE", 1000)
+        keep_alive = keep_alive or current_app.config.get("SEARCH_PIT_KEEP_ALIVE", "1m")
+        body = self.to_dict()
+        body.pop("from", None)
+        body["size"] = page_size
+        body["sort"] = with_tiebreaker(body.get("sort"))
+
+        es = dsl.connections.get_connection(self._using)
+        pit_id = open_point_in_time(es, self._index, keep_alive, self._params)
+        params = pit_search_params(self._params)
+        try:
+            while True:
+                response = es.search(
+                    body=dict(body, pit=pit_body(pit_id, keep_alive)), **params
+                )
+                pit_id = response.get("pit_id") or pit_id
+                hits = response["hits"]["hits"]
+                for hit in hits:
+                    yield self._get_result(hit)
+                if len(hits) < page_size:
+                    break
+                body["search_after"] = hits[-1]["sort"]
+        finally:
+            close_point_in_time(es, pit_id)
+
+    @property
+    def _batchable(self):
+        """Deep pages cannot be sent in multi-search requests."""
+        return self._deep_pagination_from is None
+
+    def _clone(self):
+        """Clone the deep pagination offset and the field profiles."""
+        s = super()._clone()
+        s._deep_pagination_from = self._deep_pagination_from
+        s._field_profiles = self._field_profiles
+        return s
+
+    def _fetch(self, body, params=None):
+        """Return the raw response of a request body.
+
+        Pages are fetched with ``search_after`` from the deep pagination
+        offset, see :meth:`_fetch_deep`.
+        """
+        if self._deep_pagination_from is None:
+            return super()._fetch(body, params)
+        return self._fetch_deep(body, params)
+
+    def _check_body(self, body):
+        """Return a request body checked against the query cost rules.
+
+        Deep pages are checked without their ``from``, as they are fetched
+        with ``search_after``.
+        """
+        start = body.get("from", 0)
+        if self._deep_pagination_from is None or start < self._deep_pagination_from:
+            return super()._check_body(body)
+        body = super()._check_body({k: v for k, v in body.items() if k != "from"})
+        return dict(body, **{"from": start})
+
+    def _fetch_deep(self, body, params=None):
+        """Return the raw response of a page, using ``search_after`` if deep.
+
+        Searches without sort are sorted by relevance. The sort of the search
+        gets a tiebreaker, which must be a document field (see
+        ``SEARCH_SORT_TIEBREAKER``), and the sort values of the
+        last hit of every full page are stored as cursor of the next page in
+        ``current_search.pagination_cursors``. Pages from the deep pagination
+        offset are then fetched with ``search_after`` from the cursor of
+        their offset.
+
+        Without cursor for its offset, a deep page is reached by walking from
+        the closest cursor before it with pages of ``SEARCH_MAX_RESULT_WINDOW``
+        hits without source. As with ``from``, the pages are not isolated
+        from the changes of the indices between two requests.
+        """
+        params = self._params if params is None else params
+        cursors = current_search.pagination_cursors
+        start = body.get("from", 0)
+        size = body.get("size", 10)
+        sort = body.get("sort") or [{"_score": {"order": "desc"}}]
+        body = dict(body, sort=with_tiebreaker(sort, point_in_time=False))
+        body.pop("from", None)
+        key = cursors.key(self._index, body, params)
+
+        if start < self._deep_pagination_from:
+            raw = super()._fetch(dict(body, **{"from": start}), params)
+        else:
+            after, exhausted = self._seek(cursors, key, body, params, start)
+            if exhausted:
+                body["size"] = 0
+            elif after is not None:
+                body["search_after"] = after
+            raw = super()._fetch(body, params)
+
+        hits = raw["hits"]["hits"]
+        if hits and len(hits) == size:
+            cursors.set(key, start + size, hits[-1]["sort"])
+        return raw
+
+    def _seek(self, cursors, key, body, params, offset):
+        """Return the sort values of the hit before an offset.
+
+        :returns: A tuple with the sort values and a flag telling if there
+            are fewer hits than ``offset``.
+        """
+        window = current_app.config.get("SEARCH_MAX_RESULT_WINDOW", 10000)
+        position, after = cursors.nearest(key, offset)
+        while position < offset:
+            step = min(window, offset - position)
+            walk = {key: body[key] for key in _WALK_KEYS if key in body}
+            walk.update(size=step, _source=False, track_total_hits=False)
+            if after is not None:
+                walk["search_after"] = after
+            hits = self._execute_raw(walk, params)["hits"]["hits"]
+            if len(hits) < step:
+                return None, True
+            position += step
+            after = hits[-1]["sort"]
+            cursors.set(key, position, after)
+        return after, False
+
     def with_preference_param(self, preference=None):
         """Add the preference param to the ES request and return a new Search.
 
@@ -265,11 +959,114 @@ class BaseRecordsSearchV2(dsl.Search):
         See: https://www.elastic.co/guide/en/elasticsearch/guide/current
         /_search_options.html#_preference for more information.
 
-        :param str preference: A preference value.
+        :param str preference: A preference value (default: the preference
+            computed with the ``SEARCH_PREFERENCE_POLICY``, if any). See
+            :mod:`invenio_search.preference`.
         """
         if preference:
             return self.params(preference=preference)
-        return self
+        return apply_policy(self)
+
+
+def _sync_only(name):
+    """Return a method raising an error, as ``name`` needs the sync client."""
+
+    def method(self, *args, **kwargs):
+        raise NotImplementedError(
+            "{} is not supported by the asyncio search classes.".format(name)
+        )
+
+    method.__name__ = name
+    method.__doc__ = "Not supported with the asyncio search client."
+    return method
+
+
+class AsyncSearchMixin:
+    """Mixin to execute the searches with the asyncio search client.
+
+    The searches are built exactly as the synchronous ones, only
+    :meth:`execute`, :meth:`execute_raw` and :meth:`count` are coroutines
+    and :meth:`iter_sources` is an asynchronous generator. The compiled
+    searches return coroutines too, while :meth:`iter_records`,
+    :meth:`stream`, :meth:`scan` and :meth:`faceted_search` are not
+    supported:
+
+    .. code-block:: python
+
+        responses = await asyncio.gather(
+            AsyncRecordsSearch(index="records").execute(),
+            AsyncRecordsSearch(index="authors").execute(),
+        )
+    """
+
+    def __init__(self, **kwargs):
+        """Use the asyncio client of the current application by default."""
+        kwargs.setdefault("using", current_search.async_client)
+        super().__init__(**kwargs)
+
+    async def _execute_raw_async(self, body, params=None):
+        """Send the search request and return the raw response."""
+        raw = await self._using.search(
+            index=self._index,
+            body=body,
+            **(self._params if params is None else params),
+        )
+        self._record_replicas(raw)
+        return raw
+
+    async def _fetch_async(self, body, params=None):
+        """Return the raw response of a request body, using the response cache.
+
+        :param body: The request body.
+        :param params: The request parameters (default: the search ones).
+        """
+        params = self._params if params is None else params
+        cache = current_search.response_cache
+        if cache is not None and self._response_cache_ttl:
+            return await cache.fetch_async(
+                self._index,
+                body,
+                params,
+                self._response_cache_ttl,
+                lambda: self._execute_raw_async(body, params),
+            )
+        return await self._execute_raw_async(body, params)
+
+    async def execute(self, ignore_cache=False):
+        """Execute the search and return an instance of ``Response``.
+
+        :param ignore_cache: If set to ``True``, the response of a previous
+            call on this instance is ignored.
+        """
+        if ignore_cache or not hasattr(self, "_response"):
+            self._response = self._response_class(
+                self, await self._fetch_async(self._request_body())
+            )
+        return self._response
+
+    async def execute_raw(self):
+        """Execute the search and return the deserialized response body."""
+        return await self._fetch_async(self._request_body())
+
+    async def iter_sources(self):
+        """Execute the search and iterate over the ``_source`` of the hits."""
+        for hit in (await self.execute_raw())["hits"]["hits"]:
+            yield hit.get("_source", {})
+
+    async def count(self):
+        """Return the number of hits matching the query and filters."""
+        if hasattr(self, "_response") and self._response.hits.total.relation == "eq":
+            return self._response.hits.total.value
+
+        response = await self._using.count(
+            index=self._index, body=self.to_dict(count=True), **self._params
+        )
+        return response["count"]
+
+    iter_records = _sync_only("iter_records")
+    stream = _sync_only("stream")
+    scan = _sync_only("scan")
+    faceted_search = classmethod(_sync_only("faceted_search"))
 
 
 class RecordsSearch(PrefixedSearchMixin, BaseRecordsSearch):
@@ -304,5 +1101,13 @@ class RecordsSearchV2(PrefixedSearchMixin, BaseRecordsSearchV2):
             self._index = PrefixedIndexList(self._index)
 
 
+class AsyncRecordsSearch(AsyncSearchMixin, RecordsSearch):
+    """Prefixed record search class using the asyncio search client."""
+
+
+class AsyncRecordsSearchV2(AsyncSearchMixin, RecordsSearchV2):
+    """Prefixed record search V2 class using the asyncio search client."""
+
+
 UnPrefixedRecordsSearch = BaseRecordsSearch
 UnPrefixedRecordsSearchV2 = BaseRecordsSearchV2
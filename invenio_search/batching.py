@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Batching of independent searches into multi-search requests.
+
+Searches executed inside a batch are not sent right away. Instead,
+``execute()`` returns a lazy response, and all the pending searches are sent
+in a single ``_msearch`` request (one per client) as soon as one of the
+responses is used, or at the latest when the batch ends:
+
+.. code-block:: python
+
+    with current_search.batch():
+        versions = RecordsSearch(index="records").filter(...).execute()
+        citations = RecordsSearch(index="records").filter(...).execute()
+        communities = RecordsSearch(index="communities").execute()
+
+    # only one request was sent
+    versions.hits.total
+
+The searches are built as usual, so their prefixed indices, default filters
+and parameters are kept. Searches with request parameters which cannot be
+sent in a multi-search header are executed right away. Raw searches (see
+:meth:`~invenio_search.api.ExecutionMixin.execute_raw`) send the pending
+searches together with them, and return the response body right away.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from werkzeug.local import LocalProxy
+
+from .engine import dsl, search
+
+_current_batch = ContextVar("invenio_search_batch", default=None)
+
+HEADER_PARAMS = frozenset(
+    [
+        "allow_no_indices",
+        "expand_wildcards",
+        "ignore_unavailable",
+        "preference",
+        "request_cache",
+        "routing",
+        "search_type",
+    ]
+)
+"""Request parameters which can be sent in a multi-search header."""
+
+
+def current_batch():
+    """Return the batch of the current context, if any."""
+    return _current_batch.get()
+
+
+class _BatchEntry(object):
+    """A search waiting for its response."""
+
+    __slots__ = (
+        "batch",
+        "search",
+        "body",
+        "cache",
+        "raw",
+        "response",
+        "error",
+        "done",
+    )
+
+    def __init__(self, batch, search, body, cache, raw):
+        self.batch = batch
+        self.search = search
+        self.body = body
+        self.cache = cache
+        self.raw = raw
+        self.response = None
+        self.error = None
+        self.done = False
+
+    def result(self):
+        """Return the response, sending the pending searches if needed."""
+        if not self.done:
+            self.batch.dispatch()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class SearchBatch(object):
+    """Searches to send in multi-search requests."""
+
+    def __init__(self):
+        """Initialize the batch."""
+        self._pending = []
+        self._lock = threading.RLock()
+        self.requests = 0
+
+    @staticmethod
+    def accepts(search):
+        """Check if a search can be sent in a multi-search request."""
+        return getattr(search, "_batchable", True) and HEADER_PARAMS.issuperset(
+            search._params
+        )
+
+    def add(self, search, body, cache=None, raw=False):
+        """Add a search to the batch and return its lazy response.
+
+        :param search: The search.
+        :param body: The request body of the search.
+        :param cache: A tuple with a
+            :class:`~invenio_search.cache.ResponseCache` and a TTL, if the
+            response should be cached.
+        :param raw: If ``True``, the pending searches are sent right away and
+            the deserialized response body is returned, as it is usually
+            serialized again, which lazy responses do not support.
+        """
+        entry = _BatchEntry(self, search, body, cache, raw)
+        with self._lock:
+            self._pending.append(entry)
+        if raw:
+            return entry.result()
+        return LocalProxy(entry.result)
+
+    def dispatch(self):
+        """Send all the pending searches."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            clients = {}
+            for entry in pending:
+                clients.setdefault(id(entry.search._using), []).append(entry)
+            for entries in clients.values():
+                self._msearch(entries)
+
+    def _msearch(self, entries):
+        """Send the searches of a client in one multi-search request."""
+        to_send = []
+        for entry in entries:
+            if entry.cache is not None:
+                cache = entry.cache[0]
+                key, raw = cache.lookup(
+                    entry.search._index, entry.body, entry.search._params
+                )
+                entry.cache = (cache, entry.cache[1], key)
+                if raw is not None:
+                    self._set_response(entry, raw)
+                    continue
+            to_send.append(entry)
+        if not to_send:
+            return
+
+        body = []
+        for entry in to_send:
+            header = dict(entry.search._params)
+            if entry.search._index:
+                header["index"] = ",".join(entry.search._index)
+            body.extend([header, entry.body])
+
+        es = dsl.connections.get_connection(to_send[0].search._using)
+        try:
+            self.requests += 1
+            responses = es.msearch(body=body)["responses"]
+        except Exception as e:
+            for entry in to_send:
+                entry.error = e
+                entry.done = True
+            return
+
+        for entry, raw in zip(to_send, responses):
+            if "error" in raw:
+                error = raw["error"]
+                entry.error = search.TransportError(
+                    raw.get("status", "N/A"),
+                    error.get("type", "") if isinstance(error, dict) else error,
+                    error,
+                )
+                entry.done = True
+                continue
+            if entry.cache is not None:
+                cache, ttl, key = entry.cache
+                cache.store(key, raw, ttl)
+            entry.search._record_replicas(raw)
+            self._set_response(entry, raw)
+
+    @staticmethod
+    def _set_response(entry, raw):
+        if entry.raw:
+            entry.response = raw
+        else:
+            entry.response = entry.search._response_class(entry.search, raw)
+        entry.done = True
+
+
+@contextmanager
+def batch():
+    """Batch the searches executed in the context.
+
+    Nested batches are merged into the outermost one.
+    """
+    current = _current_batch.get()
+    if current is not None:
+        yield current
+        return
+
+    new_batch = SearchBatch()
+    token = _current_batch.set(new_batch)
+    try:
+        yield new_batch
+    finally:
+        _current_batch.reset(token)
+    new_batch.dispatch()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cache of parsed mapping and template bodies."""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def json_loads(data):
+    """Parse a JSON document with the fastest available backend.
+
+    Uses `orjson <https://pypi.org/project/orjson/>`_ if it is installed and
+    falls back to the standard library otherwise.
+
+    :param data: The JSON document as a string.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class BodyCache(object):
+    """Bounded cache of parsed JSON files.
+
+    Entries are validated against the modification time of their file, so an
+    updated mapping or template is parsed again on its next use. The least
+    recently used entries are evicted once ``maxsize`` is reached.
+
+    .. note::
+
+        The returned bodies are shared between callers and must not be
+        modified.
+    """
+
+    def __init__(self, maxsize=256, loads=None, bundle=None):
+        """Initialize the cache.
+
+        :param maxsize: Maximum number of cached bodies. ``0`` disables the
+            cache.
+        :param loads: Function used to parse the file contents.
+        :param bundle: A :class:`~invenio_search.discovery.RegistryBundle`
+            from which the bodies are read instead of the files.
+        """
+        self.maxsize = maxsize
+        self.loads = loads or json_loads
+        self.bundle = bundle
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, path):
+        """Return the raw contents of a file.
+
+        :param path: Path of the file.
+        """
+        with open(path, "r") as fp:
+            return fp.read()
+
+    def load(self, path, transform=None, variant=None):
+        """Return the parsed JSON body of a file.
+
+        :param path: Path of the JSON file.
+        :param transform: Function applied to the raw contents before parsing.
+        :param variant: Part of the cache key distinguishing different
+            transformations of the same file.
+        """
+        key = (path, variant)
+        # bodies of a bundle never change
+        from_bundle = self.bundle is not None and path in self.bundle
+        mtime = None if from_bundle else os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        data = self.bundle.read(path) if from_bundle else self.read(path)
+        if transform is not None:
+            data = transform(data)
+        body = self.loads(data)
+
+        if self.maxsize:
+            with self._lock:
+                self._entries[key] = (mtime, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        """Remove all the cached bodies."""
+        with self._lock:
+            self._entries.clear()
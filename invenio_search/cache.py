@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cache of search responses.
+
+The responses of searches with a response cache TTL (see
+``Meta.response_cache_ttl`` and the ``response_cache_ttl`` argument of
+:class:`~invenio_search.api.BaseRecordsSearchV2`) are cached in a pluggable
+backend, configured with
+:data:`~invenio_search.config.SEARCH_RESPONSE_CACHE_BACKEND`.
+
+Every index or alias has a generation token which is part of the keys of the
+responses of the searches on it. Writing to an index through
+``current_search`` (or calling ``current_search.invalidate_response_cache``)
+replaces the token of the index and of its aliases, so that their cached
+responses are not used anymore and eventually expire. Searches on index patterns (e.g.
+``records-*``) cannot be invalidated and are never cached.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from .bodies import json_loads
+
+
+class InProcessBackend(object):
+    """Response cache backend storing the entries in the process memory.
+
+    The least recently used entries are evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize=1024):
+        """Initialize the backend.
+
+        :param maxsize: Maximum number of entries.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value of a key, or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Set the value of a key.
+
+        :param key: The key.
+        :param value: The value.
+        :param ttl: Number of seconds after which the key expires.
+        """
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class KVBackend(object):
+    """Response cache backend shared through a key-value store.
+
+    The store is accessed through a client with a Redis-like interface, i.e.
+    ``get(key)`` and ``set(key, value, ex=ttl)``. The size of the cache is
+    bounded by the eviction policy of the store (e.g. ``allkeys-lru``).
+    """
+
+    def __init__(self, client, prefix="invenio-search:"):
+        """Initialize the backend.
+
+        :param client: The key-value store client.
+        :param prefix: Prefix of all the keys.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        """Return the value of a key, or ``None`` if missing or expired."""
+        value = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Set the value of a key.
+
+        :param key: The key.
+        :param value: The value.
+        :param ttl: Number of seconds after which the key expires.
+        """
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+
+def in_process_backend(app):
+    """Create an in-process backend sized with ``SEARCH_RESPONSE_CACHE_SIZE``.
+
+    :param app: An instance of :class:`~flask.app.Flask`.
+    """
+    return InProcessBackend(maxsize=app.config.get("SEARCH_RESPONSE_CACHE_SIZE", 1024))
+
+
+class ResponseCache(object):
+    """Cache of raw search responses on top of a backend."""
+
+    def __init__(self, backend):
+        """Initialize the cache.
+
+        :param backend: The cache backend.
+        """
+        self.backend = backend
+
+    @staticmethod
+    def _index_names(index):
+        """Return the index names of a search, or ``None`` for patterns."""
+        if not index:
+            return None
+        names = set()
+        for value in index:
+            names.update(name.strip() for name in value.split(","))
+        if any("*" in name or name.startswith("_") for name in names):
+            return None
+        return sorted(names)
+
+    def _generation(self, name):
+        """Return the generation token of an index or alias."""
+        key = "generation:" + name
+        token = self.backend.get(key)
+        if token is None:
+            # a missing token (never set or evicted) can never match the
+            # tokens of the already cached responses
+            token = uuid.uuid4().hex
+            self.backend.set(key, token)
+        return token
+
+    def key(self, index, body, params):
+        """Return the cache key of a search, or ``None`` if not cacheable.
+
+        :param index: The list of (prefixed) indices of the search.
+        :param body: The request body.
+        :param params: The request parameters.
+        """
+        names = self._index_names(index)
+        if names is None:
+            return None
+        normalized = json.dumps(
+            {
+                "index": names,
+                "generations": [self._generation(name) for name in names],
+                "body": body,
+                "params": params,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return "response:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, index, body, params):
+        """Return the cache key of a search and its cached raw response.
+
+        :param index: The list of (prefixed) indices of the search.
+        :param body: The request body.
+        :param params: The request parameters.
+        :returns: A tuple with the key (``None`` if the search is not
+            cacheable) and the raw response (``None`` on a miss).
+        """
+        key = self.key(index, body, params)
+        if key is None:
+            return None, None
+        cached = self.backend.get(key)
+        return key, json_loads(cached) if cached is not None else None
+
+    def store(self, key, response, ttl):
+        """Store the raw response of a search.
+
+        :param key: The key returned by :meth:`lookup`.
+        :param response: The raw response.
+        :param ttl: Number of seconds during which the response is cached.
+        """
+        if key is not None:
+            self.backend.set(key, json.dumps(response, separators=(",", ":")), ttl)
+
+    def fetch(self, index, body, params, ttl, search):
+        """Return the cached raw response of a search, searching on a miss.
+
+        :param index: The list of (prefixed) indices of the search.
+        :param body: The request body.
+        :param params: The request parameters.
+        :param ttl: Number of seconds during which the response is cached.
+        :param search: Function returning the raw response on a miss.
+        """
+        key, response = self.lookup(index, body, params)
+        if response is None:
+            response = search()
+            self.store(key, response, ttl)
+        return response
+
+    async def fetch_async(self, index, body, params, ttl, search):
+        """Return the cached raw response of a search, searching on a miss.
+
+        Same as :meth:`fetch`, but ``search`` is a coroutine function.
+        """
+        key, response = self.lookup(index, body, params)
+        if response is None:
+            response = await search()
+            self.store(key, response, ttl)
+        return response
+
+    def invalidate(self, *names):
+        """Invalidate the cached responses of searches on indices or aliases.
+
+        :param names: The (prefixed) index or alias names.
+        """
+        for name in names:
+            self.backend.set("generation:" + name, uuid.uuid4().hex)
@@ -262,3 +262,63 @@ def put(index_name, identifier, body, force, verbose):
 
     if verbose:
         click.echo(json.dumps(result))
+
+
+@index.command("compile-registry")
+@click.argument("output", type=click.Path(dir_okay=False, writable=True))
+@with_appcontext
+def compile_registry(output):
+    """Compile registered mappings and templates into a bundle."""
+    registry = current_search.compile_registry(output)
+    templates_count = sum(
+        len(registry[name])
+        for name in ("templates", "component_templates", "index_templates")
+    )
+    click.secho(
+        f"Compiled {len(registry['mappings'])} mappings and {templates_count} "
+        f"templates into {output}.",
+        fg="green",
+    )
+
+
+@index.command("startup-profile")
+@click.option("-n", "--limit", type=int, default=20, show_default=True)
+@click.option("--json", "as_json", is_flag=True, default=False)
+@with_appcontext
+def startup_profile(limit, as_json):
+    """Profile the loading of mappings and templates entry points."""
+    profile = current_search.profile_startup()
+
+    if as_json:
+        click.echo(json.dumps(profile.to_dict(), indent=4))
+        return
+
+    if not profile.entries:
+        click.secho("No entry points were loaded.", fg="yellow")
+        return
+
+    row = "{:<40} {:>8} {:>8} {:>6}  {}"
+    click.echo(row.format("Group", "Load ms", "Walk ms", "Files", "Entry point"))
+    for record in profile.slowest(limit):
+        click.echo(
+            row.format(
+                record["group"],
+                "{:.1f}".format(record["load_time"] * 1000),
+                "{:.1f}".format(record["walk_time"] * 1000),
+                record["files"],
+                "{} = {}".format(record["name"], record["module"]),
+            )
+        )
+
+    click.echo()
+    click.echo(row.format("Group", "Load ms", "Walk ms", "Files", "Entry points"))
+    for group, totals in profile.groups.items():
+        click.echo(
+            row.format(
+                group,
+                "{:.1f}".format(totals["load_time"] * 1000),
+                "{:.1f}".format(totals["walk_time"] * 1000),
+                totals["files"],
+                totals["entry_points"],
+            )
+        )
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Compiled searches for repeated query shapes.
+
+Most requests to a search endpoint share a few query shapes which only differ
+in some values (e.g. the user's query and the pagination). A shape is built
+once with the search DSL, using :class:`Param` placeholders for the varying
+values, and serialized into a request body skeleton. Executing the
+:class:`CompiledSearch` only fills in the values, without building, cloning
+and serializing the DSL objects again:
+
+.. code-block:: python
+
+    from invenio_search.compiled import Param
+
+    search = RecordsSearch.compiled(
+        "records-query",
+        lambda s: s.query("query_string", query=Param("q")).extra(
+            from_=Param("from"), size=Param("size")
+        ),
+    )
+    response = search.execute(q="title:invenio", size=10, **{"from": 0})
+
+The shapes are compiled separately for every set of keyword arguments of
+the search. The default filter of the search class is not frozen: it is
+evaluated again on every execution.
+
+.. note::
+
+    Everything else is frozen when the shape is compiled. Shapes must
+    therefore not depend on the current request (e.g. the current user),
+    unless the dependent values are passed as parameters.
+"""
+
+from flask import has_app_context
+
+from .engine import dsl
+from .proxies import current_search
+
+
+class Param(object):
+    """Placeholder for a value filled in when a compiled search is executed."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        """Initialize the placeholder.
+
+        :param name: Name of the parameter.
+        """
+        self.name = name
+
+    def __repr__(self):
+        """Representation of the placeholder."""
+        return "Param({!r})".format(self.name)
+
+
+class _Filler(object):
+    """Part of a body skeleton which depends on the parameters."""
+
+    __slots__ = ("fill",)
+
+    def __init__(self, fill):
+        self.fill = fill
+
+
+def _compile(node, names):
+    """Compile a body skeleton into a constant or a :class:`_Filler`.
+
+    Parts of the skeleton without parameters are shared between all the
+    rendered bodies, only the containers of the parameters are copied.
+    """
+    if isinstance(node, Param):
+        name = node.name
+        names.add(name)
+        return _Filler(lambda values: values[name])
+
+    if isinstance(node, dict):
+        dynamic = []
+        for key, value in node.items():
+            compiled = _compile(value, names)
+            if isinstance(compiled, _Filler):
+                dynamic.append((key, compiled.fill))
+    elif isinstance(node, list):
+        dynamic = []
+        for idx, value in enumerate(node):
+            compiled = _compile(value, names)
+            if isinstance(compiled, _Filler):
+                dynamic.append((idx, compiled.fill))
+    else:
+        return node
+
+    if not dynamic:
+        return node
+
+    def fill(values):
+        result = node.copy()
+        for key, fill_value in dynamic:
+            result[key] = fill_value(values)
+        return result
+
+    return _Filler(fill)
+
+
+class CompiledSearch(object):
+    """A search with a precompiled request body.
+
+    The rendered bodies share the parts which do not depend on the parameters
+    and must not be modified.
+    """
+
+    def __init__(self, search, dynamic=None, body=None):
+        """Compile a search.
+
+        :param search: The search, using :class:`Param` for varying values.
+        :param dynamic: Dictionary mapping the names of parameters to
+            functions computing their values on every rendering, e.g. for the
+            default filter.
+        :param body: The request body to compile (default: the body of the
+            search).
+        """
+        self.search = search
+        self.dynamic = dict(dynamic or {})
+        names = set()
+        self._body = _compile(search.to_dict() if body is None else body, names)
+        self.names = names.difference(self.dynamic)
+
+    def to_dict(self, **values):
+        """Render the request body.
+
+        :param values: The values of the parameters.
+        """
+        missing = self.names.difference(values)
+        if missing:
+            raise ValueError(
+                "Missing values for parameters: {}".format(", ".join(sorted(missing)))
+            )
+        if self.dynamic:
+            values = dict(values, **{name: f() for name, f in self.dynamic.items()})
+        if isinstance(self._body, _Filler):
+            return self._body.fill(values)
+        return self._body
+
+    def execute(self, params=None, **values):
+        """Execute the search and return the response.
+
+        The rendered body is checked against the query cost rules (see
+        :mod:`invenio_search.guard`). For the asyncio search classes, a
+        coroutine is returned.
+
+        :param params: Extra parameters of the search request (e.g.
+            ``preference``).
+        :param values: The values of the parameters.
+        """
+        search = self.search
+        request_params = dict(search._params, **params) if params else search._params
+        body = self.to_dict(**values)
+        if hasattr(search, "_check_body"):
+            body = search._check_body(body)
+        elif has_app_context() and current_search.query_guard is not None:
+            body = current_search.query_guard.check(search, body)
+        if hasattr(search, "_fetch_async"):
+            return self._execute_async(body, request_params)
+        if hasattr(search, "_fetch"):
+            # uses the response cache of the Invenio search classes
+            response = search._fetch(body, request_params)
+        else:
+            es = dsl.connections.get_connection(search._using)
+            response = es.search(index=search._index, body=body, **request_params)
+        return search._response_class(search, response)
+
+    async def _execute_async(self, body, params):
+        """Execute the search with the asyncio search client."""
+        search = self.search
+        response = await search._fetch_async(body, params)
+        return search._response_class(search, response)
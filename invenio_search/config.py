@@ -122,3 +122,186 @@ Usage example in your template.json:
         "index_patterns": ["__SEARCH_INDEX_PREFIX__myindex-name-*"]
     }
 """
+
+SEARCH_CLUSTER_INFO_TTL = 300
+"""Number of seconds the cluster information is cached.
+
+The cluster information (e.g. ``current_search.cluster_version``) is fetched
+once and reused until it expires. Set to ``0`` to fetch it on every access, or
+to ``None`` to never expire it. ``current_search.refresh_cluster_info()``
+fetches it again explicitly.
+"""
+
+SEARCH_DISCOVERY_CACHE = None
+"""Path of the file caching the discovery of mappings and templates.
+
+If set, the results of walking the mappings and templates directories are
+persisted in this file and reused by subsequent processes (web workers,
+Celery workers, CLI commands), which then rebuild the registered mappings,
+aliases and templates without listing the directories again.
+
+The cache invalidates itself when the set of installed distributions (or
+their versions) changes and, per directory, when a directory is modified.
+
+Usage example:
+
+.. code-block:: python
+
+    # in your config.py
+    SEARCH_DISCOVERY_CACHE = "/opt/invenio/var/instance/search-discovery.json"
+"""
+
+SEARCH_BODY_CACHE_SIZE = 256
+"""Maximum number of parsed mapping and template bodies kept in memory.
+
+Mapping and template files are parsed once and reused until the file is
+modified. Set to ``0`` to disable the cache. If the optional ``orjson``
+package is installed (``pip install invenio-search[orjson]``), it is used to
+parse the files.
+"""
+
+SEARCH_DISCOVERY_WORKERS = 1
+"""Maximum number of threads used to discover mappings and templates.
+
+By default, the entry points are loaded and their directories walked
+sequentially. With more workers they are discovered concurrently, which
+mostly helps on slow filesystems (e.g. network or container overlay
+filesystems), but requires the modules of the entry points to be safe to
+import concurrently. The results are always merged in the order of the entry
+points.
+"""
+
+SEARCH_REGISTRY_BUNDLE = None
+"""Path of a precompiled registry bundle.
+
+The bundle contains all the registered mappings, aliases and templates
+together with their bodies, and is created with:
+
+.. code-block:: console
+
+    $ invenio index compile-registry /opt/invenio/search-registry.bundle
+
+If set, the mappings and templates are loaded from the bundle instead of
+being discovered from the entry points and package directories. The bundle is
+memory-mapped, so that worker processes share its pages. It is ignored (with a
+warning) if it was compiled for another search distribution or major version.
+
+The bundle must be compiled again whenever the installed packages change,
+e.g. as a step of a container image build.
+"""
+
+SEARCH_STARTUP_PROFILE = False
+"""Record the time spent loading mappings and templates entry points.
+
+If enabled, ``current_search.startup_profile`` records for each entry point the
+time spent loading it and walking its directories, as well as the number of
+files found. The same report can be produced on demand, independently of this
+setting, with:
+
+.. code-block:: console
+
+    $ invenio index startup-profile
+"""
+
+SEARCH_COMPILED_SEARCH_CACHE_SIZE = 128
+"""Maximum number of compiled query shapes kept in memory.
+
+See :meth:`invenio_search.api.CompiledSearchMixin.compiled`. Set to ``0`` to
+compile the query shapes on every use.
+"""
+
+SEARCH_RESPONSE_CACHE_BACKEND = None
+"""Backend of the search response cache.
+
+A function (or its import path) receiving the application and returning the
+backend, e.g. ``"invenio_search.cache:in_process_backend"`` to cache the
+responses in the memory of each process, or to share them through Redis:
+
+.. code-block:: python
+
+    def redis_backend(app):
+        from redis import Redis
+        from invenio_search.cache import KVBackend
+
+        return KVBackend(Redis.from_url(app.config["CACHE_REDIS_URL"]))
+
+    SEARCH_RESPONSE_CACHE_BACKEND = redis_backend
+
+Only the responses of search classes with a response cache TTL are cached,
+see ``Meta.response_cache_ttl``. By default, no response is cached.
+"""
+
+SEARCH_RESPONSE_CACHE_SIZE = 1024
+"""Maximum number of entries of the in-process response cache backend."""
+
+SEARCH_SORT_TIEBREAKER = None
+"""Sort appended to the sort of searches paginated with ``search_after``.
+
+It must identify the documents uniquely, e.g. ``{"id": "asc"}`` for a keyword
+field holding the record identifier. By default, the internal shard document
+order (``_shard_doc``) is used on Elasticsearch and ``_id`` on OpenSearch.
+Resumable exports (see :func:`invenio_search.export.sliced_export`) require
+it to be set to a document field.
+"""
+
+SEARCH_STREAM_PAGE_SIZE = 1000
+"""Default number of hits per request when streaming search results.
+
+See :meth:`invenio_search.api.BaseRecordsSearchV2.stream`.
+"""
+
+SEARCH_PIT_KEEP_ALIVE = "1m"
+"""Default keep-alive of the points in time between two requests."""
+
+SEARCH_MGET_CHUNK_SIZE = 1000
+"""Maximum number of identifiers fetched per request by ``iter_records()``.
+
+See :meth:`invenio_search.api.MultiGetMixin.iter_records`.
+"""
+
+SEARCH_PREFERENCE_POLICY = None
+"""Policy computing the shard preference of ``with_preference_param()``.
+
+The name of a built-in policy (``"user_agent"``, ``"session"``, ``"user"``,
+``"query_shape"`` or ``"local"``), or a function (or its import path)
+receiving the search and returning the preference. See
+:mod:`invenio_search.preference`.
+
+If ``None``, ``RecordsSearch`` uses the IP address and User-Agent of the
+request, and ``RecordsSearchV2`` only uses the preference it is given.
+"""
+
+SEARCH_PREFERENCE_RECORD_REPLICAS = False
+"""Record the shard copies serving the hits of searches with a preference.
+
+The shard and node of every hit are requested with ``explain``, which makes
+the searches slower, so it should only be enabled to measure the effect of a
+preference policy. The statistics are available in
+``current_search.preference_stats``.
+"""
+
+SEARCH_SINGLE_FLIGHT = False
+"""Coalesce identical searches sent concurrently by the threads of a process.
+
+See :mod:`invenio_search.singleflight`.
+"""
+
+SEARCH_QUERY_GUARD_RULES = []
+"""Query cost rules checked before executing the searches.
+
+See :mod:`invenio_search.guard`.
+"""
+
+SEARCH_DEEP_PAGINATION_FROM = None
+"""Offset from which ``RecordsSearchV2`` fetches the pages with ``search_after``.
+
+``None`` disables the rewrite of deep pages. On Elasticsearch, it requires
+``SEARCH_SORT_TIEBREAKER`` to be set to a document field. See
+:class:`invenio_search.api.BaseRecordsSearchV2`.
+"""
+
+SEARCH_MAX_RESULT_WINDOW = 10000
+"""Maximum ``from + size`` of the indices (``index.max_result_window``)."""
+
+SEARCH_PAGINATION_CURSORS_SIZE = 1024
+"""Maximum number of searches for which deep pagination cursors are kept."""
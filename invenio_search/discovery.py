@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Discovery of search mappings and templates on the filesystem.
+
+Mappings and templates are found by walking the package directories
+registered through entry points. The walk results can be persisted in a
+:class:`DiscoveryCache` so that subsequent processes (web workers, Celery
+workers, CLI calls) rebuild the registry without listing the directory trees
+again. For deployments where the installed packages are fixed, the whole
+registry can instead be precompiled into a :class:`RegistryBundle`.
+The time spent in the discovery can be measured with a :class:`StartupProfile`.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+def walk_json_files(root):
+    """Walk a directory tree and collect its subdirectories and JSON files.
+
+    :param root: Path of the directory to walk.
+    :returns: A tuple ``(entries, dirs)``. ``entries`` is the list of
+        relative paths (using ``/`` as separator) in depth-first order, where
+        directories end with a trailing ``/``. ``dirs`` maps every walked
+        directory path to its modification time in nanoseconds.
+    """
+    entries = []
+    dirs = {}
+
+    def _walk(path, prefix):
+        dirs[path] = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            children = list(it)
+        for child in children:
+            if child.is_dir():
+                entries.append(prefix + child.name + "/")
+                _walk(child.path, prefix + child.name + "/")
+            elif os.path.splitext(child.name)[1] == ".json":
+                entries.append(prefix + child.name)
+
+    _walk(root, "")
+    return entries, dirs
+
+
+def map_concurrent(func, items, max_workers):
+    """Apply a function to items in a bounded thread pool.
+
+    The results are returned in the order of ``items``, independently of the
+    order in which the calls complete, and the first exception raised by a
+    call is re-raised.
+
+    :param func: Function to call with each item.
+    :param items: The items.
+    :param max_workers: Maximum number of threads. With ``1`` or less, or with
+        a single item, the calls are done sequentially in the calling thread.
+    """
+    items = list(items)
+    workers = min(max_workers or 1, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="invenio-search-discovery"
+    ) as executor:
+        return list(executor.map(func, items))
+
+
+def distributions_fingerprint():
+    """Compute a fingerprint of the installed Python distributions.
+
+    Only the names of the ``*.dist-info`` and ``*.egg-info`` directories on
+    ``sys.path`` are used. They encode the name and version of every installed
+    distribution, so installing, removing or upgrading a package changes the
+    fingerprint without having to read any package metadata.
+    """
+    names = []
+    for path in sys.path:
+        try:
+            names.extend(
+                name
+                for name in os.listdir(path or ".")
+                if name.endswith((".dist-info", ".egg-info"))
+            )
+        except OSError:
+            continue
+    return hashlib.sha1("\n".join(sorted(names)).encode("utf-8")).hexdigest()
+
+
+class DiscoveryCache(object):
+    """Persistent cache of directory walks.
+
+    Each walked root directory is stored with the modification times of all
+    its subdirectories. A cached walk is reused as long as none of these
+    directories changed, while the whole cache is discarded when the set of
+    installed distributions changes.
+    """
+
+    version = 1
+
+    def __init__(self, path):
+        """Initialize the cache.
+
+        :param path: Path of the JSON file holding the cache.
+        """
+        self.path = path
+        self.fingerprint = distributions_fingerprint()
+        self._walks = self._read()
+        self._dirty = False
+
+    def _read(self):
+        """Read the cache file, ignoring it if missing, invalid or stale."""
+        try:
+            with open(self.path, "r") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.version
+            or data.get("fingerprint") != self.fingerprint
+        ):
+            return {}
+        return data.get("walks", {})
+
+    @staticmethod
+    def _is_fresh(walk):
+        """Check that no directory of a cached walk has been modified."""
+        try:
+            return all(
+                os.stat(path).st_mtime_ns == mtime
+                for path, mtime in walk["dirs"].items()
+            )
+        except OSError:
+            return False
+
+    def walk(self, root):
+        """Return the entries below ``root``, walking it only if needed.
+
+        :param root: Path of the directory to walk.
+        :returns: The list of entries as returned by :func:`walk_json_files`.
+        """
+        root = str(root)
+        walk = self._walks.get(root)
+        if walk is None or not self._is_fresh(walk):
+            entries, dirs = walk_json_files(root)
+            walk = self._walks[root] = {"entries": entries, "dirs": dirs}
+            self._dirty = True
+        return walk["entries"]
+
+    def save(self):
+        """Write the cache file if new walks were recorded.
+
+        The file is replaced atomically, so that concurrent processes never
+        read a partially written cache.
+        """
+        if not self._dirty:
+            return
+        data = {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "walks": self._walks,
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            warnings.warn(
+                "Could not write the search discovery cache {path}: {error}".format(
+                    path=self.path, error=e
+                )
+            )
+            return
+        self._dirty = False
+
+
+class RegistryBundle(object):
+    """Precompiled registry of mappings and templates.
+
+    The bundle is a single file containing the registered mappings, aliases
+    and templates together with all their bodies. It is produced by
+    ``invenio index compile-registry`` and has the following layout:
+
+    - the first line is a JSON header with the registry and, for every body,
+      its offset and length in the data section;
+    - the rest of the file is the data section with the concatenated bodies.
+
+    The file is memory-mapped: only the header is parsed when the bundle is
+    loaded, while bodies are read from the mapped pages on demand. Worker
+    processes loading the same bundle share these pages through the operating
+    system's page cache.
+    """
+
+    version = 1
+
+    def __init__(self, path):
+        """Load the bundle.
+
+        :param path: Path of the bundle file.
+        """
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._mmap.find(b"\n")
+        self.header = json.loads(self._mmap[:end])
+        if self.header.get("version") != self.version:
+            raise ValueError("Unsupported registry bundle version.")
+        self._data_offset = end + 1
+
+    def __contains__(self, path):
+        """Check if the bundle contains the body of a file."""
+        return path in self.header["bodies"]
+
+    def read(self, path):
+        """Return the raw body of a file from the bundle.
+
+        :param path: Path of the file, as registered at compile time.
+        """
+        offset, length = self.header["bodies"][path]
+        offset += self._data_offset
+        return self._mmap[offset : offset + length].decode("utf-8")
+
+    @classmethod
+    def compile(cls, path, registry, bodies):
+        """Write a bundle file.
+
+        :param path: Path of the bundle file.
+        :param registry: Dictionary with the ``distribution``,
+            ``search_version``, ``mappings``, ``aliases``, ``templates``,
+            ``component_templates`` and ``index_templates`` entries.
+        :param bodies: Dictionary of file paths and their raw bodies.
+        """
+        chunks = []
+        offsets = {}
+        position = 0
+        for body_path, body in bodies.items():
+            data = body.encode("utf-8")
+            offsets[body_path] = (position, len(data))
+            chunks.append(data)
+            position += len(data)
+
+        header = dict(registry, version=cls.version, bodies=offsets)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(json.dumps(header).encode("utf-8"))
+            fp.write(b"\n")
+            for chunk in chunks:
+                fp.write(chunk)
+        os.replace(tmp_path, path)
+
+
+class StartupProfile(object):
+    """Timings of the entry point loading and directory walks.
+
+    For every loaded entry point, a record with the following keys is kept:
+
+    - ``group``: the entry point group;
+    - ``name`` and ``module``: the entry point name and module;
+    - ``load_time``: seconds spent loading the entry point and resolving its
+      package, excluding the directory walks;
+    - ``walk_time``: seconds spent walking the directories;
+    - ``files``: number of JSON files found.
+    """
+
+    def __init__(self):
+        """Initialize the profile."""
+        self.entries = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def entry_point(self, group, ep):
+        """Profile the loading of an entry point.
+
+        :param group: The entry point group.
+        :param ep: The entry point.
+        """
+        record = {
+            "group": group,
+            "name": str(ep.name),
+            "module": str(ep.module),
+            "load_time": 0.0,
+            "walk_time": 0.0,
+            "files": 0,
+        }
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["load_time"] = time.perf_counter() - start - record["walk_time"]
+            self._local.record = None
+            with self._lock:
+                self.entries.append(record)
+
+    def add_walk(self, duration, files):
+        """Add a directory walk to the entry point being profiled.
+
+        :param duration: Duration of the walk in seconds.
+        :param files: Number of JSON files found.
+        """
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record["walk_time"] += duration
+            record["files"] += files
+
+    @property
+    def groups(self):
+        """Totals per entry point group."""
+        groups = {}
+        for record in self.entries:
+            totals = groups.setdefault(
+                record["group"],
+                {"entry_points": 0, "load_time": 0.0, "walk_time": 0.0, "files": 0},
+            )
+            totals["entry_points"] += 1
+            for key in ("load_time", "walk_time", "files"):
+                totals[key] += record[key]
+        return groups
+
+    def slowest(self, limit=None):
+        """Return the entry point records, slowest first.
+
+        :param limit: Maximum number of records to return.
+        """
+        records = sorted(
+            self.entries,
+            key=lambda record: record["load_time"] + record["walk_time"],
+            reverse=True,
+        )
+        return records[:limit] if limit else records
+
+    def to_dict(self):
+        """Return the profile as a JSON-serializable dictionary."""
+        return {"groups": self.groups, "entry_points": self.slowest()}
@@ -10,44 +10,107 @@
 
 """Transparency module for importing the chosen search engine.
 
-This module imports the ``elasticsearch``/``opensearchpy`` and
+This module provides the ``elasticsearch``/``opensearchpy`` and
 ``elasticsearch_dsl``/``opensearch_dsl`` packages based on availability,
-and provides them as ``search`` and ``dsl`` respectively.
+as ``search`` and ``dsl`` respectively.
 The aim of this is to make the choice of the search engine (Elasticsearch
 vs. OpenSearch) more transparent.
+
+The installed distribution is detected without importing the client
+libraries. ``search``, ``dsl``, ``SearchEngine`` and ``AsyncSearchEngine`` (the
+asyncio client, which requires ``aiohttp``) are imported on first use,
+so that importing Invenio-Search (e.g. in CLI commands or workers which never
+query the search engine) does not pull in the client stack.
 """
 
+import importlib
+import importlib.util
+
 ES = "Elasticsearch"
 OS = "OpenSearch"
 
-try:
-    # fail if both ES and OS packages are installed
-    import elasticsearch
-    import elasticsearch_dsl
-    import opensearch_dsl
-    import opensearchpy
-except ModuleNotFoundError:
-    # only one or zero are installed
 
-    try:
-        import elasticsearch as search
-        import elasticsearch_dsl as dsl
+class LazyModule(object):
+    """Proxy to a module which is imported on first attribute access."""
 
-        SearchEngine = search.Elasticsearch
-        SEARCH_DISTRIBUTION = ES
+    def __init__(self, name):
+        """Initialize the proxy.
 
-    except ModuleNotFoundError:
-        import opensearch_dsl as dsl
-        import opensearchpy as search
+        :param name: The name of the module to import.
+        """
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
 
-        SearchEngine = search.OpenSearch
-        SEARCH_DISTRIBUTION = OS
+    def _load(self):
+        """Import the module if needed and return it."""
+        if self._module is None:
+            object.__setattr__(self, "_module", importlib.import_module(self._name))
+        return self._module
 
-else:
-    # no exception raised, both are installed. Fail.
+    def __getattr__(self, name):
+        """Get an attribute of the module."""
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        """Set an attribute of the module."""
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name):
+        """Delete an attribute of the module."""
+        delattr(self._load(), name)
+
+    def __dir__(self):
+        """List the attributes of the module."""
+        return dir(self._load())
+
+    def __repr__(self):
+        """Representation of the proxy."""
+        return "<lazy module {!r}>".format(self._name)
+
+
+def _is_installed(*names):
+    """Check if all the given top-level packages are installed."""
+    return all(importlib.util.find_spec(name) is not None for name in names)
+
+
+if _is_installed(
+    "elasticsearch", "elasticsearch_dsl", "opensearchpy", "opensearch_dsl"
+):
+    # both are installed. Fail.
     raise ImportError(
         "Elasticsearch and OpenSearch libraries cannot be installed both at the same time. Please uninstall the one that you are not using."
     )
+elif _is_installed("elasticsearch", "elasticsearch_dsl"):
+    search = LazyModule("elasticsearch")
+    dsl = LazyModule("elasticsearch_dsl")
+    _search_engine_class = "Elasticsearch"
+    SEARCH_DISTRIBUTION = ES
+elif _is_installed("opensearchpy", "opensearch_dsl"):
+    search = LazyModule("opensearchpy")
+    dsl = LazyModule("opensearch_dsl")
+    _search_engine_class = "OpenSearch"
+    SEARCH_DISTRIBUTION = OS
+else:
+    raise ModuleNotFoundError(
+        "No search engine library found. Please install invenio-search with "
+        "one of the 'elasticsearch7', 'opensearch1' or 'opensearch2' extras."
+    )
+
+
+def __getattr__(name):
+    """Resolve the ``SearchEngine`` and ``AsyncSearchEngine`` client classes."""
+    if name == "SearchEngine":
+        return getattr(search, _search_engine_class)
+    if name == "AsyncSearchEngine":
+        try:
+            return getattr(search, "Async" + _search_engine_class)
+        except AttributeError:
+            # the asyncio client is only available if aiohttp is installed
+            raise ImportError(
+                "The asyncio search client requires aiohttp. Please install "
+                "invenio-search with the 'async' extra."
+            )
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 def check_search_version(distribution, version):
@@ -91,6 +154,7 @@ __all__ = (
     "ES",
     "OS",
     "SEARCH_DISTRIBUTION",
+    "AsyncSearchEngine",
     "SearchEngine",
     "check_es_version",
     "check_os_version",
@@ -15,3 +15,24 @@ class IndexAlreadyExistsError(Exception):
 
 class NotAllowedMappingUpdate(Exception):
     """Raised when attempted mapping update is not allowed."""
+
+
+class PointInTimeNotSupportedError(Exception):
+    """Raised when the search client does not support points in time."""
+
+
+class QueryCostError(Exception):
+    """Raised when a search is rejected by a query cost rule."""
+
+    def __init__(self, rule, message):
+        """Initialize the error.
+
+        :param rule: The name of the rule.
+        :param message: The description of the violation.
+        """
+        super().__init__("{}: {}".format(rule, message))
+        self.rule = rule
+
+
+class QueryCostWarning(UserWarning):
+    """Warning about a search violating a query cost rule."""
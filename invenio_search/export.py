@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Parallel export of all the results of a search.
+
+The search is split into slices of a point in time, which are paged through
+with ``search_after`` in parallel:
+
+.. code-block:: python
+
+    from invenio_search.export import ExportCheckpoint, sliced_export
+
+    for hit in sliced_export(
+        RecordsSearch(index="records"),
+        slices=8,
+        checkpoint=ExportCheckpoint("/tmp/records-export.json"),
+    ):
+        write(hit.to_dict())
+
+The progress of every slice is saved in the checkpoint after each page, so
+that an interrupted export resumes where it stopped, provided that
+``SEARCH_SORT_TIEBREAKER`` is a document field. Hits are delivered at
+least once: after a resume, the hits of the pages which were being processed
+are delivered again.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import total_ordering
+
+from flask import current_app
+
+from . import engine
+from .engine import dsl
+from .pit import (
+    close_point_in_time,
+    open_point_in_time,
+    pit_body,
+    pit_search_params,
+    with_tiebreaker,
+)
+from .proxies import current_search
+
+
+class ExportCheckpoint(object):
+    """Progress of a sliced export, stored in a JSON file."""
+
+    def __init__(self, path):
+        """Initialize the checkpoint.
+
+        :param path: Path of the checkpoint file.
+        """
+        self.path = path
+
+    def load(self):
+        """Return the saved progress, or ``None`` if there is none."""
+        try:
+            with open(self.path, "r") as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return None
+
+    def save(self, progress):
+        """Save the progress, replacing the file atomically.
+
+        :param progress: JSON-serializable progress of the export.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump(progress, fp)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the saved progress."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+_process_clients = {}
+
+
+def _fetch_page_in_process(client_config, body, params):
+    """Fetch a page in a worker process, with a client per process."""
+    key = json.dumps(client_config, sort_keys=True, default=repr)
+    client = _process_clients.get(key)
+    if client is None:
+        client = _process_clients[key] = engine.SearchEngine(**client_config)
+    return _fetch_page(client, body, params)
+
+
+def _fetch_page(client, body, params):
+    """Fetch a page and return its hits."""
+    return client.search(body=body, **params)["hits"]["hits"]
+
+
+@total_ordering
+class _Reversed(object):
+    """Wrapper reversing the order of a sort value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def _sort_key(sort):
+    """Return a function computing the merge key of a hit.
+
+    The hits are ordered as by the search engine: ``_score`` is sorted in
+    descending order by default, and the hits missing a sort value come last
+    unless ``missing`` is ``"_first"``.
+    """
+    options = []
+    for option in sort:
+        field, order, missing = option, None, "_last"
+        if isinstance(option, dict):
+            field, order = next(iter(option.items()))
+            if isinstance(order, dict):
+                missing = order.get("missing", "_last")
+                order = order.get("order")
+        if order is None:
+            order = "desc" if field == "_score" else "asc"
+        options.append((order == "desc", missing == "_first"))
+
+    def key(hit):
+        return tuple(
+            (
+                (not missing_first, None)
+                if value is None
+                else (missing_first, _Reversed(value) if desc else value)
+            )
+            for value, (desc, missing_first) in zip(hit["sort"], options)
+        )
+
+    return key
+
+
+def sliced_export(
+    search,
+    slices=4,
+    page_size=None,
+    keep_alive=None,
+    ordered=False,
+    executor="thread",
+    max_workers=None,
+    checkpoint=None,
+):
+    """Iterate over all the hits of a search, fetching slices in parallel.
+
+    :param search: The search, e.g. a
+        :class:`~invenio_search.api.RecordsSearch`. Its pagination is ignored.
+    :param slices: Number of slices of the point in time.
+    :param page_size: Number of hits per request and slice (default:
+        ``SEARCH_STREAM_PAGE_SIZE``).
+    :param keep_alive: Keep-alive of the point in time (default:
+        ``SEARCH_PIT_KEEP_ALIVE``).
+    :param ordered: If ``True``, the hits of all the slices are merged in the
+        order of the search sort. Otherwise they are yielded as soon as they
+        are fetched, which is faster.
+    :param executor: ``"thread"`` to fetch the slices in a thread pool, or
+        ``"process"`` to fetch (and parse) them in a process pool, where each
+        process uses its own client built from the client configuration.
+    :param max_workers: Maximum number of workers (default: ``slices``).
+    :param checkpoint: An :class:`ExportCheckpoint` (or any object with the
+        same ``load`` and ``save`` methods) to resume the export from. It
+        requires ``SEARCH_SORT_TIEBREAKER`` to be a document field, e.g.
+        ``{"id": "asc"}``, as the saved positions are used with a new point
+        in time.
+    """
+    tiebreaker = current_app.config.get("SEARCH_SORT_TIEBREAKER")
+    if checkpoint is not None and (not tiebreaker or tiebreaker == "_shard_doc"):
+        raise ValueError(
+            "Resumable exports require SEARCH_SORT_TIEBREAKER to be set to a "
+            "document field identifying the documents uniquely, as the "
+            "positions saved in the checkpoint are used with a new point in "
+            "time."
+        )
+    page_size = page_size or current_app.config.get("SEARCH_STREAM_PAGE_SIZE", 1000)
+    keep_alive = keep_alive or current_app.config.get("SEARCH_PIT_KEEP_ALIVE", "1m")
+
+    body = search.to_dict()
+    body.pop("from", None)
+    body["size"] = page_size
+    body["sort"] = with_tiebreaker(body.get("sort"))
+    params = pit_search_params(search._params)
+    fingerprint = hashlib.sha1(
+        json.dumps([search._index, body, slices], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+    progress = checkpoint.load() if checkpoint is not None else None
+    if progress is not None and progress.get("fingerprint") != fingerprint:
+        raise ValueError("The checkpoint belongs to a different export.")
+    if progress is None:
+        progress = {
+            "fingerprint": fingerprint,
+            "slices": [{"search_after": None, "done": False} for _ in range(slices)],
+        }
+
+    client = dsl.connections.get_connection(search._using)
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers or slices)
+        client_config = current_search._client_config()
+
+        def submit(page_body):
+            return pool.submit(_fetch_page_in_process, client_config, page_body, params)
+
+    else:
+        pool = ThreadPoolExecutor(
+            max_workers=max_workers or slices,
+            thread_name_prefix="invenio-search-export",
+        )
+
+        def submit(page_body):
+            return pool.submit(_fetch_page, client, page_body, params)
+
+    pit_id = open_point_in_time(client, search._index, keep_alive, search._params)
+    # position of the next page to fetch of every slice
+    fetch_after = {
+        i: state["search_after"]
+        for i, state in enumerate(progress["slices"])
+        if not state["done"]
+    }
+    futures = {}
+
+    def fetch(slice_id):
+        page_body = dict(body, pit=pit_body(pit_id, keep_alive))
+        if slices > 1:
+            page_body["slice"] = {"id": slice_id, "max": slices}
+        if fetch_after[slice_id] is not None:
+            page_body["search_after"] = fetch_after[slice_id]
+        futures[submit(page_body)] = slice_id
+
+    def fetched(future):
+        """Return the slice and hits of a page, fetching the next page."""
+        slice_id = futures.pop(future)
+        hits = future.result()
+        last_page = len(hits) < page_size
+        if not last_page:
+            fetch_after[slice_id] = hits[-1]["sort"]
+            fetch(slice_id)
+        return slice_id, hits, last_page
+
+    def save():
+        if checkpoint is not None:
+            checkpoint.save(progress)
+
+    try:
+        for slice_id in fetch_after:
+            fetch(slice_id)
+
+        if not ordered:
+            while futures:
+                completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    slice_id, hits, last_page = fetched(future)
+                    for hit in hits:
+                        yield search._get_result(hit)
+                    state = progress["slices"][slice_id]
+                    if hits:
+                        state["search_after"] = hits[-1]["sort"]
+                    state["done"] = last_page
+                    save()
+            return
+
+        key = _sort_key(body["sort"])
+        buffers = {slice_id: deque() for slice_id in fetch_after}
+        exhausted = set()
+        heads = []
+        while True:
+            # the next hit is known only once every slice has buffered hits
+            waiting = [i for i, b in buffers.items() if not b and i not in exhausted]
+            while waiting:
+                save()
+                completed, _ = wait(
+                    [f for f, i in futures.items() if i in waiting],
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in completed:
+                    slice_id, hits, last_page = fetched(future)
+                    if last_page:
+                        exhausted.add(slice_id)
+                    if hits and not buffers[slice_id]:
+                        heapq.heappush(heads, (key(hits[0]), slice_id))
+                    buffers[slice_id].extend(hits)
+                    if last_page and not hits:
+                        progress["slices"][slice_id]["done"] = True
+                waiting = [
+                    i for i, b in buffers.items() if not b and i not in exhausted
+                ]
+            if not heads:
+                break
+
+            _, slice_id = heapq.heappop(heads)
+            buffer = buffers[slice_id]
+            hit = buffer.popleft()
+            if buffer:
+                heapq.heappush(heads, (key(buffer[0]), slice_id))
+            state = progress["slices"][slice_id]
+            state["search_after"] = hit["sort"]
+            state["done"] = not buffer and slice_id in exhausted
+            yield search._get_result(hit)
+        save()
+    finally:
+        close_point_in_time(client, pit_id)
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
@@ -10,26 +10,91 @@
 
 """Invenio module for information retrieval."""
 
+import copy
 import json
 import os
+import threading
+import time
 import warnings
+from contextlib import nullcontext
 from importlib.resources import files
 
 import dictdiffer
 from invenio_base.utils import entry_points
-from werkzeug.utils import cached_property
+from werkzeug.utils import cached_property, import_string
 
-from . import config
+from . import batching, config, engine
+from .bodies import BodyCache
+from .cache import ResponseCache
 from .cli import index as index_cmd
-from .engine import ES, OS, SEARCH_DISTRIBUTION, SearchEngine, dsl, search
+from .discovery import (
+    DiscoveryCache,
+    RegistryBundle,
+    StartupProfile,
+    map_concurrent,
+    walk_json_files,
+)
+from .engine import ES, OS, SEARCH_DISTRIBUTION, dsl, search
 from .errors import IndexAlreadyExistsError, NotAllowedMappingUpdate
+from .guard import QueryGuard
+from .pit import PaginationCursors
+from .preference import ReplicaStats
+from .singleflight import SingleFlight
 from .utils import (
+    LRUCache,
     build_alias_name,
     build_index_from_parts,
     build_index_name,
     timestamp_suffix,
 )
 
+_mappings_modules = {}
+_mappings_modules_lock = threading.Lock()
+
+
+def _resolve_mappings_module(module):
+    """Resolve the mappings/templates module of a package, once per process.
+
+    :param module: the module/package name.
+    :returns: A tuple with the resolved module name and its files.
+    """
+    resolved = _mappings_modules.get(module)
+    if resolved is not None:
+        return resolved
+
+    search_major_version = search.VERSION[0]
+    fallback = False
+    if SEARCH_DISTRIBUTION == ES:
+        subfolder = "v{}".format(search_major_version)
+    elif SEARCH_DISTRIBUTION == OS:
+        subfolder = "os-v{}".format(search_major_version)
+
+        # Make sure that the OpenSearch mappings are in the folder.
+        # The fallback can be removed after transition to OpenSearch.
+        if not (files(module) / subfolder).is_dir():
+            # fallback to ES folder with a warning if `os-vx` is not found
+            subfolder = "v7"
+            fallback = True
+    else:
+        # should never happen
+        raise RuntimeError("Unknown search distribution {}".format(SEARCH_DISTRIBUTION))
+
+    name = "{}.{}".format(module, subfolder)
+    resolved = (name, files(name))
+    with _mappings_modules_lock:
+        if module in _mappings_modules:
+            return _mappings_modules[module]
+        _mappings_modules[module] = resolved
+
+    if fallback:
+        warnings.warn(
+            "OpenSearch v{version} mappings files not found, falling back to Elasticsearch v7 mappings for module {module}. Please add the missing OpenSearch os-v{version} mappings.".format(
+                module=module,
+                version=search_major_version,
+            )
+        )
+    return resolved
+
 
 class _SearchState(object):
     """Store connection to elastic client and registered indexes."""
@@ -52,9 +117,23 @@ class _SearchState(object):
             The entrypoint group name to load templates.
         """
         self.app = app
-        self.mappings = {}
-        self.aliases = {}
+        self._mappings = {}
+        self._aliases = {}
+        self._mappings_lock = threading.RLock()
+        self._mappings_loading = False
+        self._mappings_loaded = False
         self._client = kwargs.get("client")
+        self._async_client = kwargs.get("async_client")
+        self._cluster_info = None
+        self._prefixed_names = None
+        self._cluster_info_lock = threading.Lock()
+        self._use_registry_bundle = kwargs.get("use_registry_bundle", True)
+        self.startup_profile = (
+            StartupProfile()
+            if kwargs.get("startup_profile", app.config.get("SEARCH_STARTUP_PROFILE"))
+            else None
+        )
+        self.entry_point_group_mappings = entry_point_group_mappings
         self.entry_point_group_templates = entry_point_group_templates
         self.entry_point_group_component_templates = (
             entry_point_group_component_templates
@@ -62,8 +141,86 @@ class _SearchState(object):
         self.entry_point_group_index_templates = entry_point_group_index_templates
         self._current_suffix = None
 
-        if entry_point_group_mappings:
-            self.load_entry_point_group_mappings(entry_point_group_mappings)
+        self.bodies = BodyCache(maxsize=app.config.get("SEARCH_BODY_CACHE_SIZE", 256))
+        self.compiled_searches = LRUCache(
+            maxsize=app.config.get("SEARCH_COMPILED_SEARCH_CACHE_SIZE", 128)
+        )
+        self.preference_stats = ReplicaStats()
+        self.single_flight = SingleFlight()
+        self.pagination_cursors = PaginationCursors(
+            maxsize=app.config.get("SEARCH_PAGINATION_CURSORS_SIZE", 1024)
+        )
+        self.discovery_workers = kwargs.get(
+            "discovery_workers", app.config.get("SEARCH_DISCOVERY_WORKERS", 1)
+        )
+
+    def _load_mappings(self):
+        """Register the mappings of the entry point group on first access.
+
+        Loading the entry points and walking the mapping directories is
+        deferred until the mappings or aliases are actually needed, so that
+        processes that never use search do not pay for it.
+        """
+        if self._mappings_loaded:
+            return
+        with self._mappings_lock:
+            # re-entrant call from ``register_mappings`` while loading
+            if self._mappings_loading or self._mappings_loaded:
+                return
+            self._mappings_loading = True
+            try:
+                if self.entry_point_group_mappings and self._bundle is not None:
+                    # the trees are extended by ``register_mappings()``
+                    self._mappings.update(self._bundle.header["mappings"])
+                    self._aliases.update(copy.deepcopy(self._bundle.header["aliases"]))
+                elif self.entry_point_group_mappings:
+                    self.load_entry_point_group_mappings(
+                        self.entry_point_group_mappings
+                    )
+            except Exception:
+                self._mappings.clear()
+                self._aliases.clear()
+                raise
+            finally:
+                self._mappings_loading = False
+            self._mappings_loaded = True
+
+    @property
+    def mappings(self):
+        """Dictionary of registered index names and mapping file paths."""
+        self._load_mappings()
+        return self._mappings
+
+    @property
+    def aliases(self):
+        """Tree of registered aliases and their indices."""
+        self._load_mappings()
+        return self._aliases
+
+    @property
+    def prefixed_names(self):
+        """Table of registered index and alias names and their prefixed names.
+
+        The table is built once for the current ``SEARCH_INDEX_PREFIX`` and is
+        used to prefix the registered names without recomputing them.
+        """
+        prefix = self.app.config.get("SEARCH_INDEX_PREFIX") or ""
+        table = self._prefixed_names
+        if table is None or table[0] != prefix:
+            if self._mappings_loading:
+                # names requested while the mappings are being registered
+                return {}
+            names = {}
+
+            def _add(tree):
+                for name, value in tree.items():
+                    names[name] = prefix + name
+                    if isinstance(value, dict):
+                        _add(value)
+
+            _add(self.aliases)
+            table = self._prefixed_names = (prefix, names)
+        return table[1]
 
     @property
     def current_suffix(self):
@@ -72,37 +229,99 @@ class _SearchState(object):
             self._current_suffix = timestamp_suffix()
         return self._current_suffix
 
+    @cached_property
+    def _discovery(self):
+        """Return the discovery cache, if configured.
+
+        It is created when the mappings or templates are first discovered, as
+        it reads its file and fingerprints the installed distributions.
+        """
+        path = self.app.config.get("SEARCH_DISCOVERY_CACHE")
+        return DiscoveryCache(path) if path else None
+
+    @cached_property
+    def _bundle(self):
+        """Return the precompiled registry bundle, if configured and usable."""
+        path = self.app.config.get("SEARCH_REGISTRY_BUNDLE")
+        if not path or not self._use_registry_bundle:
+            return None
+        try:
+            bundle = RegistryBundle(path)
+        except (OSError, ValueError) as e:
+            warnings.warn(
+                "Search registry bundle {path} could not be loaded: {error}".format(
+                    path=path, error=e
+                )
+            )
+            return None
+
+        header = bundle.header
+        if (header["distribution"], header["search_version"]) != (
+            SEARCH_DISTRIBUTION,
+            search.VERSION[0],
+        ):
+            warnings.warn(
+                "Search registry bundle {path} was compiled for {distribution} "
+                "v{version}, ignoring it.".format(
+                    path=path,
+                    distribution=header["distribution"],
+                    version=header["search_version"],
+                )
+            )
+            return None
+
+        self.bodies.bundle = bundle
+        return bundle
+
     def _collect_templates(self, entrypoint_group):
         """Load actions from an entry point group."""
-        result = []
-        for ep in entry_points(group=entrypoint_group):
-            loaded_ep = ep.load()
 
-            if callable(loaded_ep):
-                for template_dir in loaded_ep():
-                    result.append(self.register_templates(template_dir))
-            else:
-                result.append(self.register_templates(ep.module))
+        def _load(ep):
+            with self._profile_entry_point(entrypoint_group, ep):
+                loaded_ep = ep.load()
+
+                if callable(loaded_ep):
+                    return [
+                        self.register_templates(template_dir)
+                        for template_dir in loaded_ep()
+                    ]
+                return [self.register_templates(ep.module)]
+
+        # entry points are loaded concurrently but merged in their order, so
+        # that the last one still wins on duplicate template names
+        result = map_concurrent(
+            _load, entry_points(group=entrypoint_group), self.discovery_workers
+        )
+
+        if self._discovery is not None:
+            self._discovery.save()
 
         templates = {}
-        for template in result:
-            for name, path in template.items():
-                templates[name] = path
+        for ep_templates in result:
+            for template in ep_templates:
+                for name, path in template.items():
+                    templates[name] = path
         return templates
 
     @cached_property
     def templates(self):
         """Generate a dictionary with template names and file paths."""
+        if self._bundle is not None:
+            return self._bundle.header["templates"]
         return self._collect_templates(self.entry_point_group_templates)
 
     @cached_property
     def component_templates(self):
         """Generate a dictionary with component template names and file paths."""
+        if self._bundle is not None:
+            return self._bundle.header["component_templates"]
         return self._collect_templates(self.entry_point_group_component_templates)
 
     @cached_property
     def index_templates(self):
         """Generate a dictionary with index template names and file paths."""
+        if self._bundle is not None:
+            return self._bundle.header["index_templates"]
         return self._collect_templates(self.entry_point_group_index_templates)
 
     @staticmethod
@@ -114,110 +333,160 @@ class _SearchState(object):
 
         :param module: the module/package name.
         """
-        search_major_version = search.VERSION[0]
-        if SEARCH_DISTRIBUTION == ES:
-            subfolder = "v{}".format(search_major_version)
-        elif SEARCH_DISTRIBUTION == OS:
-            subfolder = "os-v{}".format(search_major_version)
-
-            # Make sure that the OpenSearch mappings are in the folder.
-            # The fallback can be removed after transition to OpenSearch.
-            if not (files(module) / subfolder).is_dir():
-                # fallback to ES folder with a warning if `os-vx` is not found
-                subfolder = "v7"
-                warnings.warn(
-                    "OpenSearch v{version} mappings files not found, falling back to Elasticsearch v7 mappings for module {module}. Please add the missing OpenSearch os-v{version} mappings.".format(
-                        module=module,
-                        version=search_major_version,
-                    )
-                )
-        else:
-            # should never happen
-            raise RuntimeError(
-                "Unknown search distribution {}".format(SEARCH_DISTRIBUTION)
-            )
+        return _resolve_mappings_module(module)[0]
 
-        return "{}.{}".format(module, subfolder)
+    @staticmethod
+    def _get_mappings_files(module):
+        """Return the resolved mappings/templates module and its files.
 
-    def register_mappings(self, alias, package_name):
-        """Register mappings from a package under given alias.
+        :param module: the module/package name.
+        :returns: A tuple with the resolved module name and its
+            :class:`~importlib.resources.abc.Traversable`.
+        """
+        return _resolve_mappings_module(module)
 
-        :param alias: The alias.
-        :param package_name: The package name.
+    def resolve_mappings_modules(self, modules=None):
+        """Resolve the mappings/templates modules of many packages at once.
+
+        The resolution is memoized for the lifetime of the process, so that
+        the subsequent registration of the packages does not probe the
+        filesystem again.
+
+        :param modules: The module/package names. Defaults to the modules of
+            all the mappings and templates entry points (template entry points
+            returning a list of modules are not loaded).
+        :returns: A dictionary of module names and resolved module names.
         """
-        package_name = self._get_mappings_module(package_name)
+        if modules is None:
+            groups = (
+                self.entry_point_group_mappings,
+                self.entry_point_group_templates,
+                self.entry_point_group_component_templates,
+                self.entry_point_group_index_templates,
+            )
+            modules = {
+                ep.module: None
+                for group in groups
+                if group
+                for ep in entry_points(group=group)
+            }
+        modules = list(dict.fromkeys(modules))
+        resolved = map_concurrent(
+            self._get_mappings_module, modules, self.discovery_workers
+        )
+        return dict(zip(modules, resolved))
 
-        def _walk_dir(aliases, *parts):
-            root_name = build_index_from_parts(*parts)
-            resource_name = os.path.join(*parts)
+    def _walk(self, root):
+        """Return the directories and JSON files below ``root``.
 
-            data = aliases.get(root_name, {})
+        Uses the discovery cache when it is enabled.
 
-            for filename in os.listdir(files(package_name) / resource_name):
-                file_path = os.path.join(resource_name, filename)
+        :param root: Path of the directory to walk.
+        """
+        start = time.perf_counter()
+        if self._discovery is not None:
+            entries = self._discovery.walk(root)
+        else:
+            entries = walk_json_files(root)[0]
 
-                if (files(package_name) / file_path).is_dir():
-                    _walk_dir(data, *(parts + (filename,)))
-                    continue
+        if self.startup_profile is not None:
+            self.startup_profile.add_walk(
+                time.perf_counter() - start,
+                sum(1 for entry in entries if not entry.endswith("/")),
+            )
+        return entries
 
-                filename_root, ext = os.path.splitext(filename)
-                if ext not in {
-                    ".json",
-                }:
-                    continue
+    def _profile_entry_point(self, group, ep):
+        """Return a context profiling the loading of an entry point."""
+        if self.startup_profile is None:
+            return nullcontext()
+        return self.startup_profile.entry_point(group, ep)
 
-                index_name = build_index_from_parts(*(parts + (filename_root,)))
-                assert index_name not in data, "Duplicate index"
+    def _scan_mappings(self, alias, package_name):
+        """Find the mapping files of a package under given alias.
 
-                filename = os.path.join(files(package_name), resource_name, filename)
-                data[index_name] = filename
-                self.mappings[index_name] = filename
+        :param alias: The alias.
+        :param package_name: The package name.
+        :returns: A tuple with the root directory of the alias and its entries
+            as returned by :func:`~invenio_search.discovery.walk_json_files`.
+        """
+        root = os.path.join(self._get_mappings_files(package_name)[1], alias)
+        return root, self._walk(root)
+
+    def _merge_mappings(self, alias, root, entries):
+        """Register the mapping files found by :meth:`_scan_mappings`."""
+        self._prefixed_names = None
+        data = self.aliases.get(alias, {})
+        trees = {"": data}
+        for entry in entries:
+            relative_path = entry.rstrip("/")
+            parent, _, filename = relative_path.rpartition("/")
+            tree = trees[parent]
+            parts = (alias,) + tuple(parent.split("/"))
+
+            if entry.endswith("/"):
+                root_name = build_index_from_parts(*(parts + (filename,)))
+                trees[relative_path] = tree.setdefault(root_name, {})
+                continue
+
+            filename_root = os.path.splitext(filename)[0]
+            index_name = build_index_from_parts(*(parts + (filename_root,)))
+            assert index_name not in tree, "Duplicate index"
+
+            filename = os.path.join(root, *relative_path.split("/"))
+            tree[index_name] = filename
+            self.mappings[index_name] = filename
+
+        self.aliases[alias] = data
 
-            aliases[root_name] = data
+    def register_mappings(self, alias, package_name):
+        """Register mappings from a package under given alias.
 
-        # Start the recursion here:
-        _walk_dir(self.aliases, alias)
+        :param alias: The alias.
+        :param package_name: The package name.
+        """
+        self._merge_mappings(alias, *self._scan_mappings(alias, package_name))
 
     def register_templates(self, module):
         """Register templates from the provided module.
 
         :param module: The templates module.
         """
-        module = self._get_mappings_module(module)
+        root = str(self._get_mappings_files(module)[1])
         result = {}
 
-        def _walk_dir(*parts):
-            parts = parts or tuple()
-            resource_name = os.path.join(*parts) if parts else ""
-            for filename in os.listdir(files(module) / resource_name):
-                file_path = os.path.join(resource_name, filename)
-
-                if (files(module) / file_path).is_dir():
-                    _walk_dir(*(parts + (filename,)))
-                    continue
-
-                filename_root, ext = os.path.splitext(filename)
-                if ext not in {
-                    ".json",
-                }:
-                    continue
-
-                template_name = build_index_from_parts(*(parts + (filename_root,)))
-                filename = os.path.join(files(module), resource_name, filename)
-                result[template_name] = filename
+        for entry in self._walk(root):
+            if entry.endswith("/"):
+                continue
+            parent, _, filename = entry.rpartition("/")
+            filename_root = os.path.splitext(filename)[0]
+            template_name = build_index_from_parts(
+                *(tuple(parent.split("/")) + (filename_root,))
+            )
+            result[template_name] = os.path.join(root, *entry.split("/"))
 
-        # Start the recursion here:
-        _walk_dir()
         return result
 
     def load_entry_point_group_mappings(self, entry_point_group_mappings):
         """Load actions from an entry point group."""
-        for ep in entry_points(group=entry_point_group_mappings):
-            self.register_mappings(ep.name, ep.module)
 
-    def _client_builder(self):
-        """Build search engine (ES/OS) client."""
-        client_config = self.app.config.get("SEARCH_CLIENT_CONFIG") or {}
+        def _scan(ep):
+            with self._profile_entry_point(entry_point_group_mappings, ep):
+                return self._scan_mappings(ep.name, ep.module)
+
+        eps = list(entry_points(group=entry_point_group_mappings))
+        # the packages are scanned concurrently, but merged in the order of
+        # the entry points so that duplicates are resolved as before
+        scans = map_concurrent(_scan, eps, self.discovery_workers)
+        for ep, (root, entries) in zip(eps, scans):
+            self._merge_mappings(ep.name, root, entries)
+
+        if self._discovery is not None:
+            self._discovery.save()
+
+    def _client_config(self):
+        """Build the configuration of the search engine (ES/OS) clients."""
+        client_config = dict(self.app.config.get("SEARCH_CLIENT_CONFIG") or {})
 
         hosts = self.app.config.get("SEARCH_HOSTS")
         elastic_hosts = self.app.config.get("SEARCH_ELASTIC_HOSTS")
@@ -228,7 +497,15 @@ class _SearchState(object):
             )
 
         client_config.setdefault("hosts", hosts or elastic_hosts)
-        return SearchEngine(**client_config)
+        return client_config
+
+    def _client_builder(self):
+        """Build search engine (ES/OS) client."""
+        return engine.SearchEngine(**self._client_config())
+
+    def _async_client_builder(self):
+        """Build asyncio search engine (ES/OS) client."""
+        return engine.AsyncSearchEngine(**self._client_config())
 
     @property
     def client(self):
@@ -237,6 +514,83 @@ class _SearchState(object):
             self._client = self._client_builder()
         return self._client
 
+    @property
+    def async_client(self):
+        """Return asyncio client for current application.
+
+        The client is built from the same configuration as :attr:`client`.
+        It requires ``aiohttp`` (``pip install invenio-search[async]``).
+        """
+        if self._async_client is None:
+            self._async_client = self._async_client_builder()
+        return self._async_client
+
+    @cached_property
+    def response_cache(self):
+        """Return the response cache, if a backend is configured."""
+        backend = self.app.config.get("SEARCH_RESPONSE_CACHE_BACKEND")
+        if not backend:
+            return None
+        if isinstance(backend, str):
+            backend = import_string(backend)
+        return ResponseCache(backend(self.app))
+
+    @cached_property
+    def query_guard(self):
+        """Return the query cost guard, if rules are configured."""
+        rules = self.app.config.get("SEARCH_QUERY_GUARD_RULES")
+        return QueryGuard(rules) if rules else None
+
+    def _alias_path(self, index):
+        """Return the index, all the aliases containing it and its subtree.
+
+        For an alias, its subtree contains all the indices and aliases under
+        it, which share its data.
+        """
+
+        def _names(tree):
+            for name, value in tree.items():
+                yield name
+                if isinstance(value, dict):
+                    yield from _names(value)
+
+        def _find(tree, path):
+            for name, value in tree.items():
+                if name == index:
+                    below = list(_names(value)) if isinstance(value, dict) else []
+                    return path + [name] + below
+                if isinstance(value, dict):
+                    found = _find(value, path + [name])
+                    if found:
+                        return found
+            return None
+
+        return _find(self.aliases, []) or [index]
+
+    def invalidate_response_cache(self, *indices):
+        """Invalidate the cached responses of searches on indices.
+
+        The responses of the searches on the aliases containing the indices,
+        and for aliases on the indices and aliases they contain, are
+        invalidated too.
+
+        :param indices: Names of the registered indices or aliases.
+        """
+        cache = self.response_cache
+        if cache is None:
+            return
+        names = set()
+        for index in indices:
+            names.update(self._alias_path(index))
+        cache.invalidate(*(build_alias_name(name, app=self.app) for name in names))
+
+    def batch(self):
+        """Return a context batching the searches executed in it.
+
+        See :mod:`invenio_search.batching`.
+        """
+        return batching.batch()
+
     def flush_and_refresh(self, index):
         """Flush and refresh one or more indices.
 
@@ -249,12 +603,33 @@ class _SearchState(object):
         self.client.indices.flush(wait_if_ongoing=True, index=prefixed_index)
         self.client.indices.refresh(index=prefixed_index)
         self.client.cluster.health(wait_for_status="yellow", request_timeout=30)
+        self.invalidate_response_cache(index)
         return True
 
+    @property
+    def cluster_info(self):
+        """Get the cluster information, cached for ``SEARCH_CLUSTER_INFO_TTL``."""
+        cached = self._cluster_info
+        if cached is not None and (cached[0] is None or time.monotonic() < cached[0]):
+            return cached[1]
+        with self._cluster_info_lock:
+            # another thread may have refreshed it in the meantime
+            if self._cluster_info is not cached:
+                return self._cluster_info[1]
+            return self.refresh_cluster_info()
+
+    def refresh_cluster_info(self):
+        """Fetch the cluster information from the cluster and cache it."""
+        info = self.client.info()
+        ttl = self.app.config.get("SEARCH_CLUSTER_INFO_TTL", 300)
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._cluster_info = (expires, info)
+        return info
+
     @property
     def cluster_version(self):
         """Get version of Elasticsearch running on the cluster."""
-        versionstr = self.client.info()["version"]["number"]
+        versionstr = self.cluster_info["version"]["number"]
         return [int(x) for x in versionstr.split(".")]
 
     @property
@@ -263,7 +638,7 @@ class _SearchState(object):
         # OpenSearch provides a "distribution" field containing "opensearch"
         # Elasticsearch doesn't seem to do that
         # (checked versions: 7.10.2, 7.11.2, 7.17.5, 8.3.1)
-        return self.client.info()["version"].get("distribution", "elasticsearch")
+        return self.cluster_info["version"].get("distribution", "elasticsearch")
 
     @property
     def active_aliases(self):
@@ -306,31 +681,32 @@ class _SearchState(object):
         # index if the current instance is running without suffixes
         # make sure there is no index with the same name as the
         # alias name (i.e. the index name without the suffix).
-        with open(mapping_path, "r") as body:
-            final_index = build_index_name(
-                index, prefix=prefix, suffix=suffix, app=self.app
+        final_index = build_index_name(
+            index, prefix=prefix, suffix=suffix, app=self.app
+        )
+        if create_write_alias:
+            final_alias = build_alias_name(index, prefix=prefix, app=self.app)
+        index_result = (
+            self.client.indices.create(
+                index=final_index,
+                body=self.bodies.load(mapping_path),
+                ignore=ignore,
             )
-            if create_write_alias:
-                final_alias = build_alias_name(index, prefix=prefix, app=self.app)
-            index_result = (
-                self.client.indices.create(
+            if not dry_run
+            else None
+        )
+        if create_write_alias:
+            alias_result = (
+                self.client.indices.put_alias(
                     index=final_index,
-                    body=json.load(body),
+                    name=final_alias,
                     ignore=ignore,
                 )
                 if not dry_run
                 else None
             )
-            if create_write_alias:
-                alias_result = (
-                    self.client.indices.put_alias(
-                        index=final_index,
-                        name=final_alias,
-                        ignore=ignore,
-                    )
-                    if not dry_run
-                    else None
-                )
+        if not dry_run:
+            self.invalidate_response_cache(index)
         return (final_index, index_result), (final_alias, alias_result)
 
     def create(self, ignore=None, ignore_existing=False, index_list=None):
@@ -430,22 +806,22 @@ class _SearchState(object):
         # need to initialise Index class to use the .put_mapping API wrapper method
         index_ = dsl.Index(full_index_name, using=self.client)
 
-        with open(mapping_path, "r") as body:
-            mapping = json.load(body)["mappings"]
-            changes = list(dictdiffer.diff(old_mapping, mapping))
+        mapping = self.bodies.load(mapping_path)["mappings"]
+        changes = list(dictdiffer.diff(old_mapping, mapping))
 
-            # allow only additions to mappings (backwards compatibility is kept)
-            if not check or all([change[0] == "add" for change in changes]):
-                # raises 400 if the mapping cannot be updated
-                # (f.e. type changes or index needs to be closed)
-                index_.put_mapping(using=self.client, body=mapping)
-            else:
-                non_add_changes = [change for change in changes if change[0] != "add"]
-                raise NotAllowedMappingUpdate(
-                    "Only additions are allowed when updating mappings to keep backwards compatibility. "
-                    f"This mapping has {len(non_add_changes)} non addition changes.\n\n"
-                    f"Full list of changes: {changes}"
-                )
+        # allow only additions to mappings (backwards compatibility is kept)
+        if not check or all([change[0] == "add" for change in changes]):
+            # raises 400 if the mapping cannot be updated
+            # (f.e. type changes or index needs to be closed)
+            index_.put_mapping(using=self.client, body=mapping)
+            self.invalidate_response_cache(index)
+        else:
+            non_add_changes = [change for change in changes if change[0] != "add"]
+            raise NotAllowedMappingUpdate(
+                "Only additions are allowed when updating mappings to keep backwards compatibility. "
+                f"This mapping has {len(non_add_changes)} non addition changes.\n\n"
+                f"Full list of changes: {changes}"
+            )
 
     def _replace_prefix(self, template_path, body, enforce_prefix):
         """Replace index prefix in template request body."""
@@ -461,6 +837,101 @@ class _SearchState(object):
 
         return body.replace(pattern, prefix)
 
+    def get_mapping(self, index):
+        """Return the parsed mapping body of a registered index.
+
+        The body is cached and must not be modified.
+
+        :param index: Name of the registered index.
+        """
+        return self.bodies.load(self.mappings[index])
+
+    def get_template_body(self, template_path, enforce_prefix=True):
+        """Return the parsed body of a template with the index prefix replaced.
+
+        The body is cached and must not be modified.
+
+        :param template_path: Path of the template file.
+        :param enforce_prefix: Fail if a prefix is configured but the template
+            does not contain the prefix pattern.
+        """
+        prefix = self.app.config["SEARCH_INDEX_PREFIX"] or ""
+        return self.bodies.load(
+            template_path,
+            transform=lambda body: self._replace_prefix(
+                template_path, body, enforce_prefix
+            ),
+            variant=(prefix, enforce_prefix),
+        )
+
+    def _new_state(self, **kwargs):
+        """Create a new state with the same entry point groups.
+
+        :param kwargs: Extra keyword arguments for the new state.
+        """
+        return _SearchState(
+            self.app,
+            entry_point_group_mappings=self.entry_point_group_mappings,
+            entry_point_group_templates=self.entry_point_group_templates,
+            entry_point_group_component_templates=(
+                self.entry_point_group_component_templates
+            ),
+            entry_point_group_index_templates=self.entry_point_group_index_templates,
+            client=self._client,
+            async_client=self._async_client,
+            **kwargs,
+        )
+
+    def profile_startup(self):
+        """Profile the discovery of all mappings and templates.
+
+        The discovery is done from scratch in a new state, so that the result
+        does not depend on what was already loaded by this one.
+
+        :returns: A :class:`~invenio_search.discovery.StartupProfile`.
+        """
+        state = self._new_state(startup_profile=True)
+        state.mappings
+        state.templates
+        state.component_templates
+        state.index_templates
+        return state.startup_profile
+
+    def compile_registry(self, path):
+        """Compile the registered mappings and templates into a bundle.
+
+        The registry is discovered again from the entry points, ignoring any
+        configured bundle, and written together with all the bodies to a
+        :class:`~invenio_search.discovery.RegistryBundle` file which can then
+        be configured in ``SEARCH_REGISTRY_BUNDLE``. Mappings registered with
+        :meth:`register_mappings` are not compiled, as the applications
+        loading the bundle register them again.
+
+        :param path: Path of the bundle file to write.
+        :returns: The compiled registry.
+        """
+        state = self._new_state(use_registry_bundle=False)
+
+        registry = {
+            "distribution": SEARCH_DISTRIBUTION,
+            "search_version": search.VERSION[0],
+            "mappings": state.mappings,
+            "aliases": state.aliases,
+            "templates": state.templates,
+            "component_templates": state.component_templates,
+            "index_templates": state.index_templates,
+        }
+        bodies = {}
+        for name in ("mappings", "templates", "component_templates", "index_templates"):
+            for body_path in registry[name].values():
+                # validate and compact the bodies, the prefix is replaced on use
+                bodies[body_path] = json.dumps(
+                    state.bodies.loads(state.bodies.read(body_path)),
+                    separators=(",", ":"),
+                )
+        RegistryBundle.compile(path, registry, bodies)
+        return registry
+
     def _put_template(
         self, template_name, template_file, put_function, ignore, enforce_prefix=True
     ):
@@ -470,15 +941,13 @@ class _SearchState(object):
         fail if the template does not use the prefix
         """
         ignore = ignore or []
-        with open(template_file, "r") as fp:
-            body = fp.read()
-            replaced_body = self._replace_prefix(template_file, body, enforce_prefix)
-            template_name = build_alias_name(template_name, app=self.app)
-            return template_file, put_function(
-                name=template_name,
-                body=json.loads(replaced_body),
-                ignore=ignore,
-            )
+        body = self.get_template_body(template_file, enforce_prefix=enforce_prefix)
+        template_name = build_alias_name(template_name, app=self.app)
+        return template_file, put_function(
+            name=template_name,
+            body=body,
+            ignore=ignore,
+        )
 
     def put_templates(self, ignore=None):
         """Yield tuple with registered template and response from client."""
@@ -535,13 +1004,12 @@ class _SearchState(object):
                     if len(indices_to_delete) == 0:
                         pass
                     elif len(indices_to_delete) == 1:
-                        yield (
-                            name,
-                            self.client.indices.delete(
-                                index=indices_to_delete[0],
-                                ignore=ignore,
-                            ),
+                        result = self.client.indices.delete(
+                            index=indices_to_delete[0],
+                            ignore=ignore,
                         )
+                        self.invalidate_response_cache(name)
+                        yield (name, result)
                     else:
                         warnings.warn(
                             (
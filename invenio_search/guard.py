@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Query cost rules checked before the searches are sent.
+
+The rules configured in ``SEARCH_QUERY_GUARD_RULES`` inspect the request
+body of every executed search. Each rule has an action for the searches
+violating it:
+
+* ``"warn"``: emit a :class:`~invenio_search.errors.QueryCostWarning`.
+* ``"clamp"`` or ``"rewrite"``: send a fixed body instead, e.g. with a
+  smaller ``size``.
+* ``"reject"``: raise a :class:`~invenio_search.errors.QueryCostError`.
+
+.. code-block:: python
+
+    SEARCH_QUERY_GUARD_RULES = [
+        MaxResultWindow(10000, action="reject"),
+        MaxPageSize(500, action="clamp"),
+        LeadingWildcard(action="rewrite"),
+        MaxTermsAggregationSize(100, action="clamp"),
+    ]
+
+The violations are counted per search class and rule in
+``current_search.query_guard.violations``.
+"""
+
+import re
+import threading
+import warnings
+from collections import Counter
+
+from .errors import QueryCostError, QueryCostWarning
+
+ACTIONS = ("warn", "clamp", "rewrite", "reject")
+"""Actions of the rules."""
+
+
+class Rule(object):
+    """Base class of the query cost rules."""
+
+    #: Name of the rule, used in the messages and violation counts.
+    name = None
+
+    def __init__(self, action="warn"):
+        """Initialize the rule.
+
+        :param action: One of :data:`ACTIONS`.
+        """
+        if action not in ACTIONS:
+            raise ValueError("Unknown query cost rule action: {}".format(action))
+        self.action = action
+
+    def check(self, body):
+        """Return the description of the violation, or ``None``.
+
+        :param body: The request body.
+        """
+        raise NotImplementedError()
+
+    def fix(self, body):
+        """Return the body fixed for the ``clamp`` and ``rewrite`` actions.
+
+        The nested parts of the body must not be modified in place, as they
+        may be shared with other searches.
+
+        :param body: The request body.
+        """
+        raise NotImplementedError()
+
+
+class MaxResultWindow(Rule):
+    """Limit ``from + size``, i.e. how deep searches can page.
+
+    The deep pages of the searches with deep pagination are fetched with
+    ``search_after`` and are not limited.
+    """
+
+    name = "max_result_window"
+
+    def __init__(self, limit=10000, action="reject"):
+        """Initialize the rule.
+
+        :param limit: Maximum value of ``from + size``.
+        :param action: One of :data:`ACTIONS`.
+        """
+        super().__init__(action)
+        self.limit = limit
+
+    def check(self, body):
+        """Check the page of the search."""
+        window = body.get("from", 0) + body.get("size", 10)
+        if window > self.limit:
+            return "from + size is {} (limit: {})".format(window, self.limit)
+        return None
+
+    def fix(self, body):
+        """Reduce the page size, or return an empty page."""
+        start = min(body.get("from", 0), self.limit)
+        return dict(body, size=self.limit - start, **{"from": start})
+
+
+class MaxPageSize(Rule):
+    """Limit the number of hits per page."""
+
+    name = "max_page_size"
+
+    def __init__(self, limit=1000, action="clamp"):
+        """Initialize the rule.
+
+        :param limit: Maximum value of ``size``.
+        :param action: One of :data:`ACTIONS`.
+        """
+        super().__init__(action)
+        self.limit = limit
+
+    def check(self, body):
+        """Check the page size."""
+        size = body.get("size", 10)
+        if size > self.limit:
+            return "size is {} (limit: {})".format(size, self.limit)
+        return None
+
+    def fix(self, body):
+        """Reduce the page size."""
+        return dict(body, size=self.limit)
+
+
+def _leading_wildcard_terms(text):
+    """Return the terms of a query string starting with a wildcard."""
+    return re.findall(r"(?:^|[\s(:])([*?]\S*)", text)
+
+
+def _rewrite_queries(node, func):
+    """Return a copy of a body with ``func`` applied to its query clauses."""
+    if isinstance(node, list):
+        return [_rewrite_queries(item, func) for item in node]
+    if not isinstance(node, dict):
+        return node
+    node = func(node)
+    return {key: _rewrite_queries(value, func) for key, value in node.items()}
+
+
+class LeadingWildcard(Rule):
+    """Forbid terms starting with a wildcard, which scan the whole index."""
+
+    name = "leading_wildcard"
+
+    def __init__(self, action="reject"):
+        """Initialize the rule.
+
+        :param action: One of :data:`ACTIONS`. ``"rewrite"`` strips the
+            leading wildcards.
+        """
+        super().__init__(action)
+
+    def check(self, body):
+        """Look for leading wildcards in the queries."""
+        found = []
+
+        def collect(clause):
+            for terms in self._terms(clause):
+                found.extend(terms)
+            return clause
+
+        _rewrite_queries(body, collect)
+        if found:
+            return "leading wildcard in {}".format(", ".join(found))
+        return None
+
+    def fix(self, body):
+        """Strip the leading wildcards of the terms."""
+
+        def strip(clause):
+            if "query_string" in clause:
+                query_string = dict(clause["query_string"])
+                query_string["query"] = re.sub(
+                    r"(^|[\s(:])[*?]+", r"\1", query_string.get("query", "")
+                )
+                clause = dict(clause, query_string=query_string)
+            if "wildcard" in clause:
+                wildcard = {}
+                for field, value in clause["wildcard"].items():
+                    if isinstance(value, dict):
+                        value = dict(value, value=value.get("value", "").lstrip("*?"))
+                    else:
+                        value = value.lstrip("*?")
+                    wildcard[field] = value
+                clause = dict(clause, wildcard=wildcard)
+            return clause
+
+        return _rewrite_queries(body, strip)
+
+    @staticmethod
+    def _terms(clause):
+        """Yield the lists of terms with leading wildcards of a clause."""
+        query_string = clause.get("query_string")
+        if isinstance(query_string, dict):
+            yield _leading_wildcard_terms(query_string.get("query", ""))
+        wildcard = clause.get("wildcard")
+        if isinstance(wildcard, dict):
+            for value in wildcard.values():
+                if isinstance(value, dict):
+                    value = value.get("value", "")
+                if isinstance(value, str) and value[:1] in ("*", "?"):
+                    yield [value]
+
+
+class MaxTermsAggregationSize(Rule):
+    """Limit the number of buckets of the ``terms`` aggregations."""
+
+    name = "max_terms_aggregation_size"
+
+    def __init__(self, limit=1000, action="clamp"):
+        """Initialize the rule.
+
+        :param limit: Maximum ``size`` of the ``terms`` aggregations.
+        :param action: One of :data:`ACTIONS`.
+        """
+        super().__init__(action)
+        self.limit = limit
+
+    def _too_large(self, clause):
+        terms = clause.get("terms")
+        return (
+            isinstance(terms, dict)
+            and "field" in terms
+            and terms.get("size", 10) > self.limit
+        )
+
+    def check(self, body):
+        """Check the sizes of the aggregations."""
+        found = []
+
+        def collect(clause):
+            if self._too_large(clause):
+                found.append(clause["terms"]["size"])
+            return clause
+
+        _rewrite_queries(body.get("aggs", {}), collect)
+        if found:
+            return "terms aggregation size is {} (limit: {})".format(
+                max(found), self.limit
+            )
+        return None
+
+    def fix(self, body):
+        """Reduce the sizes of the aggregations."""
+
+        def clamp(clause):
+            if self._too_large(clause):
+                clause = dict(clause, terms=dict(clause["terms"], size=self.limit))
+            return clause
+
+        return dict(body, aggs=_rewrite_queries(body["aggs"], clamp))
+
+
+class QueryGuard(object):
+    """Check the searches against query cost rules."""
+
+    def __init__(self, rules):
+        """Initialize the guard.
+
+        :param rules: List of :class:`Rule`.
+        """
+        self.rules = list(rules)
+        self._lock = threading.Lock()
+        self.violations = Counter()
+
+    def check(self, search, body):
+        """Apply the rules to the body of a search.
+
+        :param search: The search.
+        :param body: The request body.
+        :returns: The body to send.
+        :raises QueryCostError: If a rule rejects the search.
+        """
+        for rule in self.rules:
+            message = rule.check(body)
+            if message is None:
+                continue
+            with self._lock:
+                self.violations[(type(search).__name__, rule.name)] += 1
+            if rule.action == "reject":
+                raise QueryCostError(rule.name, message)
+            if rule.action == "warn":
+                warnings.warn(
+                    "{}: {} ({})".format(rule.name, message, type(search).__name__),
+                    QueryCostWarning,
+                )
+            else:
+                body = rule.fix(body)
+        return body
+
+    def stats(self):
+        """Return the number of violations per search class and rule."""
+        with self._lock:
+            result = {}
+            for (search_cls, rule), count in self.violations.items():
+                result.setdefault(search_cls, {})[rule] = count
+        return result
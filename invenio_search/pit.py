@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Point-in-time and ``search_after`` pagination helpers.
+
+Elasticsearch and OpenSearch expose the point-in-time (PIT) API under
+different names and with different request and response formats. These
+helpers hide the differences from the search classes.
+"""
+
+import hashlib
+import json
+import threading
+import warnings
+from collections import OrderedDict
+
+from flask import current_app
+
+from .engine import ES, SEARCH_DISTRIBUTION
+from .errors import PointInTimeNotSupportedError
+
+
+def sort_tiebreaker():
+    """Return the sort used as tiebreaker for ``search_after`` pagination.
+
+    Uses ``SEARCH_SORT_TIEBREAKER`` if configured, and otherwise the internal
+    shard document order on Elasticsearch (which requires Elasticsearch 7.12)
+    and ``_id`` on OpenSearch.
+    """
+    tiebreaker = current_app.config.get("SEARCH_SORT_TIEBREAKER")
+    if tiebreaker:
+        return tiebreaker
+    return "_shard_doc" if SEARCH_DISTRIBUTION == ES else "_id"
+
+
+def with_tiebreaker(sort, point_in_time=True):
+    """Append the sort tiebreaker to a sort, unless it is already there.
+
+    :param sort: The ``sort`` of a request body.
+    :param point_in_time: If ``False``, the sort is used outside a point in
+        time, where the internal shard document order is not available.
+    :returns: A new list with the sort options.
+    :raises ValueError: If the tiebreaker is the internal shard document order
+        and the sort is used outside a point in time.
+    """
+    sort = list(sort or [])
+    tiebreaker = sort_tiebreaker()
+    if not point_in_time and tiebreaker == "_shard_doc":
+        raise ValueError(
+            "Paginating with search_after outside a point in time requires "
+            "SEARCH_SORT_TIEBREAKER to be set to a document field identifying "
+            "the documents uniquely."
+        )
+    field = next(iter(tiebreaker)) if isinstance(tiebreaker, dict) else tiebreaker
+    for option in sort:
+        name = next(iter(option)) if isinstance(option, dict) else option
+        if name == field:
+            return sort
+    sort.append(tiebreaker)
+    return sort
+
+
+PIT_PARAMS = ("preference", "routing")
+"""Request parameters of the point in time rather than of its searches."""
+
+
+def open_point_in_time(client, index, keep_alive, params=None):
+    """Open a point in time on indices.
+
+    :param client: The search client.
+    :param index: The list of indices or aliases.
+    :param keep_alive: How long the point in time is kept between requests
+        (e.g. ``"1m"``).
+    :param params: The request parameters of the searches. The
+        :data:`PIT_PARAMS` are sent when opening the point in time.
+    :returns: The point in time identifier.
+    :raises PointInTimeNotSupportedError: If the client has no point in time
+        API, i.e. before Elasticsearch 7.10 and OpenSearch 2.
+    """
+    index = ",".join(index) if index else "_all"
+    params = {k: v for k, v in (params or {}).items() if k in PIT_PARAMS}
+    method = "open_point_in_time" if SEARCH_DISTRIBUTION == ES else "create_pit"
+    if not hasattr(client, method):
+        raise PointInTimeNotSupportedError(
+            "The {} client does not support points in time ({} is missing), "
+            "please upgrade it.".format(SEARCH_DISTRIBUTION, method)
+        )
+    if SEARCH_DISTRIBUTION == ES:
+        return client.open_point_in_time(index=index, keep_alive=keep_alive, **params)[
+            "id"
+        ]
+    return client.create_pit(index=index, params=dict(params, keep_alive=keep_alive))[
+        "pit_id"
+    ]
+
+
+def pit_search_params(params):
+    """Return the request parameters of a search in a point in time.
+
+    The :data:`PIT_PARAMS` are rejected in searches with a point in time.
+
+    :param params: The request parameters of the search.
+    """
+    return {k: v for k, v in params.items() if k not in PIT_PARAMS}
+
+
+def close_point_in_time(client, pit_id):
+    """Close a point in time.
+
+    Failures are only reported as warnings, as the point in time expires
+    anyway after its keep-alive.
+
+    :param client: The search client.
+    :param pit_id: The point in time identifier.
+    """
+    try:
+        if SEARCH_DISTRIBUTION == ES:
+            client.close_point_in_time(body={"id": pit_id})
+        else:
+            client.delete_pit(body={"pit_id": [pit_id]})
+    except Exception as e:
+        warnings.warn("Could not close point in time: {}".format(e))
+
+
+def pit_body(pit_id, keep_alive):
+    """Return the ``pit`` entry of a request body.
+
+    :param pit_id: The point in time identifier.
+    :param keep_alive: The new keep-alive of the point in time.
+    """
+    return {"id": pit_id, "keep_alive": keep_alive}
+
+
+class PaginationCursors(object):
+    """Sort values of the last hit before page offsets, per search.
+
+    Used to fetch deep pages with ``search_after`` instead of ``from``. The
+    cursors of the least recently used searches are evicted once
+    ``maxsize`` searches are reached, and at most ``max_offsets`` cursors
+    are kept per search.
+    """
+
+    def __init__(self, maxsize=1024, max_offsets=256):
+        """Initialize the cursors.
+
+        :param maxsize: Maximum number of searches.
+        :param max_offsets: Maximum number of cursors per search.
+        """
+        self.maxsize = maxsize
+        self.max_offsets = max_offsets
+        self._searches = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(index, body, params):
+        """Return the key of a search, regardless of its page.
+
+        :param index: The list of indices of the search.
+        :param body: The request body.
+        :param params: The request parameters.
+        """
+        body = {
+            k: v for k, v in body.items() if k not in ("from", "size", "search_after")
+        }
+        normalized = json.dumps(
+            [index, body, params], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def set(self, key, offset, sort_values):
+        """Store the sort values of the hit before an offset.
+
+        :param key: The key of the search.
+        :param offset: The offset of the next hit.
+        :param sort_values: The sort values of the hit at ``offset - 1``.
+        """
+        with self._lock:
+            offsets = self._searches.setdefault(key, OrderedDict())
+            self._searches.move_to_end(key)
+            offsets[offset] = sort_values
+            offsets.move_to_end(offset)
+            while len(offsets) > self.max_offsets:
+                offsets.popitem(last=False)
+            while len(self._searches) > self.maxsize:
+                self._searches.popitem(last=False)
+
+    def nearest(self, key, offset):
+        """Return the closest cursor at or before an offset.
+
+        :param key: The key of the search.
+        :param offset: The offset.
+        :returns: A tuple with the offset of the cursor and its sort values,
+            or ``(0, None)`` if there is no cursor.
+        """
+        with self._lock:
+            offsets = self._searches.get(key)
+            if not offsets:
+                return 0, None
+            self._searches.move_to_end(key)
+            best = max((o for o in offsets if o <= offset), default=None)
+            if best is None:
+                return 0, None
+            offsets.move_to_end(best)
+            return best, offsets[best]
+
+    def clear(self):
+        """Remove all the cursors."""
+        with self._lock:
+            self._searches.clear()
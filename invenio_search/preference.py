@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Shard preference policies.
+
+The ``preference`` request parameter decides which shard copies serve a
+search. Sending the same preference for related searches keeps them on the
+same replicas, which avoids the bouncing results effect and makes better use
+of the shard request caches.
+
+:meth:`~invenio_search.api.BaseRecordsSearch.with_preference_param` computes
+the preference with the policy configured in ``SEARCH_PREFERENCE_POLICY``,
+either the name of a built-in policy:
+
+* ``"user_agent"``: per IP address and User-Agent.
+* ``"session"``: per session cookie.
+* ``"user"``: per user identity.
+* ``"query_shape"``: per shape of the query, i.e. the query without its
+  values.
+* ``"local"``: prefer the shards of the node receiving the request.
+
+or a function (or its import path) receiving the search and returning the
+preference. The preference of the policies which do not depend on the search
+is computed once per request.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from werkzeug.utils import import_string
+
+
+def _digest(value):
+    """Return the hex digest of a string."""
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def user_agent_policy(search):
+    """Prefer the same replicas for the same IP address and User-Agent."""
+    if not has_request_context():
+        return None
+    user_agent = request.headers.get("User-Agent")
+    user_agent = user_agent.encode("utf-8") if user_agent else ""
+    return _digest("{ip}-{ua}".format(ip=request.remote_addr, ua=user_agent))
+
+
+def session_policy(search):
+    """Prefer the same replicas for the same session.
+
+    Requests without session cookie use the :func:`user_agent_policy`.
+    """
+    if not has_request_context():
+        return None
+    cookie_name = current_app.config.get("SESSION_COOKIE_NAME", "session")
+    cookie = request.cookies.get(cookie_name)
+    if not cookie:
+        return user_agent_policy(search)
+    return _digest("session-{}".format(cookie))
+
+
+def user_policy(search):
+    """Prefer the same replicas for the same user identity.
+
+    Anonymous requests use the :func:`session_policy`.
+    """
+    user_id = getattr(getattr(g, "identity", None), "id", None)
+    if user_id is None:
+        return session_policy(search)
+    return _digest("user-{}".format(user_id))
+
+
+def _shape(value):
+    """Return the structure of a request body, without its values."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shape(item) for item in value]
+    return None
+
+
+def query_shape_policy(search):
+    """Prefer the same replicas for queries with the same shape."""
+    shape = _shape(search.to_dict())
+    return _digest(json.dumps([search._index, shape], sort_keys=True))
+
+
+query_shape_policy.request_scoped = False
+
+
+def local_node_policy(search):
+    """Prefer the shards of the node receiving the request."""
+    return "_local"
+
+
+POLICIES = {
+    "user_agent": user_agent_policy,
+    "session": session_policy,
+    "user": user_policy,
+    "query_shape": query_shape_policy,
+    "local": local_node_policy,
+}
+"""Built-in preference policies."""
+
+
+def get_policy(policy=None):
+    """Return the preference policy and its name.
+
+    :param policy: A policy name, import path or function (default:
+        ``SEARCH_PREFERENCE_POLICY``).
+    :returns: A tuple with the policy function (or ``None``) and its name.
+    """
+    if policy is None:
+        policy = current_app.config.get("SEARCH_PREFERENCE_POLICY")
+    if policy is None:
+        return None, None
+    if isinstance(policy, str):
+        if policy in POLICIES:
+            return POLICIES[policy], policy
+        return import_string(policy), policy
+    return policy, getattr(policy, "__name__", repr(policy))
+
+
+def preference(search, policy):
+    """Return the preference of a search.
+
+    :param search: The search.
+    :param policy: The policy function.
+    """
+    if not getattr(policy, "request_scoped", True):
+        return policy(search)
+    if has_request_context():
+        cached = request.environ.setdefault("invenio_search.preferences", {})
+    elif has_app_context():
+        cached = g.setdefault("_invenio_search_preferences", {})
+    else:
+        return policy(search)
+    if policy not in cached:
+        cached[policy] = policy(search)
+    return cached[policy]
+
+
+def apply_policy(search, policy=None):
+    """Return a new search with the preference of a policy.
+
+    If ``SEARCH_PREFERENCE_RECORD_REPLICAS`` is enabled, the shard and node
+    of every hit are requested and recorded in
+    ``current_search.preference_stats`` (see :class:`ReplicaStats`).
+
+    :param search: The search.
+    :param policy: A policy name, import path or function (default:
+        ``SEARCH_PREFERENCE_POLICY``).
+    """
+    policy, name = get_policy(policy)
+    value = preference(search, policy) if policy is not None else None
+    if not value:
+        return search
+    s = search.params(preference=value)
+    if current_app.config.get("SEARCH_PREFERENCE_RECORD_REPLICAS"):
+        s = s.extra(explain=True)
+        s._preference_policy = name
+    return s
+
+
+class ReplicaStats(object):
+    """Number of hits served by every shard copy, per preference policy."""
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self._lock = threading.Lock()
+        self.responses = Counter()
+        self.hits = Counter()
+
+    def record(self, policy, response):
+        """Record the shard copies which served the hits of a response.
+
+        :param policy: The name of the preference policy.
+        :param response: The raw search response.
+        """
+        hits = response.get("hits", {}).get("hits", [])
+        with self._lock:
+            self.responses[policy] += 1
+            for hit in hits:
+                if "_node" in hit or "_shard" in hit:
+                    self.hits[(policy, hit.get("_shard"), hit.get("_node"))] += 1
+
+    def clear(self):
+        """Reset the statistics."""
+        with self._lock:
+            self.responses.clear()
+            self.hits.clear()
+
+    def to_dict(self):
+        """Return the statistics per policy, shard and node."""
+        with self._lock:
+            result = {
+                policy: {"responses": count, "replicas": []}
+                for policy, count in self.responses.items()
+            }
+            for (policy, shard, node), count in sorted(
+                self.hits.items(), key=lambda item: -item[1]
+            ):
+                result[policy]["replicas"].append(
+                    {"shard": shard, "node": node, "hits": count}
+                )
+        return result
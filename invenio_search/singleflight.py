@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Coalescing of identical concurrent searches.
+
+If ``SEARCH_SINGLE_FLIGHT`` is enabled, a search sent while an identical
+search (same client, indices, body and parameters) is in flight in another
+thread of the process does not send a new request. It waits for the request
+in flight and receives the same response:
+
+.. code-block:: python
+
+    current_search.single_flight.stats()
+    # {"calls": 120, "executions": 7, "coalesced": 113, "ratio": 0.94}
+
+The responses are shared between the searches and must not be modified.
+"""
+
+import json
+import threading
+
+
+class _Flight(object):
+    """A request in flight."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Share the result of identical concurrent calls."""
+
+    def __init__(self):
+        """Initialize the in-flight calls and the counters."""
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.calls = 0
+        self.executions = 0
+
+    @staticmethod
+    def key(client, index, body, params):
+        """Return the key of a search request.
+
+        :param client: The search client.
+        :param index: The list of (prefixed) indices of the search.
+        :param body: The request body.
+        :param params: The request parameters.
+        """
+        return (
+            id(client),
+            json.dumps(
+                [index, body, params],
+                sort_keys=True,
+                separators=(",", ":"),
+                default=str,
+            ),
+        )
+
+    def do(self, key, func):
+        """Call ``func``, unless a call with the same key is in flight.
+
+        :param key: The key of the call.
+        :param func: Function without arguments.
+        :returns: The result of ``func`` or of the call in flight. Its
+            exceptions are raised in all the waiting threads.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def stats(self):
+        """Return the number of calls, executions and the coalescing ratio."""
+        with self._lock:
+            calls, executions = self.calls, self.executions
+        coalesced = calls - executions
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": coalesced,
+            "ratio": coalesced / calls if calls else 0.0,
+        }
+
+    def reset(self):
+        """Reset the counters."""
+        with self._lock:
+            self.calls = self.executions = 0
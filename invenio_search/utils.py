@@ -9,7 +9,9 @@
 
 """Utility functions for search engine."""
 
+import threading
 import time
+from collections import OrderedDict
 
 from flask import current_app
 
@@ -21,6 +23,18 @@ def timestamp_suffix():
     return "-" + str(int(time.time()))
 
 
+def prefixed_names(app=None):
+    """Return the table of registered index and alias names.
+
+    The table maps the names of all registered indices and aliases to their
+    prefixed names. It is empty if Invenio-Search is not initialized.
+
+    :param app: Flask app to get the "invenio-search" extension from.
+    """
+    state = (app or current_app).extensions.get("invenio-search")
+    return state.prefixed_names if state is not None else {}
+
+
 def prefix_index(index, prefix=None, app=None):
     """Prefixes the given index if needed.
 
@@ -30,6 +44,10 @@ def prefix_index(index, prefix=None, app=None):
     :returns: A string with the new index name prefixed if needed.
     """
     app = app or current_app
+    if prefix is None:
+        name = prefixed_names(app).get(index)
+        if name is not None:
+            return name
     index_prefix = (
         prefix if prefix is not None else (app.config.get("SEARCH_INDEX_PREFIX")) or ""
     )
@@ -44,8 +62,9 @@ def suffix_index(index, suffix=None, app=None):
     :param app: Flask app to get the "invenio-search" extension from.
     :returns: A string with the new index name suffixed.
     """
-    search_ext = app.extensions["invenio-search"] if app else current_search
-    suffix = suffix if suffix is not None else search_ext.current_suffix
+    if suffix is None:
+        search_ext = app.extensions["invenio-search"] if app else current_search
+        suffix = search_ext.current_suffix
     return index + suffix
 
 
@@ -63,6 +82,10 @@ def build_alias_name(index, prefix=None, app=None):
     :param index: Name of the index.
     :param prefix: The prefix to prepend to the index name.
     """
+    if prefix is None and isinstance(index, str):
+        name = prefixed_names(app).get(index)
+        if name is not None:
+            return name
     return build_index_name(index, prefix=prefix, suffix="", app=app)
 
 
@@ -79,3 +102,45 @@ def build_index_name(index, prefix=None, suffix=None, app=None):
     index = prefix_index(index, prefix=prefix, app=app)
     index = suffix_index(index, suffix=suffix, app=app)
     return index
+
+
+class LRUCache(object):
+    """Bounded cache of values built on demand.
+
+    The least recently used entries are evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize=128):
+        """Initialize the cache.
+
+        :param maxsize: Maximum number of entries. ``0`` disables the cache.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the value of a key, building it on a miss.
+
+        :param key: The key.
+        :param build: Function without arguments returning the value.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+
+        value = build()
+        if self.maxsize:
+            with self._lock:
+                value = self._entries.setdefault(key, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
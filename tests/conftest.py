@@ -10,6 +10,7 @@
 
 """Pytest configuration."""
 
+import functools
 import os
 import shutil
 import sys
@@ -92,3 +93,188 @@ def template_entrypoints():
 
     entrypoints = mock_iter_entry_points_factory(eps, "invenio_search.templates")
     return entrypoints
+
+
+class FakeSearchClient(object):
+    """Local stand-in for a search engine client.
+
+    It only supports what the tests need: ``ids``/``match_all`` queries,
+    sorting, ``from``/``size`` and ``search_after`` pagination, slices,
+    points in time, multi-get requests and the selection of the returned
+    (top-level) fields. All the documents are in one index,
+    ``fake-index-v1``, with the ``fake-index`` alias.
+    """
+
+    index = "fake-index-v1"
+
+    def __init__(self, docs):
+        """Initialize the client with a list of ``(id, source)`` documents."""
+        self.docs = [
+            {"_index": self.index, "_id": id_, "_source": source}
+            for id_, source in docs
+        ]
+        self._docs_by_id = {doc["_id"]: doc for doc in self.docs}
+        self.calls = []
+        self.open_pits = set()
+        self._pit_counter = 0
+        self.indices = Mock()
+        self.indices.get_alias.side_effect = lambda index: {
+            self.index: {"aliases": {"fake-index": {}}}
+        }
+
+    def _value(self, doc, field):
+        if field in ("_id", "_shard_doc"):
+            return doc["_id"]
+        return doc["_source"].get(field)
+
+    def _sort_fields(self, sort):
+        fields = []
+        for option in sort or []:
+            if isinstance(option, dict):
+                field, order = next(iter(option.items()))
+                if isinstance(order, dict):
+                    order = order.get("order", "asc")
+            else:
+                field, order = option, "asc"
+            if field != "_score":
+                fields.append((field, order == "desc"))
+        return fields
+
+    def _compare(self, left, right, fields):
+        for (_, desc), lvalue, rvalue in zip(fields, left, right):
+            if lvalue != rvalue:
+                result = -1 if lvalue < rvalue else 1
+                return -result if desc else result
+        return 0
+
+    def _matches(self, doc, body):
+        query = body.get("query", {})
+        ids = None
+        for clause in [query] + query.get("bool", {}).get("filter", []):
+            if "ids" in clause:
+                ids = clause["ids"]["values"]
+        if ids is not None and doc["_id"] not in ids:
+            return False
+        slice_ = body.get("slice")
+        if slice_ and int(doc["_id"]) % slice_["max"] != slice_["id"]:
+            return False
+        return True
+
+    @staticmethod
+    def _filter_source(source, includes=None, excludes=()):
+        return {
+            key: value
+            for key, value in source.items()
+            if (includes is None or key in includes) and key not in excludes
+        }
+
+    def _returned_fields(self, doc, body):
+        """Return a hit with the fields selected in the request body."""
+        spec = body.get("_source", "stored_fields" not in body)
+        hit = dict(doc)
+        if spec is False:
+            del hit["_source"]
+        elif isinstance(spec, list):
+            hit["_source"] = self._filter_source(doc["_source"], spec)
+        elif isinstance(spec, dict):
+            hit["_source"] = self._filter_source(
+                doc["_source"], spec.get("includes") or None, spec.get("excludes", ())
+            )
+        if "docvalue_fields" in body:
+            hit["fields"] = {
+                field: [doc["_source"][field]]
+                for field in body["docvalue_fields"]
+                if field in doc["_source"]
+            }
+        return hit
+
+    def search(self, index=None, body=None, **params):
+        """Search the documents."""
+        body = body or {}
+        self.calls.append(("search", index, body, params))
+        if "pit" in body:
+            assert index is None
+            assert body["pit"]["id"] in self.open_pits
+        fields = self._sort_fields(body.get("sort"))
+        docs = [d for d in self.docs if self._matches(d, body)]
+        hits = [
+            dict(
+                self._returned_fields(doc, body),
+                sort=[self._value(doc, field) for field, _ in fields],
+            )
+            for doc in docs
+        ]
+        if fields:
+            hits.sort(
+                key=functools.cmp_to_key(
+                    lambda a, b: self._compare(a["sort"], b["sort"], fields)
+                )
+            )
+        if "search_after" in body:
+            hits = [
+                hit
+                for hit in hits
+                if self._compare(hit["sort"], body["search_after"], fields) > 0
+            ]
+        start = body.get("from", 0)
+        page = hits[start : start + body.get("size", 10)]
+        response = {"hits": {"total": {"value": len(docs), "relation": "eq"}}}
+        response["hits"]["hits"] = page
+        if "pit" in body:
+            response["pit_id"] = body["pit"]["id"]
+        return response
+
+    def mget(self, body, _source_includes=None, _source_excludes=None, **params):
+        """Get documents by their identifiers."""
+        self.calls.append(("mget", None, body, params))
+        includes = _source_includes.split(",") if _source_includes else None
+        excludes = _source_excludes.split(",") if _source_excludes else []
+        docs = []
+        for request in body["docs"]:
+            doc = self._docs_by_id.get(request["_id"])
+            if doc is None or request["_index"] != self.index:
+                docs.append(dict(request, found=False))
+                continue
+            source = self._filter_source(doc["_source"], includes, excludes)
+            docs.append(dict(doc, _source=source, found=True))
+        return {"docs": docs}
+
+    def create_pit(self, index, params=None):
+        """Open a point in time (OpenSearch)."""
+        self._pit_counter += 1
+        pit_id = "pit-{}".format(self._pit_counter)
+        self.open_pits.add(pit_id)
+        self.calls.append(("create_pit", index, params))
+        return {"pit_id": pit_id}
+
+    def delete_pit(self, body):
+        """Close points in time (OpenSearch)."""
+        for pit_id in body["pit_id"]:
+            self.open_pits.remove(pit_id)
+        return {}
+
+    def open_point_in_time(self, index, keep_alive, **params):
+        """Open a point in time (Elasticsearch)."""
+        params["keep_alive"] = keep_alive
+        return {"id": self.create_pit(index, params)["pit_id"]}
+
+    def close_point_in_time(self, body):
+        """Close a point in time (Elasticsearch)."""
+        return self.delete_pit({"pit_id": [body["id"]]})
+
+
+@pytest.fixture()
+def fake_client_cls():
+    """Local stand-in search client class."""
+    return FakeSearchClient
+
+
+@pytest.fixture()
+def fake_client():
+    """Local stand-in search client with 95 documents."""
+    return FakeSearchClient(
+        [
+            ("{}".format(idx), {"title": "title {}".format(idx), "year": idx % 7})
+            for idx in range(95)
+        ]
+    )
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Multi-search batching tests."""
+
+import json
+
+import pytest
+from mock import Mock
+
+from invenio_search import current_search
+from invenio_search.api import DefaultFilter, RecordsSearch, RecordsSearchV2
+from invenio_search.engine import dsl, search
+
+
+def _client():
+    client = Mock()
+    client.msearch.side_effect = lambda body: {
+        "responses": [
+            {"hits": {"total": idx, "hits": []}} for idx in range(len(body) // 2)
+        ]
+    }
+    return client
+
+
+def test_batch(app):
+    """Test sending the searches of a batch in one multi-search request."""
+    app.config["SEARCH_INDEX_PREFIX"] = "myprefix-"
+    client = _client()
+
+    class FilteredSearch(RecordsSearch):
+        class Meta:
+            index = "records"
+            default_filter = DefaultFilter(dsl.Q("term", public=True))
+
+    with current_search.batch() as batch:
+        first = FilteredSearch(using=client).query("match", title="higgs").execute()
+        second = (
+            RecordsSearchV2(index="authors", using=client)
+            .params(preference="abc")
+            .execute()
+        )
+        assert client.msearch.call_count == 0
+
+        assert first.hits.total == 0
+        assert second.hits.total == 1
+        assert client.msearch.call_count == 1
+        assert client.search.call_count == 0
+
+        # searches with parameters not allowed in a header are sent directly
+        RecordsSearchV2(index="authors", using=client).params(timeout="1s").execute()
+        assert client.search.call_count == 1
+
+        third = RecordsSearch(index="records", using=client).execute()
+        assert third.hits.total == 0
+        assert client.msearch.call_count == 2
+
+        # raw searches are sent right away with the pending searches
+        fifth = RecordsSearch(index="records", using=client).execute()
+        raw = RecordsSearch(index="records", using=client).execute_raw()
+        assert client.msearch.call_count == 3
+        assert json.loads(json.dumps(raw)) == raw
+        assert raw["hits"] == {"total": 1, "hits": []}
+        last = RecordsSearch(index="records", using=client).execute()
+    # pending searches are sent at the end of the batch
+    assert client.msearch.call_count == 4
+    assert batch.requests == 4
+    assert fifth.hits.total == 0
+    assert last.hits.total == 0
+
+    body = client.msearch.call_args_list[0][1]["body"]
+    assert body[0] == {"index": "myprefix-records"}
+    assert body[1]["query"]["bool"]["filter"] == [{"term": {"public": True}}]
+    assert body[1]["query"]["bool"]["must"] == [{"match": {"title": "higgs"}}]
+    assert body[2] == {"index": "myprefix-authors", "preference": "abc"}
+
+
+def test_batch_errors(app):
+    """Test that errors are raised when the responses are used."""
+    client = Mock()
+    client.msearch.return_value = {
+        "responses": [
+            {"hits": {"total": 1, "hits": []}},
+            {"status": 404, "error": {"type": "index_not_found_exception"}},
+        ]
+    }
+
+    with current_search.batch():
+        found = RecordsSearch(index="records", using=client).execute()
+        missing = RecordsSearch(index="missing", using=client).execute()
+        # nested batches are merged
+        with current_search.batch():
+            assert found.hits.total == 1
+        with pytest.raises(search.TransportError):
+            missing.hits
+    assert client.msearch.call_count == 1
+
+    # outside of a batch, searches are sent right away
+    client.search.return_value = {"hits": {"total": 2, "hits": []}}
+    assert RecordsSearch(index="records", using=client).execute().hits.total == 2
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Response cache tests."""
+
+import time
+
+import pytest
+from mock import Mock, patch
+
+from invenio_search.api import RecordsSearch, RecordsSearchV2
+from invenio_search.cache import InProcessBackend, KVBackend
+
+
+class FakeKVStore(object):
+    """Local stand-in for a Redis client."""
+
+    def __init__(self):
+        """Initialize the store."""
+        self.data = {}
+
+    def get(self, key):
+        """Get the value of a key."""
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        """Set the value of a key."""
+        expires = time.monotonic() + ex if ex else None
+        self.data[key] = (value.encode("utf-8"), expires)
+
+
+def _client():
+    client = Mock()
+    client.search.side_effect = lambda **kwargs: {
+        "hits": {"total": client.search.call_count, "hits": []}
+    }
+    return client
+
+
+@pytest.fixture(params=["memory", "kv"])
+def cached_app(app, request):
+    """Application with a response cache backend."""
+    store = FakeKVStore()
+    app.config["SEARCH_RESPONSE_CACHE_BACKEND"] = (
+        "invenio_search.cache:in_process_backend"
+        if request.param == "memory"
+        else lambda app: KVBackend(store)
+    )
+    app.extensions["invenio-search"].register_mappings(
+        "records", "mock_module.mappings"
+    )
+    return app
+
+
+def test_response_cache(cached_app):
+    """Test caching the responses of a search class."""
+    client = _client()
+
+    class CachedSearch(RecordsSearch):
+        class Meta:
+            index = "records"
+            response_cache_ttl = 60
+
+    def search(q="higgs"):
+        return CachedSearch(using=client).query("match", title=q)
+
+    assert search().execute().hits.total == 1
+    assert search().execute().hits.total == 1
+    assert search().execute().to_dict() == {"hits": {"total": 1, "hits": []}}
+    assert client.search.call_count == 1
+
+    # the key depends on the body and on the parameters
+    assert search("boson").execute().hits.total == 2
+    assert search().params(preference="abc").execute().hits.total == 3
+    assert search().params(preference="abc").execute().hits.total == 3
+
+    # writing to an index of the alias invalidates its cached responses
+    current_search = cached_app.extensions["invenio-search"]
+    current_search.invalidate_response_cache("records-default-v1.0.0")
+    assert search().execute().hits.total == 4
+    assert search().execute().hits.total == 4
+
+    # the cache is opt-in per search class
+    assert RecordsSearch(index="records", using=client).execute().hits.total == 5
+    assert RecordsSearch(index="records", using=client).execute().hits.total == 6
+    assert search().with_response_cache(None).execute().hits.total == 7
+
+
+def test_response_cache_v2(cached_app):
+    """Test caching the responses of a search V2."""
+    client = _client()
+
+    def search(**kwargs):
+        kwargs.setdefault("index", "records")
+        return RecordsSearchV2(using=client, **kwargs)
+
+    assert search(response_cache_ttl=60).execute().hits.total == 1
+    assert search().with_response_cache(60).execute().hits.total == 1
+    assert search().execute().hits.total == 2
+
+    # patterns cannot be invalidated and are never cached
+    assert search(response_cache_ttl=60, index="rec*").execute().hits.total == 3
+    assert search(response_cache_ttl=60, index="rec*").execute().hits.total == 4
+
+    # responses expire
+    with patch("time.monotonic", return_value=time.monotonic() + 61):
+        assert search(response_cache_ttl=60).execute().hits.total == 5
+
+
+def test_response_cache_flush_and_refresh(cached_app):
+    """Test that a refresh invalidates the cached responses of the index."""
+    current_search = cached_app.extensions["invenio-search"]
+    current_search._client = Mock()
+    client = _client()
+
+    def search(index):
+        return RecordsSearchV2(index=index, using=client, response_cache_ttl=60)
+
+    assert search("records").execute().hits.total == 1
+    assert search("records-default-v1.0.0").execute().hits.total == 2
+    assert search("records-authorities").execute().hits.total == 3
+
+    current_search.flush_and_refresh("records-default-v1.0.0")
+    assert search("records").execute().hits.total == 4
+    assert search("records-default-v1.0.0").execute().hits.total == 5
+    # the aliases which do not contain the index are not affected
+    assert search("records-authorities").execute().hits.total == 3
+
+    # refreshing an alias invalidates the indices and aliases under it
+    current_search.flush_and_refresh("records")
+    assert search("records").execute().hits.total == 6
+    assert search("records-default-v1.0.0").execute().hits.total == 7
+    assert search("records-authorities").execute().hits.total == 8
+
+
+def test_in_process_backend_eviction():
+    """Test the LRU eviction of the in-process backend."""
+    backend = InProcessBackend(maxsize=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
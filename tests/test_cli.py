@@ -11,13 +11,16 @@
 """Test CLI."""
 
 import ast
+import json
 from unittest.mock import PropertyMock
 
 import pytest
 from click.testing import CliRunner
+from flask import Flask
 from flask.cli import ScriptInfo
 from mock import patch
 
+from invenio_search import InvenioSearch
 from invenio_search.cli import index as cmd
 from invenio_search.engine import ES, OS, SEARCH_DISTRIBUTION, search
 from invenio_search.proxies import current_search_client
@@ -222,3 +225,94 @@ def test_create_put_and_delete(app):
     assert name not in list(
         current_search_client.indices.get("*", expand_wildcards="all").keys()
     )
+
+
+def test_compile_registry(app, template_entrypoints, tmp_path):
+    """Test compiling the registry into a bundle and loading it."""
+    bundle_path = str(tmp_path / "registry.bundle")
+    invenio_search = app.extensions["invenio-search"]
+    # registered by the application factory, not by an entry point
+    invenio_search.register_mappings("authors", "mock_module.mappings")
+
+    class ep(object):
+        name = "records"
+        module = "mock_module.mappings"
+
+    templates_eps = template_entrypoints
+
+    def mock_entry_points(group=None, name=None):
+        if group == "invenio_search.mappings":
+            return [ep]
+        return templates_eps(group, name)
+
+    runner = CliRunner()
+    script_info = ScriptInfo(create_app=lambda: app)
+    with patch("invenio_search.ext.entry_points", mock_entry_points):
+        result = runner.invoke(cmd, ["compile-registry", bundle_path], obj=script_info)
+        assert result.exit_code == 0
+        templates = dict(invenio_search.templates)
+        compiled = invenio_search._new_state()
+        mappings = dict(compiled.mappings)
+        aliases = dict(compiled.aliases)
+    assert "records" in aliases
+    assert "authors" not in aliases
+
+    new_app = Flask("testapp")
+    new_app.config["SEARCH_REGISTRY_BUNDLE"] = bundle_path
+    ext = InvenioSearch(new_app)
+    with patch("invenio_search.ext.entry_points", side_effect=AssertionError):
+        # the application factory registers its mappings again
+        ext.register_mappings("authors", "mock_module.mappings")
+        assert ext.mappings == dict(mappings, **invenio_search.mappings)
+        assert ext.aliases == dict(aliases, authors=invenio_search.aliases["authors"])
+        assert ext.templates == templates
+
+    # the trees of the bundle are not modified by the registrations
+    ext.aliases["records"]["records-extra"] = "extra.json"
+    assert "records-extra" not in ext._bundle.header["aliases"]["records"]
+
+    mapping_path = ext.mappings["records-default-v1.0.0"]
+    with patch.object(ext.bodies, "read", side_effect=AssertionError):
+        assert ext.get_mapping("records-default-v1.0.0") == (
+            invenio_search.bodies.load(mapping_path)
+        )
+
+
+def test_startup_profile(app):
+    """Test profiling the loading of the entry points."""
+    ep_group = "test"
+
+    class ep(object):
+        name = "records"
+        module = "mock_module.mappings"
+
+    def mock_entry_points(group=None):
+        if group == ep_group:
+            yield ep
+
+    app.config["SEARCH_STARTUP_PROFILE"] = True
+    ext = InvenioSearch(app, entry_point_group_mappings=ep_group)
+    with patch("invenio_search.ext.entry_points", mock_entry_points):
+        assert len(ext.mappings) == 3
+
+    records = ext.startup_profile.entries
+    assert len(records) == 1
+    assert records[0]["group"] == ep_group
+    assert records[0]["name"] == "records"
+    assert records[0]["files"] == 3
+    assert records[0]["load_time"] >= 0
+    assert records[0]["walk_time"] > 0
+    assert ext.startup_profile.groups[ep_group]["entry_points"] == 1
+
+    runner = CliRunner()
+    script_info = ScriptInfo(create_app=lambda: app)
+    with patch("invenio_search.ext.entry_points", mock_entry_points):
+        result = runner.invoke(cmd, ["startup-profile", "--json"], obj=script_info)
+    assert result.exit_code == 0
+    profile = json.loads(result.output)
+    assert profile["groups"][ep_group]["files"] == 3
+
+    with patch("invenio_search.ext.entry_points", mock_entry_points):
+        result = runner.invoke(cmd, ["startup-profile"], obj=script_info)
+    assert result.exit_code == 0
+    assert "records = mock_module.mappings" in result.output
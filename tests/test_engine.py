@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Engine tests."""
+
+import subprocess
+import sys
+
+from invenio_search import engine
+
+
+def _imported_modules(statement):
+    """Return the top-level packages imported by a statement (``-X importtime``)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[-1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_import_does_not_load_search_client():
+    """Test that importing the package does not import the client libraries."""
+    modules = _imported_modules("import invenio_search")
+    assert "invenio_search" in modules
+    for name in (
+        "elasticsearch",
+        "elasticsearch_dsl",
+        "opensearchpy",
+        "opensearch_dsl",
+        "urllib3",
+    ):
+        assert name not in modules
+
+    modules = _imported_modules("from invenio_search import RecordsSearch")
+    assert engine.dsl._name in modules
+
+
+def test_lazy_engine():
+    """Test the lazy engine facade."""
+    assert engine.SEARCH_DISTRIBUTION in (engine.ES, engine.OS)
+    assert engine.search.VERSION == engine.search._load().VERSION
+    assert engine.SearchEngine is getattr(
+        engine.search._load(),
+        "OpenSearch" if engine.SEARCH_DISTRIBUTION == engine.OS else "Elasticsearch",
+    )
+    assert issubclass(engine.dsl.Search, engine.dsl._load().Search)
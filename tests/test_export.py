@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sliced export tests."""
+
+import json
+import multiprocessing
+
+import pytest
+from mock import patch
+
+from invenio_search import current_search
+from invenio_search.api import RecordsSearch
+from invenio_search.export import ExportCheckpoint, _sort_key, sliced_export
+
+
+def test_sliced_export_unordered(app, fake_client):
+    """Test exporting the hits of all the slices."""
+    search = RecordsSearch(index="records", using=fake_client)
+
+    hits = list(sliced_export(search, slices=4, page_size=5))
+    assert sorted(int(hit.meta.id) for hit in hits) == list(range(95))
+    assert not fake_client.open_pits
+
+    slices = {
+        call[2]["slice"]["id"] for call in fake_client.calls if call[0] == "search"
+    }
+    assert slices == {0, 1, 2, 3}
+
+    # the preference is sent when opening the point in time
+    fake_client.calls.clear()
+    list(sliced_export(search.params(preference="abc"), slices=2, page_size=50))
+    assert fake_client.calls[0][2]["preference"] == "abc"
+    assert all(call[3] == {} for call in fake_client.calls[1:])
+
+
+def test_sliced_export_ordered(app, fake_client):
+    """Test merging the slices in the order of the search sort."""
+    search = RecordsSearch(index="records", using=fake_client).sort("-year", "title")
+
+    hits = list(sliced_export(search, slices=3, page_size=4, ordered=True))
+    assert len(hits) == 95
+    keys = [(-hit.year, hit.title) for hit in hits]
+    assert keys == sorted(keys)
+    assert not fake_client.open_pits
+
+
+def test_sliced_export_sort_key():
+    """Test merging the hits in the order of the search engine."""
+    key = _sort_key(["_score", {"year": {"order": "desc"}}, "_id"])
+    hits = [
+        {"sort": [1.0, 2000, "a"]},
+        {"sort": [2.0, None, "b"]},
+        {"sort": [2.0, 1990, "c"]},
+        {"sort": [2.0, None, "d"]},
+        {"sort": [2.0, 2010, "e"]},
+    ]
+    assert [hit["sort"][2] for hit in sorted(hits, key=key)] == [
+        "e",
+        "c",
+        "b",
+        "d",
+        "a",
+    ]
+
+    key = _sort_key([{"year": {"missing": "_first"}}, "_id"])
+    assert [
+        hit["sort"][2]
+        for hit in sorted(hits, key=lambda hit: key({"sort": hit["sort"][1:]}))
+    ] == [
+        "b",
+        "d",
+        "c",
+        "a",
+        "e",
+    ]
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the worker processes must inherit the fake client",
+)
+def test_sliced_export_process(app, fake_client):
+    """Test fetching the slices in worker processes."""
+    search = RecordsSearch(index="records", using=fake_client)
+    client_config = current_search._client_config()
+    key = json.dumps(client_config, sort_keys=True, default=repr)
+
+    # the worker processes use the client built from the client configuration
+    with patch.dict("invenio_search.export._process_clients", {key: fake_client}):
+        hits = list(sliced_export(search, slices=3, page_size=10, executor="process"))
+    assert sorted(int(hit.meta.id) for hit in hits) == list(range(95))
+    assert not fake_client.open_pits
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_sliced_export_checkpoint(app, fake_client, tmp_path, ordered):
+    """Test resuming an interrupted export."""
+    app.config["SEARCH_SORT_TIEBREAKER"] = "_id"
+    search = RecordsSearch(index="records", using=fake_client).sort("year")
+    checkpoint = ExportCheckpoint(str(tmp_path / "export.json"))
+
+    export = sliced_export(
+        search, slices=3, page_size=5, ordered=ordered, checkpoint=checkpoint
+    )
+    first = [next(export).meta.id for _ in range(40)]
+    export.close()
+    assert not fake_client.open_pits
+    progress = checkpoint.load()
+    assert len(progress["slices"]) == 3
+
+    rest = [
+        hit.meta.id
+        for hit in sliced_export(
+            search, slices=3, page_size=5, ordered=ordered, checkpoint=checkpoint
+        )
+    ]
+    # hits are delivered at least once
+    assert set(first) | set(rest) == {str(idx) for idx in range(95)}
+    assert len(rest) < 95
+    assert all(state["done"] for state in checkpoint.load()["slices"])
+
+    with pytest.raises(ValueError):
+        next(sliced_export(search, slices=2, checkpoint=checkpoint))
+
+
+@pytest.mark.parametrize("tiebreaker", [None, "_shard_doc"])
+def test_sliced_export_checkpoint_tiebreaker(app, fake_client, tmp_path, tiebreaker):
+    """Test requiring a document field tiebreaker to resume exports."""
+    app.config["SEARCH_SORT_TIEBREAKER"] = tiebreaker
+    search = RecordsSearch(index="records", using=fake_client)
+    checkpoint = ExportCheckpoint(str(tmp_path / "export.json"))
+
+    with pytest.raises(ValueError):
+        next(sliced_export(search, checkpoint=checkpoint))
+    assert not fake_client.calls
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Query cost guard tests."""
+
+import pytest
+from mock import Mock
+
+from invenio_search import current_search
+from invenio_search.api import RecordsSearch, RecordsSearchV2
+from invenio_search.compiled import Param
+from invenio_search.errors import QueryCostError, QueryCostWarning
+from invenio_search.guard import (
+    LeadingWildcard,
+    MaxPageSize,
+    MaxResultWindow,
+    MaxTermsAggregationSize,
+)
+
+
+def _client():
+    client = Mock()
+    client.search.return_value = {"hits": {"total": 0, "hits": []}}
+    return client
+
+
+def _sent(client):
+    return client.search.call_args[1]["body"]
+
+
+def test_query_guard_actions(app):
+    """Test warning about, fixing and rejecting expensive searches."""
+    app.config["SEARCH_QUERY_GUARD_RULES"] = [
+        MaxResultWindow(100, action="reject"),
+        MaxPageSize(20, action="clamp"),
+        MaxTermsAggregationSize(50, action="warn"),
+    ]
+    client = _client()
+    search = RecordsSearch(index="records", using=client)
+
+    search[10:60].execute()
+    assert _sent(client)["from"] == 10
+    assert _sent(client)["size"] == 20
+
+    with pytest.raises(QueryCostError) as error:
+        search[90:120].execute()
+    assert error.value.rule == "max_result_window"
+    assert client.search.call_count == 1
+
+    search.aggs.bucket("types", "terms", field="type", size=500)
+    with pytest.warns(QueryCostWarning):
+        search[:0].execute()
+    assert _sent(client)["aggs"]["types"]["terms"]["size"] == 500
+
+    # searches respecting the rules are sent as they are
+    RecordsSearchV2(index="records", using=client)[:10].execute_raw()
+    assert _sent(client) == {"from": 0, "size": 10}
+
+    assert current_search.query_guard.stats() == {
+        "RecordsSearch": {
+            "max_page_size": 1,
+            "max_result_window": 1,
+            "max_terms_aggregation_size": 1,
+        }
+    }
+
+
+def test_query_guard_compiled(app):
+    """Test checking the compiled searches against the rules."""
+    app.config["SEARCH_QUERY_GUARD_RULES"] = [MaxPageSize(50, action="reject")]
+    client = _client()
+    search = RecordsSearch.compiled(
+        "guarded",
+        lambda s: s.extra(size=Param("size")),
+        index="records",
+        using=client,
+    )
+
+    search.execute(size=20)
+    assert _sent(client)["size"] == 20
+    with pytest.raises(QueryCostError):
+        search.execute(size=100)
+    assert client.search.call_count == 1
+
+
+def test_query_guard_deep_pagination(app, fake_client):
+    """Test not limiting the deep pages fetched with ``search_after``."""
+    app.config["SEARCH_QUERY_GUARD_RULES"] = [MaxResultWindow(50, action="reject")]
+    search = RecordsSearchV2(index="records", using=fake_client).sort("year")
+
+    with pytest.raises(QueryCostError):
+        search[60:70].execute()
+    deep = RecordsSearchV2(
+        index="records", using=fake_client, deep_pagination_from=20
+    ).sort("year")
+    assert len(deep[60:70].execute()) == 10
+    with pytest.raises(QueryCostError):
+        deep[10:70].execute()
+
+
+def test_query_guard_rules():
+    """Test the fixes of the built-in rules."""
+    body = {
+        "query": {
+            "bool": {
+                "must": [
+                    {"query_string": {"query": "*ggs AND title:?oson"}},
+                    {"wildcard": {"title": {"value": "*iggs"}}},
+                ],
+                "filter": [{"wildcard": {"type": "art*"}}],
+            }
+        },
+        "from": 150,
+        "size": 100,
+        "aggs": {
+            "types": {
+                "terms": {"field": "type", "size": 500},
+                "aggs": {"years": {"terms": {"field": "year", "size": 50}}},
+            }
+        },
+    }
+
+    rule = LeadingWildcard(action="rewrite")
+    assert rule.check(body) == "leading wildcard in *ggs, ?oson, *iggs"
+    fixed = rule.fix(body)
+    assert rule.check(fixed) is None
+    must = fixed["query"]["bool"]["must"]
+    assert must[0]["query_string"]["query"] == "ggs AND title:oson"
+    assert must[1]["wildcard"]["title"]["value"] == "iggs"
+    # the original body is not modified
+    assert body["query"]["bool"]["must"][1]["wildcard"]["title"]["value"] == "*iggs"
+
+    rule = MaxResultWindow(200)
+    assert rule.check(body) == "from + size is 250 (limit: 200)"
+    assert rule.fix(body)["size"] == 50
+    assert MaxResultWindow(100).fix(body)["size"] == 0
+
+    rule = MaxTermsAggregationSize(20)
+    assert rule.check(body) == "terms aggregation size is 500 (limit: 20)"
+    aggs = rule.fix(body)["aggs"]
+    assert aggs["types"]["terms"]["size"] == 20
+    assert aggs["types"]["aggs"]["years"]["terms"]["size"] == 20
+    assert body["aggs"]["types"]["terms"]["size"] == 500
+
+    # the default page size applies when the body has none
+    assert MaxPageSize(5).check({}) == "size is 10 (limit: 5)"
+    assert MaxPageSize(20).check({}) is None
+
+    with pytest.raises(ValueError):
+        MaxPageSize(action="ignore")
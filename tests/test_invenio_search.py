@@ -12,13 +12,18 @@
 """Module tests."""
 
 import json
+import os
+import threading
+import time
+import warnings
 from collections import defaultdict
+from importlib.resources import files
 
 import pytest
 from flask import Flask
-from mock import patch
+from mock import Mock, patch
 
-from invenio_search import InvenioSearch, current_search, current_search_client
+from invenio_search import InvenioSearch, current_search, current_search_client, engine
 from invenio_search.engine import ES, SEARCH_DISTRIBUTION, search
 from invenio_search.errors import IndexAlreadyExistsError, NotAllowedMappingUpdate
 
@@ -492,3 +497,258 @@ def test_update_mappings(app):
             # reset test files
             json_obj = json.dumps(initial_mapping)
             mapping_file.write(json_obj)
+
+
+def test_discovery_cache(tmp_path):
+    """Test that mappings are rebuilt from the discovery cache."""
+    cache_path = str(tmp_path / "discovery.json")
+
+    def _create_app():
+        app = Flask("testapp")
+        app.config["SEARCH_DISCOVERY_CACHE"] = cache_path
+        ext = InvenioSearch(app)
+        ext.register_mappings("records", "mock_module.mappings")
+        return ext
+
+    # the cache is not read before the first discovery
+    with patch("invenio_search.ext.DiscoveryCache") as mock_cache:
+        app = Flask("testapp")
+        app.config["SEARCH_DISCOVERY_CACHE"] = cache_path
+        InvenioSearch(app)
+        assert not mock_cache.called
+
+    cold = _create_app()
+    assert len(cold.mappings) == 3
+    cold._discovery.save()
+    with open(cache_path) as fp:
+        assert json.load(fp)["walks"]
+
+    # warm start: the directory tree is not listed again
+    with patch("invenio_search.discovery.os.scandir") as mock_scandir:
+        warm = _create_app()
+        assert not mock_scandir.called
+    assert warm.mappings == cold.mappings
+    assert warm.aliases == cold.aliases
+
+    # modifying a directory invalidates its cached walk
+    with open(cache_path) as fp:
+        data = json.load(fp)
+    for walk in data["walks"].values():
+        walk["dirs"] = {path: 0 for path in walk["dirs"]}
+    with open(cache_path, "w") as fp:
+        json.dump(data, fp)
+    with patch("invenio_search.discovery.os.scandir", wraps=os.scandir) as mock_scandir:
+        stale = _create_app()
+        assert mock_scandir.called
+    assert stale.aliases == cold.aliases
+
+
+def test_lazy_mappings_registration():
+    """Test that mappings are registered on first access only."""
+    ep_group = "test"
+    calls = []
+
+    def mock_entry_points_mappings(group=None):
+        calls.append(group)
+
+        class ep(object):
+            name = "records"
+            module = "mock_module.mappings"
+
+        yield ep
+
+    with patch("invenio_search.ext.entry_points", mock_entry_points_mappings):
+        app = Flask("testapp")
+        ext = InvenioSearch(app, entry_point_group_mappings=ep_group)
+        assert calls == []
+
+        assert len(ext.mappings) == 3
+        assert calls == [ep_group]
+        assert set(ext.aliases) == {"records"}
+
+        # explicit registration keeps working
+        ext.register_mappings("authors", "mock_module.mappings")
+        assert set(ext.aliases) == {"records", "authors"}
+        assert calls == [ep_group]
+
+
+def test_lazy_mappings_startup():
+    """Test that the app factory does not depend on the installed mappings."""
+    eps = []
+    for idx in range(200):
+        ep = Mock(module="mock_module.mappings")
+        ep.name = "alias{}".format(idx)
+        eps.append(ep)
+
+    with patch("invenio_search.ext.entry_points", return_value=eps), patch(
+        "invenio_search.ext._SearchState._scan_mappings", return_value=("", [])
+    ) as mock_register:
+        app = Flask("testapp")
+        InvenioSearch(app)
+        assert mock_register.call_count == 0
+
+        app.extensions["invenio-search"].mappings
+        assert mock_register.call_count == len(eps)
+
+
+def test_concurrent_discovery():
+    """Test that concurrently discovered entry points are merged in order."""
+    eps = []
+    for idx in range(8):
+        ep = Mock(module="module{}".format(idx))
+        ep.name = "alias{}".format(idx)
+        ep.load.return_value = ep.module
+        eps.append(ep)
+
+    threads = set()
+
+    def scan_mappings(alias, package_name):
+        threads.add(threading.current_thread().name)
+        # the first entry points complete last
+        time.sleep(0.01 * (8 - int(package_name[len("module") :])))
+        return "/" + package_name, ["index.json"]
+
+    def register_templates(module):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01 * (8 - int(module[len("module") :])))
+        return {"template": module, module: module}
+
+    app = Flask("testapp")
+    app.config["SEARCH_DISCOVERY_WORKERS"] = 4
+    with patch("invenio_search.ext.entry_points", return_value=eps), patch(
+        "invenio_search.ext._SearchState._scan_mappings", side_effect=scan_mappings
+    ), patch(
+        "invenio_search.ext._SearchState.register_templates",
+        side_effect=register_templates,
+    ):
+        ext = InvenioSearch(app)
+        assert list(ext.aliases) == [ep.name for ep in eps]
+        assert list(ext.mappings) == ["{}-index".format(ep.name) for ep in eps]
+        # the last entry point wins, as with a sequential discovery
+        assert ext.templates["template"] == "module7"
+        assert list(ext.templates) == ["template"] + [ep.module for ep in eps]
+
+    assert len(threads) == 4
+    assert all(name.startswith("invenio-search-discovery") for name in threads)
+
+
+def test_body_cache(app, tmp_path):
+    """Test that mapping and template bodies are parsed once."""
+    search = app.extensions["invenio-search"]
+    search.register_mappings("records", "mock_module.mappings")
+
+    with patch("invenio_search.bodies.json_loads", wraps=json.loads) as mock_loads:
+        search.bodies.loads = mock_loads
+        mapping = search.get_mapping("records-default-v1.0.0")
+        assert search.get_mapping("records-default-v1.0.0") is mapping
+        assert mock_loads.call_count == 1
+
+    template_path = tmp_path / "template.json"
+    template_path.write_text('{"index_patterns": ["__SEARCH_INDEX_PREFIX__rec-*"]}')
+    app.config["SEARCH_INDEX_PREFIX"] = "prefix-"
+    body = search.get_template_body(str(template_path))
+    assert body == {"index_patterns": ["prefix-rec-*"]}
+    assert search.get_template_body(str(template_path)) is body
+
+    # the prefix is part of the cache key
+    app.config["SEARCH_INDEX_PREFIX"] = "other-"
+    assert search.get_template_body(str(template_path)) == {
+        "index_patterns": ["other-rec-*"]
+    }
+
+    # modified files are parsed again
+    template_path.write_text('{"index_patterns": ["__SEARCH_INDEX_PREFIX__new-*"]}')
+    os.utime(template_path, ns=(0, 0))
+    assert search.get_template_body(str(template_path)) == {
+        "index_patterns": ["other-new-*"]
+    }
+
+
+def test_body_cache_eviction(tmp_path):
+    """Test that the body cache is bounded."""
+    from invenio_search.bodies import BodyCache
+
+    cache = BodyCache(maxsize=2)
+    paths = []
+    for idx in range(3):
+        path = tmp_path / "{}.json".format(idx)
+        path.write_text(json.dumps({"idx": idx}))
+        paths.append(str(path))
+        assert cache.load(str(path)) == {"idx": idx}
+    assert list(key[0] for key in cache._entries) == paths[1:]
+
+
+def test_mappings_module_resolution(app):
+    """Test that the mappings module of a package is resolved once."""
+    search = app.extensions["invenio-search"]
+    module = "mock_module.mappings"
+    expected = search._get_mappings_module(module)
+
+    with patch.dict("invenio_search.ext._mappings_modules", clear=True), patch(
+        "invenio_search.ext.files", wraps=files
+    ) as mock_files:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            table = search.resolve_mappings_modules([module, "mock_module.templates"])
+            assert table[module] == expected
+            probes = mock_files.call_count
+
+            search.register_mappings("records", module)
+            search.register_mappings("authors", module)
+            assert search._get_mappings_module(module) == expected
+            assert mock_files.call_count == probes
+        # the fallback warning is emitted at most once per package
+        messages = [str(w.message) for w in caught if module in str(w.message)]
+        assert len(messages) <= 1
+
+    name, traversable = search._get_mappings_files(module)
+    assert name == expected
+    assert traversable == files(expected)
+
+
+def test_cluster_info_cache():
+    """Test that the cluster information is fetched once per TTL window."""
+    client = Mock()
+    client.info.return_value = {
+        "version": {"number": "2.11.0", "distribution": "opensearch"}
+    }
+    app = Flask("testapp")
+    app.config["SEARCH_CLUSTER_INFO_TTL"] = 60
+    ext = InvenioSearch(app, client=client)
+
+    with patch("invenio_search.ext.time.monotonic", return_value=1000):
+        assert ext.cluster_version == [2, 11, 0]
+        assert ext.cluster_distribution == "opensearch"
+        assert ext.cluster_version == [2, 11, 0]
+        assert client.info.call_count == 1
+
+    with patch("invenio_search.ext.time.monotonic", return_value=1059):
+        assert ext.cluster_distribution == "opensearch"
+        assert client.info.call_count == 1
+
+    client.info.return_value = {"version": {"number": "7.17.5"}}
+    with patch("invenio_search.ext.time.monotonic", return_value=1061):
+        assert ext.cluster_distribution == "elasticsearch"
+        assert ext.cluster_version == [7, 17, 5]
+        assert client.info.call_count == 2
+
+        ext.refresh_cluster_info()
+        assert client.info.call_count == 3
+        assert ext.cluster_version == [7, 17, 5]
+        assert client.info.call_count == 3
+
+
+def test_async_client_config():
+    """Test that the asyncio client uses the same configuration."""
+    app = Flask("testapp")
+    app.config["SEARCH_CLIENT_CONFIG"] = {"timeout": 30}
+    app.config["SEARCH_HOSTS"] = ["localhost:9200"]
+    ext = InvenioSearch(app)
+
+    async_engine = Mock()
+    search_module = Mock(**{"Async" + engine._search_engine_class: async_engine})
+    with patch("invenio_search.engine.search", search_module):
+        assert ext.async_client is async_engine.return_value
+        assert ext.async_client is async_engine.return_value
+    async_engine.assert_called_once_with(hosts=["localhost:9200"], timeout=30)
+    assert app.config["SEARCH_CLIENT_CONFIG"] == {"timeout": 30}
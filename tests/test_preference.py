@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Shard preference policy tests."""
+
+import pytest
+from flask import g
+from mock import Mock
+
+from invenio_search import current_search
+from invenio_search.api import RecordsSearch, RecordsSearchV2
+
+
+def _preference(search):
+    return search._params.get("preference")
+
+
+def test_preference_policies(app):
+    """Test the built-in preference policies."""
+    headers = {"User-Agent": "Chrome"}
+    environ = {"REMOTE_ADDR": "212.54.1.8"}
+    with app.test_request_context("/", headers=headers, environ_base=environ):
+        legacy = _preference(RecordsSearch().with_preference_param())
+
+    def preferences(policy, search=None, **kwargs):
+        app.config["SEARCH_PREFERENCE_POLICY"] = policy
+        kwargs.setdefault("headers", headers)
+        kwargs.setdefault("environ_base", environ)
+        with app.test_request_context("/", **kwargs):
+            return (
+                _preference((search or RecordsSearch()).with_preference_param()),
+                _preference(RecordsSearchV2().with_preference_param()),
+            )
+
+    assert preferences("user_agent") == (legacy, legacy)
+
+    by_session = preferences("session", headers={"Cookie": "session=abc"})
+    assert by_session[0] == by_session[1]
+    assert by_session[0] not in (legacy, None)
+    assert preferences("session", headers={"Cookie": "session=def"}) != by_session
+    # without session, the user agent is used
+    assert preferences("session") == (legacy, legacy)
+
+    app.config["SEARCH_PREFERENCE_POLICY"] = "user"
+    with app.test_request_context("/", headers={"Cookie": "session=abc"}):
+        g.identity = Mock(id=1)
+        first = _preference(RecordsSearch().with_preference_param())
+    with app.test_request_context("/", headers={"User-Agent": "Firefox"}):
+        g.identity = Mock(id=1)
+        assert _preference(RecordsSearch().with_preference_param()) == first
+        g.pop("identity")
+    assert preferences("user", headers={"Cookie": "session=abc"}) == by_session
+
+    assert preferences("local") == ("_local", "_local")
+
+    # queries with the same shape go to the same replicas
+    shape = preferences("query_shape", RecordsSearch().query("match", title="a"))
+    other = preferences("query_shape", RecordsSearch().query("match", title="b"))
+    assert shape[0] == other[0]
+    assert shape[0] != shape[1]
+
+    # an explicit preference is always used
+    search = RecordsSearchV2().with_preference_param("1234")
+    assert _preference(search) == "1234"
+
+
+def test_preference_request_cache(app):
+    """Test computing the preference once per request."""
+    policy = Mock(return_value="abc")
+    app.config["SEARCH_PREFERENCE_POLICY"] = policy
+
+    with app.test_request_context("/"):
+        for search_cls in (RecordsSearch, RecordsSearchV2, RecordsSearch):
+            assert _preference(search_cls().with_preference_param()) == "abc"
+        assert policy.call_count == 1
+    with app.test_request_context("/"):
+        RecordsSearch().with_preference_param()
+        assert policy.call_count == 2
+
+    # no preference is set if the policy does not return one
+    policy.return_value = None
+    with app.test_request_context("/"):
+        assert "preference" not in RecordsSearch().with_preference_param()._params
+
+    # policies are also given as import paths
+    app.config["SEARCH_PREFERENCE_POLICY"] = (
+        "invenio_search.preference:local_node_policy"
+    )
+    assert _preference(RecordsSearchV2().with_preference_param()) == "_local"
+
+
+@pytest.mark.parametrize("record", [False, True])
+def test_preference_record_replicas(app, record):
+    """Test recording the shard copies which served the hits."""
+    app.config.update(
+        SEARCH_PREFERENCE_POLICY="local", SEARCH_PREFERENCE_RECORD_REPLICAS=record
+    )
+    client = Mock()
+    client.search.return_value = {
+        "hits": {
+            "total": 2,
+            "hits": [
+                {"_id": "1", "_shard": "[records][0]", "_node": "node-a"},
+                {"_id": "2", "_shard": "[records][1]", "_node": "node-b"},
+                {"_id": "3", "_shard": "[records][1]", "_node": "node-b"},
+            ],
+        }
+    }
+
+    search = RecordsSearchV2(index="records", using=client).with_preference_param()
+    search[:3].execute()
+    search.execute_raw()
+    # searches without the preference of a policy are not recorded
+    RecordsSearchV2(index="records", using=client).execute()
+
+    body = client.search.call_args_list[0][1]["body"]
+    if not record:
+        assert "explain" not in body
+        assert current_search.preference_stats.to_dict() == {}
+        return
+
+    assert body["explain"] is True
+    assert current_search.preference_stats.to_dict() == {
+        "local": {
+            "responses": 2,
+            "replicas": [
+                {"shard": "[records][1]", "node": "node-b", "hits": 4},
+                {"shard": "[records][0]", "node": "node-a", "hits": 2},
+            ],
+        }
+    }
+    current_search.preference_stats.clear()
+    assert current_search.preference_stats.to_dict() == {}
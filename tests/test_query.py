@@ -9,14 +9,28 @@
 
 """Module tests."""
 
+import asyncio
 import hashlib
+import json
+from itertools import islice
 
 import pytest
 from flask import request
-from mock import patch
-
-from invenio_search.api import DefaultFilter, RecordsSearch, RecordsSearchV2
-from invenio_search.engine import dsl
+from mock import Mock, patch
+
+from invenio_search import current_search
+from invenio_search.api import (
+    AsyncRecordsSearch,
+    AsyncRecordsSearchV2,
+    DefaultFilter,
+    RecordsSearch,
+    RecordsSearchV2,
+    _faceted_search_classes,
+)
+from invenio_search.compiled import Param
+from invenio_search.engine import ES, OS, dsl
+from invenio_search.errors import PointInTimeNotSupportedError
+from invenio_search.pit import PaginationCursors
 
 
 def test_empty_query(app):
@@ -133,6 +147,101 @@ def test_search_query(app):
     assert q.to_dict()["query"]["bool"]["must"] == [{"match": {"title": "Higgs"}}]
 
 
+def test_faceted_search_classes(app):
+    """Test reusing the faceted search classes."""
+
+    class FacetedSearch(RecordsSearch):
+        class Meta:
+            index = "records"
+            fields = ("title^2", "description")
+            facets = {"type": dsl.TermsFacet(field="type")}
+
+    first = FacetedSearch.faceted_search("higgs", filters={"type": ["article"]})
+    second = FacetedSearch.faceted_search("boson")
+    assert type(first) is type(second)
+    assert type(first).index == "records"
+
+    # the search of every call is used
+    search = FacetedSearch().params(preference="abc")
+    third = FacetedSearch.faceted_search("higgs", search=search)
+    assert type(third) is type(first)
+    assert third._s._params == {"preference": "abc"}
+    assert first._s.to_dict()["query"]["multi_match"]["query"] == "higgs"
+    assert first._s.to_dict()["post_filter"] == {"terms": {"type": ["article"]}}
+    assert second._s.to_dict()["query"]["multi_match"]["query"] == "boson"
+    assert "post_filter" not in second._s.to_dict()
+
+    # the class depends on the index and on the search class
+    other = FacetedSearch.faceted_search(search=FacetedSearch(index="authors"))
+    assert type(other) is not type(first)
+    assert type(RecordsSearch.faceted_search()) is not type(first)
+
+    # creating the class was the main per-call overhead
+    with patch("invenio_search.api.dsl.FacetedSearch.__init_subclass__") as created:
+        for _ in range(100):
+            FacetedSearch.faceted_search("higgs")
+    assert created.call_count == 0
+
+    # the classes of facets built per call do not accumulate
+    with patch.object(_faceted_search_classes, "maxsize", 2):
+        for _ in range(5):
+            FacetedSearch.Meta.facets = {"type": dsl.TermsFacet(field="type")}
+            FacetedSearch.faceted_search("higgs")
+        assert len(_faceted_search_classes._entries) == 2
+
+
+def test_default_filter_cache(app):
+    """Test building the default filter once per request and identity."""
+    from flask import g
+
+    builder = Mock(side_effect=lambda: dsl.Q("terms", owners=[g.identity.id]))
+    parser = Mock(side_effect=lambda query: query)
+
+    class CachedSearch(RecordsSearch):
+        class Meta:
+            default_filter = DefaultFilter(builder, query_parser=parser, cache=True)
+
+    class SerializedSearch(RecordsSearch):
+        class Meta:
+            default_filter = DefaultFilter(
+                builder, cache_key=lambda: g.identity.id, serialize=True
+            )
+
+    expected = {"bool": {"minimum_should_match": "0<1", "filter": []}}
+    alice, bob = Mock(id=1), Mock(id=2)
+    g.identity = alice
+    for search_cls in (CachedSearch, SerializedSearch, CachedSearch):
+        q = search_cls().query("match", title="higgs")
+        assert q.to_dict()["query"]["bool"]["filter"] == [{"terms": {"owners": [1]}}]
+    assert builder.call_count == parser.call_count + 1 == 2
+
+    g.identity = bob
+    CachedSearch()
+    assert builder.call_count == 3
+    expected["bool"]["filter"] = [{"terms": {"owners": [2]}}]
+    assert SerializedSearch().to_dict()["query"] == expected
+    assert builder.call_count == 4
+    # the cache key of the serialized filter is the identity id
+    g.identity = Mock(id=2)
+    assert SerializedSearch().to_dict()["query"] == expected
+    assert builder.call_count == 4
+
+    # every search gets its own copy of the serialized filter
+    search = SerializedSearch()
+    search.query.filter[0].owners.append(3)
+    assert search._clone().to_dict()["query"]["bool"]["filter"] == [
+        {"terms": {"owners": [2, 3]}}
+    ]
+    assert SerializedSearch().to_dict()["query"] == expected
+    assert "_serialized" not in dsl.query.Query._classes
+
+    # the cache is scoped to the application context
+    with app.app_context():
+        g.identity = alice
+        CachedSearch()
+        assert builder.call_count == 5
+
+
 class SpySearch(RecordsSearch):
     """Is exactly like RecordsSearch but exposes its params."""
 
@@ -279,3 +388,510 @@ def test_prefix_multi_index_string(app, search_cls):
     ]
     q = search_cls(index=index_value)
     _test_original_index_is_stored_when_prefixing(q, prefixed_index, [index_value])
+
+
+@pytest.mark.parametrize("search_cls", [RecordsSearch, RecordsSearchV2])
+def test_compiled_search(app, search_cls):
+    """Test compiling a query shape."""
+    client = Mock()
+    client.search.return_value = {"hits": {"total": 0, "hits": []}}
+    app.config["SEARCH_INDEX_PREFIX"] = "myprefix-"
+
+    def build(s):
+        return s.query("query_string", query=Param("q")).extra(
+            from_=Param("from"), size=Param("size")
+        )
+
+    build_mock = Mock(side_effect=build)
+    compiled = search_cls.compiled("query", build_mock, index="records", using=client)
+    assert compiled.names == {"q", "from", "size"}
+
+    for page, q in enumerate(["title:higgs", "title:boson"]):
+        values = {"q": q, "from": page * 10, "size": 10}
+        expected = (
+            search_cls(index="records")
+            .query("query_string", query=q)
+            .extra(from_=page * 10, size=10)
+            .to_dict()
+        )
+        # the DSL objects are neither built nor serialized again
+        with patch.object(dsl.Search, "to_dict") as mock_to_dict:
+            compiled = search_cls.compiled(
+                "query", build_mock, index="records", using=client
+            )
+            assert compiled.to_dict(**values) == expected
+            response = compiled.execute(params={"preference": "abc"}, **values)
+            assert mock_to_dict.call_count == 0
+        assert build_mock.call_count == 1
+        assert response.hits.total == 0
+        client.search.assert_called_with(
+            index=["myprefix-records"], body=expected, preference="abc"
+        )
+
+    # the static parts of the skeleton are shared
+    first = compiled.to_dict(q="a", size=1, **{"from": 0})
+    second = compiled.to_dict(q="b", size=1, **{"from": 0})
+    assert first["query"] is not second["query"]
+    assert first["query"]["query_string"]["query"] == "a"
+
+    with pytest.raises(ValueError):
+        compiled.to_dict(q="a")
+
+    # shapes are compiled separately for each prefix ...
+    app.config["SEARCH_INDEX_PREFIX"] = "other-"
+    compiled = search_cls.compiled("query", build_mock, index="records", using=client)
+    assert compiled.search._index == ["other-records"]
+    assert build_mock.call_count == 2
+
+    # ... and for each set of keyword arguments
+    compiled = search_cls.compiled("query", build_mock, index="authors", using=client)
+    assert compiled.search._index == ["other-authors"]
+    assert build_mock.call_count == 3
+
+
+def test_compiled_search_default_filter(app):
+    """Test that the default filter is evaluated on every execution."""
+    from flask import g
+
+    client = Mock()
+    client.search.return_value = {"hits": {"total": 0, "hits": []}}
+
+    class OwnedSearch(RecordsSearch):
+        class Meta:
+            index = "records"
+            default_filter = DefaultFilter(lambda: dsl.Q("term", owner=g.user))
+
+    def execute(user):
+        g.user = user
+        compiled = OwnedSearch.compiled(
+            "query",
+            lambda s: s.query("match", title=Param("q")),
+            using=client,
+        )
+        compiled.execute(q="higgs")
+        return client.search.call_args[1]["body"]
+
+    assert execute("alice")["query"]["bool"] == {
+        "minimum_should_match": "0<1",
+        "filter": [{"term": {"owner": "alice"}}],
+        "must": [{"match": {"title": "higgs"}}],
+    }
+    body = execute("bob")
+    assert body == OwnedSearch().query("match", title="higgs").to_dict()
+    assert body["query"]["bool"]["filter"] == [{"term": {"owner": "bob"}}]
+    assert len(current_search.compiled_searches._entries) == 1
+
+    # the default filter cannot be overridden by the values
+    compiled = OwnedSearch.compiled("query", lambda s: s)
+    assert compiled.names == set()
+    assert compiled.to_dict(_default_filter={"match_all": {}}) == {
+        "query": {
+            "bool": {
+                "minimum_should_match": "0<1",
+                "filter": [{"term": {"owner": "bob"}}],
+            }
+        }
+    }
+
+
+@pytest.mark.parametrize("search_cls", [AsyncRecordsSearch, AsyncRecordsSearchV2])
+def test_async_records_search(app, search_cls):
+    """Test executing searches with the asyncio client."""
+
+    class AsyncClient(object):
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, **kwargs):
+            self.calls.append(kwargs)
+            await asyncio.sleep(0)
+            return {"hits": {"total": {"value": 1, "relation": "eq"}, "hits": []}}
+
+        async def count(self, **kwargs):
+            return {"count": 42}
+
+    client = AsyncClient()
+    app.extensions["invenio-search"]._async_client = client
+    app.config.update(SEARCH_INDEX_PREFIX="myprefix-", SEARCH_RESULTS_MIN_SCORE=0.1)
+
+    async def run():
+        searches = [
+            search_cls(index=index).query("match", title="higgs").params(preference="a")
+            for index in ("records", "authors")
+        ]
+        responses = await asyncio.gather(*(s.execute() for s in searches))
+        assert [r.hits.total.value for r in responses] == [1, 1]
+        assert await searches[0].count() == 1
+        assert await search_cls(index="records").count() == 42
+        raw = await search_cls(index="records").execute_raw()
+        assert raw["hits"]["total"]["value"] == 1
+        assert [s async for s in search_cls(index="records").iter_sources()] == []
+
+        compiled = search_cls.compiled(
+            "async-query", lambda s: s.query("match", title=Param("q"))
+        )
+        response = await compiled.execute(q="higgs")
+        assert response.hits.total.value == 1
+        assert client.calls[-1]["body"]["query"]["match"] == {"title": "higgs"}
+
+    asyncio.run(run())
+
+    # the methods needing the synchronous client are not supported
+    search = search_cls(index="records")
+    with pytest.raises(NotImplementedError):
+        search.iter_records(["1"])
+    with pytest.raises(NotImplementedError):
+        search.stream()
+    with pytest.raises(NotImplementedError):
+        search.scan()
+    with pytest.raises(NotImplementedError):
+        search_cls.faceted_search("higgs")
+
+    assert [call["index"] for call in client.calls[:2]] == [
+        ["myprefix-records"],
+        ["myprefix-authors"],
+    ]
+    assert client.calls[0]["body"] == {
+        "query": {"match": {"title": "higgs"}},
+        "min_score": 0.1,
+    }
+    assert client.calls[0]["preference"] == "a"
+
+
+@pytest.mark.parametrize("search_cls", [RecordsSearch, RecordsSearchV2])
+def test_execute_raw(app, fake_client, search_cls):
+    """Test getting the hits without hydrating them."""
+    app.config["SEARCH_INDEX_PREFIX"] = "myprefix-"
+    kwargs = {"default_filter": dsl.Q("term", public=True)}
+    if search_cls is RecordsSearch:
+
+        class search_cls(RecordsSearch):
+            class Meta:
+                default_filter = kwargs.pop("default_filter")
+
+    search = search_cls(index="records", using=fake_client, **kwargs)
+    search = search.filter("ids", values=["3", "1"]).sort("_id")
+
+    raw = search.execute_raw()
+    assert type(raw) is dict
+    assert [hit["_id"] for hit in raw["hits"]["hits"]] == ["1", "3"]
+    assert list(search.iter_sources()) == [
+        {"title": "title 1", "year": 1},
+        {"title": "title 3", "year": 3},
+    ]
+
+    # the request is the same as with ``execute()``
+    search.execute()
+    calls = [call for call in fake_client.calls if call[0] == "search"]
+    assert calls[0] == calls[1] == calls[2]
+    assert calls[0][1] == ["myprefix-records"]
+    assert calls[0][2]["query"]["bool"]["filter"][0] == {"term": {"public": True}}
+
+
+def test_stream(app, fake_client):
+    """Test iterating over all the hits with a point in time."""
+    app.config["SEARCH_INDEX_PREFIX"] = "myprefix-"
+    search = RecordsSearchV2(index="records", using=fake_client).sort("-year")[:5]
+
+    hits = list(search.stream(page_size=10, keep_alive="2m"))
+    assert len(hits) == 95
+    assert len({hit.meta.id for hit in hits}) == 95
+    years = [hit.year for hit in hits]
+    assert years == sorted(years, reverse=True)
+    assert not fake_client.open_pits
+
+    create_pit = [call for call in fake_client.calls if call[0] == "create_pit"]
+    assert create_pit == [("create_pit", "myprefix-records", {"keep_alive": "2m"})]
+    searches = [call for call in fake_client.calls if call[0] == "search"]
+    assert len(searches) == 10
+    assert searches[1][2]["pit"]["keep_alive"] == "2m"
+    assert searches[1][2]["size"] == 10
+    assert "from" not in searches[1][2]
+
+    # the point in time is closed when the generator is closed ...
+    stream = search.stream(page_size=10)
+    next(stream)
+    assert len(fake_client.open_pits) == 1
+    stream.close()
+    assert not fake_client.open_pits
+
+    # ... or on errors
+    with patch.object(fake_client, "search", side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            list(search.stream(page_size=10))
+    assert not fake_client.open_pits
+
+    # the preference is sent when opening the point in time
+    fake_client.calls.clear()
+    list(search.params(preference="abc").stream(page_size=50))
+    assert fake_client.calls[0] == (
+        "create_pit",
+        "myprefix-records",
+        {"keep_alive": "1m", "preference": "abc"},
+    )
+    assert all(call[3] == {} for call in fake_client.calls[1:])
+
+    # clients without point in time API are reported
+    for distribution, method in ((ES, "open_point_in_time"), (OS, "create_pit")):
+        client = Mock(spec=[])
+        with patch("invenio_search.pit.SEARCH_DISTRIBUTION", distribution):
+            with pytest.raises(PointInTimeNotSupportedError) as error:
+                next(RecordsSearchV2(index="records", using=client).stream())
+        assert method in str(error.value)
+
+
+@pytest.mark.parametrize("search_cls", [RecordsSearch, RecordsSearchV2])
+def test_iter_records(app, fake_client, search_cls):
+    """Test fetching records by identifiers in multi-get chunks."""
+    app.config["SEARCH_INDEX_PREFIX"] = "myprefix-"
+    search = search_cls(index="records", using=fake_client)
+    ids = [42, "7", "missing", 3, 90]
+
+    records = list(search.iter_records(ids, chunk_size=2, includes=["title"]))
+    assert [r.meta.id for r in records] == ["42", "7", "3", "90"]
+    assert records[0].to_dict() == {"title": "title 42"}
+    fake_client.indices.get_alias.assert_called_once_with(index="myprefix-records")
+
+    mgets = [call for call in fake_client.calls if call[0] == "mget"]
+    assert len(mgets) == 3
+    assert mgets[0][2]["docs"] == [
+        {"_index": "fake-index-v1", "_id": "42"},
+        {"_index": "fake-index-v1", "_id": "7"},
+    ]
+
+    # the source filter of the search is used by default
+    records = list(search.source(excludes=["title"]).iter_records(["1"]))
+    assert records[0].to_dict() == {"year": 1}
+
+
+def test_iter_records_with_query(app, fake_client):
+    """Test that the query of the search applies to the fetched records."""
+
+    class FilteredSearch(RecordsSearch):
+        class Meta:
+            index = "records"
+            default_filter = DefaultFilter(dsl.Q("term", public=True))
+
+    search = FilteredSearch(using=fake_client)
+    records = list(search.iter_records(["5", "4", "3"], chunk_size=2))
+    assert [r.meta.id for r in records] == ["5", "4", "3"]
+
+    searches = [call for call in fake_client.calls if call[0] == "search"]
+    assert len(searches) == 2
+    assert searches[0][2]["size"] == 2
+    assert searches[0][2]["query"]["bool"]["filter"] == [
+        {"term": {"public": True}},
+        {"ids": {"values": ["5", "4"]}},
+    ]
+    assert not any(call[0] == "mget" for call in fake_client.calls)
+
+
+@pytest.mark.parametrize("count", [100, 10000, 100000])
+def test_iter_records_requests(app, fake_client, count):
+    """Compare the requests of ``iter_records`` and ``get_records``."""
+    ids = [str(idx % 95) for idx in range(count)]
+    search = RecordsSearchV2(index="records", using=fake_client)
+
+    # a single ids query, with all the identifiers and all the hits at once
+    body = search.get_records(ids).to_dict()
+    assert len(body["query"]["ids"]["values"]) == count
+
+    # bounded multi-get requests, consumed as a stream
+    records = search.iter_records(ids, chunk_size=1000)
+    assert [r.meta.id for r in islice(records, 3)] == ["0", "1", "2"]
+    assert len(fake_client.calls) == 1
+    assert sum(1 for _ in records) == count - 3
+
+    mgets = [call for call in fake_client.calls if call[0] == "mget"]
+    assert len(mgets) == -(-count // 1000)
+    assert max(len(call[2]["docs"]) for call in mgets) <= 1000
+
+
+def test_deep_pagination(app, fake_client):
+    """Test fetching deep pages with ``search_after``."""
+    app.config["SEARCH_MAX_RESULT_WINDOW"] = 25
+    search = RecordsSearchV2(
+        index="records", using=fake_client, deep_pagination_from=20
+    ).sort("-year")
+    expected = [
+        hit["_id"]
+        for hit in fake_client.search(
+            body={"sort": [{"year": "desc"}, "_id"], "size": 95}
+        )["hits"]["hits"]
+    ]
+    fake_client.calls.clear()
+
+    def page(start, size=10):
+        response = search[start : start + size].execute()
+        return [hit.meta.id for hit in response], fake_client.calls[-1][2]
+
+    # sequential paging
+    ids = []
+    for start in range(0, 100, 10):
+        hits, body = page(start)
+        ids.extend(hits)
+        assert body["sort"] == [{"year": {"order": "desc"}}, "_id"]
+        if start < 20:
+            assert body["from"] == start
+        else:
+            assert "from" not in body
+            assert body["search_after"]
+    assert ids == expected
+    assert len(fake_client.calls) == 10
+
+    # jumping to a deep page walks from the closest cursor
+    app.extensions["invenio-search"].pagination_cursors.clear()
+    fake_client.calls.clear()
+    hits, body = page(60)
+    assert hits == expected[60:70]
+    walks = [call[2] for call in fake_client.calls[:-1]]
+    assert [walk["size"] for walk in walks] == [25, 25, 10]
+    assert all(walk["_source"] is False for walk in walks)
+    assert all(walk["track_total_hits"] is False for walk in walks)
+    # ... and the next pages cost one request
+    fake_client.calls.clear()
+    assert page(70)[0] == expected[70:80]
+    assert page(65, size=5)[0] == expected[65:70]
+    assert len(fake_client.calls) == 3
+
+    # pages after the last hit are empty
+    assert page(200)[0] == []
+    assert page(90)[0] == expected[90:]
+
+    # the walks only fetch the sort values of the hits
+    filtered = search.highlight("title").post_filter("ids", values=["1", "2"])
+    filtered.aggs.bucket("years", "terms", field="year")
+    app.extensions["invenio-search"].pagination_cursors.clear()
+    fake_client.calls.clear()
+    filtered[30:40].execute()
+    walk = fake_client.calls[0][2]
+    assert set(walk) == {
+        "post_filter",
+        "sort",
+        "size",
+        "_source",
+        "track_total_hits",
+    }
+
+    # without deep pagination, the pages are fetched with ``from``
+    search = RecordsSearchV2(index="records", using=fake_client).sort("-year")
+    search[60:70].execute()
+    assert fake_client.calls[-1][2]["from"] == 60
+    assert fake_client.calls[-1][2]["sort"] == [{"year": {"order": "desc"}}]
+
+
+def test_deep_pagination_sort(app, fake_client):
+    """Test the sort of the searches with deep pagination."""
+    search = RecordsSearchV2(
+        index="records", using=fake_client, deep_pagination_from=20
+    ).query("match", title="higgs")
+
+    # searches without sort keep the relevance order
+    for start in (0, 30):
+        search[start : start + 10].execute()
+        body = fake_client.calls[-1][2]
+        assert body["sort"] == [{"_score": {"order": "desc"}}, "_id"]
+
+    # the internal shard document order needs a point in time
+    with patch("invenio_search.pit.SEARCH_DISTRIBUTION", ES):
+        with pytest.raises(ValueError):
+            search[:10].execute()
+        app.config["SEARCH_SORT_TIEBREAKER"] = {"id": "asc"}
+        search[:10].execute()
+    assert fake_client.calls[-1][2]["sort"] == [
+        {"_score": {"order": "desc"}},
+        {"id": "asc"},
+    ]
+
+
+def test_pagination_cursors():
+    """Test the eviction of the pagination cursors."""
+    cursors = PaginationCursors(maxsize=2, max_offsets=2)
+    cursors.set("a", 10, [1])
+    cursors.set("a", 20, [2])
+    cursors.set("b", 10, [3])
+    assert cursors.nearest("a", 15) == (10, [1])
+    # the least recently used offsets and searches are evicted
+    cursors.set("a", 30, [4])
+    assert cursors.nearest("a", 25) == (10, [1])
+    assert cursors.nearest("a", 100) == (30, [4])
+    cursors.set("c", 10, [5])
+    assert cursors.nearest("b", 10) == (0, None)
+    assert cursors.nearest("c", 10) == (10, [5])
+
+
+@pytest.mark.parametrize("search_cls", [RecordsSearch, RecordsSearchV2])
+def test_field_profiles(app, fake_client_cls, search_cls):
+    """Test selecting the returned fields with named profiles."""
+    profiles = {
+        "list": {"includes": ["title", "year"]},
+        "detail": {"excludes": ["fulltext"]},
+        "export": {"stored_fields": ["_none_"], "docvalue_fields": ["year"]},
+        "invalid": {"include": ["title"]},
+    }
+    client = fake_client_cls(
+        [
+            (
+                str(idx),
+                {"title": "title {}".format(idx), "year": 2000 + idx, "fulltext": "x"},
+            )
+            for idx in range(3)
+        ]
+    )
+    if search_cls is RecordsSearch:
+
+        class search_cls(RecordsSearch):
+            class Meta:
+                field_profiles = profiles
+
+        search = search_cls(index="records", using=client)
+    else:
+        search = search_cls(index="records", using=client, field_profiles=profiles)
+    search = search.sort("year")
+
+    assert search.with_fields("list").to_dict()["_source"] == {
+        "includes": ["title", "year"],
+        "excludes": [],
+    }
+    hit = search.with_fields("list").execute()[0]
+    assert hit.to_dict() == {"title": "title 0", "year": 2000}
+    hit = search.with_fields("detail").execute()[0]
+    assert hit.to_dict() == {"title": "title 0", "year": 2000}
+    # the profile is kept by the copies of the search
+    export = search.with_fields("export").filter("ids", values=["1"])
+    # without source, the hits hold the doc values
+    assert export.execute()[0].to_dict() == {"year": [2001]}
+    assert client.calls[-1][2]["stored_fields"] == ["_none_"]
+    assert "_source" not in client.calls[-1][2]
+
+    with pytest.raises(ValueError):
+        search.with_fields("invalid")
+    with pytest.raises(ValueError):
+        search.with_fields("missing")
+
+
+def test_field_profiles_payload(app, fake_client_cls):
+    """Compare the size of the responses with and without a profile."""
+    client = fake_client_cls(
+        [
+            (
+                str(idx),
+                {
+                    "title": "title {}".format(idx),
+                    "created": "2026-01-01",
+                    "description": "x" * 30000,
+                },
+            )
+            for idx in range(20)
+        ]
+    )
+    search = RecordsSearchV2(
+        index="records",
+        using=client,
+        field_profiles={"list": {"includes": ["title", "created"]}},
+    )[:20]
+
+    full = len(json.dumps(search.execute_raw()))
+    listed = len(json.dumps(search.with_fields("list").execute_raw()))
+    assert full > 600000
+    assert listed < 5000
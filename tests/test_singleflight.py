@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Single-flight tests."""
+
+import threading
+import time
+
+from mock import Mock
+
+from invenio_search import current_search
+from invenio_search.api import RecordsSearch, RecordsSearchV2
+
+
+class BlockingClient(object):
+    """Search client answering only once it is released."""
+
+    def __init__(self, error=None):
+        """Initialize the client."""
+        self.release = threading.Event()
+        self.error = error
+        self.calls = []
+
+    def search(self, **kwargs):
+        """Wait for the release and return a response."""
+        self.calls.append(kwargs)
+        total = len(self.calls)
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"hits": {"total": total, "hits": []}}
+
+
+def _run(app, searches, client):
+    """Execute searches in threads once they are all in flight."""
+    results = [None] * len(searches)
+
+    def target(idx, build):
+        with app.app_context():
+            try:
+                results[idx] = build().execute().hits.total
+            except Exception as e:
+                results[idx] = e
+
+    threads = [
+        threading.Thread(target=target, args=(idx, build))
+        for idx, build in enumerate(searches)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while current_search.single_flight.calls < len(searches):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    client.release.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight(app):
+    """Test that identical concurrent searches share one request."""
+    app.config.update(SEARCH_SINGLE_FLIGHT=True, SEARCH_INDEX_PREFIX="myprefix-")
+    client = BlockingClient()
+
+    def build(title="higgs", search_cls=RecordsSearch):
+        return lambda: search_cls(index="records", using=client).query(
+            "match", title=title
+        )
+
+    searches = (
+        [build()] * 8 + [build("boson")] * 4 + [build(search_cls=RecordsSearchV2)]
+    )
+    results = _run(app, searches, client)
+
+    # RecordsSearch and RecordsSearchV2 send the same request
+    assert len(client.calls) == 2
+    assert results[:8] + results[12:] == [results[0]] * 9
+    assert results[8:12] == [results[8]] * 4
+    assert results[0] != results[8]
+    assert current_search.single_flight.stats() == {
+        "calls": 13,
+        "executions": 2,
+        "coalesced": 11,
+        "ratio": 11 / 13,
+    }
+
+    # once answered, the searches are sent again
+    RecordsSearch(index="records", using=client).query("match", title="higgs").execute()
+    assert len(client.calls) == 3
+    current_search.single_flight.reset()
+    assert current_search.single_flight.stats()["calls"] == 0
+
+
+def test_single_flight_errors(app):
+    """Test that the error of the shared request is raised in every thread."""
+    app.config["SEARCH_SINGLE_FLIGHT"] = True
+    error = RuntimeError("timeout")
+    client = BlockingClient(error=error)
+
+    results = _run(
+        app, [lambda: RecordsSearch(index="records", using=client)] * 3, client
+    )
+    assert results == [error] * 3
+    assert len(client.calls) == 1
+
+
+def test_single_flight_disabled(app):
+    """Test that the searches are not coalesced by default."""
+    client = Mock()
+    client.search.return_value = {"hits": {"total": 0, "hits": []}}
+    RecordsSearch(index="records", using=client).execute()
+    assert current_search.single_flight.stats()["calls"] == 0
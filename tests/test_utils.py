@@ -8,8 +8,16 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import pytest
+from mock import patch
 
-from invenio_search.utils import build_index_name
+from invenio_search.api import RecordsSearch
+from invenio_search.utils import (
+    LRUCache,
+    build_alias_name,
+    build_index_name,
+    prefix_index,
+    prefixed_names,
+)
 
 
 @pytest.mark.parametrize(
@@ -25,3 +33,52 @@ from invenio_search.utils import build_index_name
 def test_build_suffix_index_name(app, parts, prefix, suffix, expected):
     app.config.update(SEARCH_INDEX_PREFIX=prefix)
     assert build_index_name(parts, suffix=suffix, app=app) == expected
+
+
+def test_prefixed_names(app):
+    """Test the precomputed table of prefixed index and alias names."""
+    search = app.extensions["invenio-search"]
+    search.register_mappings("records", "mock_module.mappings")
+    app.config.update(SEARCH_INDEX_PREFIX="foo-")
+
+    names = prefixed_names(app)
+    assert names["records"] == "foo-records"
+    assert names["records-default-v1.0.0"] == "foo-records-default-v1.0.0"
+    assert prefixed_names(app) is names
+
+    # registered names do not go through the dynamic computation
+    with patch("invenio_search.utils.build_index_name") as mock_build, patch(
+        "invenio_search.api.build_alias_name"
+    ) as mock_alias:
+        for _ in range(100):
+            assert build_alias_name("records", app=app) == "foo-records"
+            assert prefix_index("records", app=app) == "foo-records"
+            RecordsSearch(index="records")
+        assert mock_build.call_count == 0
+        assert mock_alias.call_count == 0
+
+    # unknown names fall back to it
+    assert build_alias_name("unknown", app=app) == "foo-unknown"
+    assert build_alias_name("records", prefix="bar-", app=app) == "bar-records"
+
+    # the table follows the prefix and the registered mappings
+    app.config.update(SEARCH_INDEX_PREFIX="bar-")
+    assert build_alias_name("records", app=app) == "bar-records"
+    search.register_mappings("authors", "mock_module.mappings")
+    assert prefixed_names(app)["authors"] == "bar-authors"
+
+
+def test_lru_cache():
+    """Test evicting the least recently used entries."""
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 3) == 1
+    assert cache.get("c", lambda: 4) == 4
+    # "b" was the least recently used entry
+    assert cache.get("b", lambda: 5) == 5
+    assert cache.get("a", lambda: 6) == 6
+
+    cache = LRUCache(maxsize=0)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("a", lambda: 2) == 2